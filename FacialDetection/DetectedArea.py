@@ -1,5 +1,8 @@
+import math
 from Point import Point
+from Transform import Transform
 import cv2 as cv
+import numpy as np
 
 """
 NOTE:
@@ -14,34 +17,108 @@ class DetectedArea:
     OpenCV haarcascade detection returns 4-tuples (x,y,w,h) of rectangle marking down where the detected objects are. These information will be translated 
     to DetectedArea objects.
     """
-    def __init__(self, upperLeftPoint = (0,0), dimensions = (0,0)):
+    # The corners, the center and the radius are only built the first time they are needed. Lots of areas are dropped as duplicates right after 
+    # being detected, so most of them never need their Points
+    __slots__ = ("dimensions", "upperLeftPoint", "_upperLeft", "_upperRight", "_lowerRight", "_lowerLeft", "_center", "_radius", "confidence")
+
+    def __init__(self, upperLeftPoint = (0,0), dimensions = (0,0), confidence = None):
         """
         Construct a DetectedArea obj.
             :param upperLeftPoint (x,y): the 2-tuple coordinates of the upper left point of the rectangle encapsulates detected objects.
             :param dimension (w,h): the dimension of the box encapsulates the detected object.
-            :param angle: the angle of the image when the detected object was found and returned by openCV.
+            :param confidence: the level weight detectMultiScale3 gave the detected object (higher is more confident), None if it isn't known
         """
         self.dimensions = dimensions
-        self.upperLeft = Point(upperLeftPoint[0], upperLeftPoint[1])
-        self.upperRight = Point(upperLeftPoint[0] + dimensions[0], upperLeftPoint[1])
-        self.lowerRight = Point(upperLeftPoint[0] + dimensions[0], upperLeftPoint[1] + dimensions[1])
-        self.lowerLeft = Point(upperLeftPoint[0], upperLeftPoint[1] + dimensions[1])
-        self.center = Point(upperLeftPoint[0] + dimensions[0]/2, upperLeftPoint[1] + dimensions[1]/2)
-        self.radius = self.center.distTo(self.upperLeft)
+        self.upperLeftPoint = upperLeftPoint
+        self.confidence = confidence
+        self._upperLeft = None
+        self._upperRight = None
+        self._lowerRight = None
+        self._lowerLeft = None
+        self._center = None
+        self._radius = None
+
+    @property
+    def upperLeft(self):
+        if self._upperLeft is None:
+            self._upperLeft = Point(self.upperLeftPoint[0], self.upperLeftPoint[1])
+        return self._upperLeft
+
+    @upperLeft.setter
+    def upperLeft(self, point):
+        self._upperLeft = point
+
+    @property
+    def upperRight(self):
+        if self._upperRight is None:
+            self._upperRight = Point(self.upperLeftPoint[0] + self.dimensions[0], self.upperLeftPoint[1])
+        return self._upperRight
+
+    @upperRight.setter
+    def upperRight(self, point):
+        self._upperRight = point
+
+    @property
+    def lowerRight(self):
+        if self._lowerRight is None:
+            self._lowerRight = Point(self.upperLeftPoint[0] + self.dimensions[0], self.upperLeftPoint[1] + self.dimensions[1])
+        return self._lowerRight
+
+    @lowerRight.setter
+    def lowerRight(self, point):
+        self._lowerRight = point
+
+    @property
+    def lowerLeft(self):
+        if self._lowerLeft is None:
+            self._lowerLeft = Point(self.upperLeftPoint[0], self.upperLeftPoint[1] + self.dimensions[1])
+        return self._lowerLeft
+
+    @lowerLeft.setter
+    def lowerLeft(self, point):
+        self._lowerLeft = point
+
+    @property
+    def center(self):
+        if self._center is None:
+            self._center = Point(self.upperLeftPoint[0] + self.dimensions[0]/2, self.upperLeftPoint[1] + self.dimensions[1]/2)
+        return self._center
+
+    @center.setter
+    def center(self, point):
+        self._center = point
+
+    @property
+    def radius(self):
+        # the distance from the center to the corners doesn't change when the area is rotated or projected
+        if self._radius is None:
+            self._radius = math.sqrt(self.dimensions[0]**2 + self.dimensions[1]**2)/2
+        return self._radius
+
+    @radius.setter
+    def radius(self, radius):
+        self._radius = radius
     
     def copy(self):
         """
         Return a deep copy of the detectedArea caller
             :return a deep copy of itself
         """
-        copyArea = DetectedArea()
-        copyArea.dimensions = (self.dimensions[0], self.dimensions[1])
-        copyArea.upperLeft = self.upperLeft.copy()
-        copyArea.upperRight = self.upperRight.copy()
-        copyArea.lowerLeft = self.lowerLeft.copy()
-        copyArea.lowerRight = self.lowerRight.copy()
-        copyArea.center = self.center.copy()
+        copyArea = DetectedArea(confidence = self.confidence)
+        self.HELPER_copyGeometry(copyArea)
         return copyArea
+
+    def HELPER_copyGeometry(self, copyArea):
+        """
+        Copy the dimensions, the corners, the center and the radius into another area. Only the Points that have been built are copied.
+            :param copyArea: the area receiving the copy
+        """
+        copyArea.dimensions = (self.dimensions[0], self.dimensions[1])
+        copyArea.upperLeftPoint = self.upperLeftPoint
+        for name in ("_upperLeft", "_upperRight", "_lowerRight", "_lowerLeft", "_center"):
+            point = getattr(self, name)
+            setattr(copyArea, name, None if point is None else point.copy())
+        copyArea._radius = self._radius
     
     def rotateAreaCounterClockwise(self, origin, angle):
         """
@@ -82,6 +159,29 @@ class DetectedArea:
         self.lowerRight = self.lowerRight.projectPoint(oldOrigin, newOrigin)
         self.center = self.center.projectPoint(oldOrigin, newOrigin)
 
+    def transformArea(self, transform):
+        """
+        Move the rectangle with a Transform, like the one returned by extractRotatedPatch to map a patch back to its original image.
+        All the corners and the center are transformed with one matrix multiplication.
+            :param transform: the Transform object
+        """
+        (self.upperLeft, self.upperRight, self.lowerLeft, self.lowerRight, self.center) = \
+            [Point(x, y) for (x, y) in transform.applyToPoints(self.exportPoints()).tolist()]
+
+        # a scaling Transform (e.g. back from a resized image) changes the size too
+        scale = transform.scale()
+        if not math.isclose(scale, 1):
+            self.dimensions = (self.dimensions[0] * scale, self.dimensions[1] * scale)
+            self.radius = None
+
+    def exportPoints(self):
+        """
+        Return the coordinates of the corners and the center of the rectangle.
+            :return a list of (x, y) coordinates in the order upperLeft, upperRight, lowerLeft, lowerRight, center
+        """
+        return [(self.upperLeft.x, self.upperLeft.y), (self.upperRight.x, self.upperRight.y), (self.lowerLeft.x, self.lowerLeft.y), 
+                (self.lowerRight.x, self.lowerRight.y), (self.center.x, self.center.y)]
+
     def overlap(self, otherArea):
         """
         Check for overlap between two detectedAreas. (NOT FINALIZED CONDITION PARAMETERS)
@@ -90,7 +190,7 @@ class DetectedArea:
         """
         # print("DetectedArea overlap: NOT FINALIZED CONDITION PARAMETERS")
         distance = self.center.distTo(otherArea.center)
-        if distance < (self.center.distTo(self.upperLeft) + otherArea.center.distTo(otherArea.upperLeft))/4:
+        if distance < (self.radius + otherArea.radius)/4:
             return True
         return False
     
@@ -101,8 +201,8 @@ class DetectedArea:
             :param scale: the smallest possible size the smaller area can be compared to the bigger area to be considered "similarSize"
             :return True/False
         """
-        thisSize = self.center.distTo(self.upperLeft)
-        otherSize = otherArea.center.distTo(otherArea.upperLeft)
+        thisSize = self.radius
+        otherSize = otherArea.radius
 
         minSize = min(thisSize, otherSize)
         maxSize = max(thisSize, otherSize)
@@ -129,10 +229,20 @@ class DetectedArea:
         """
         Merge another area into itself to make a more accurate area. This does not delete the other area object. (NOT FINALIZED CONDITION PARAMETERS)
         For right now, merge will trust the user to call appropriately since all it does is make the caller object becomes the smaller object between the twos.
+        The merged area keeps the best confidence of the two.
             :param otherArea: the DetectedArea that we are merging with
         """
-        if self.center.distTo(self.upperLeft) > otherArea.center.distTo(otherArea.upperLeft):
-            self = otherArea
+        if self.radius > otherArea.radius:
+            otherArea.HELPER_copyGeometry(self)
+        self.HELPER_mergeConfidence(otherArea)
+
+    def HELPER_mergeConfidence(self, otherArea):
+        """
+        Keep the best confidence between the caller's and the other area's.
+            :param otherArea: the DetectedArea that is merged into the caller
+        """
+        if self.confidence is None or (otherArea.confidence is not None and otherArea.confidence > self.confidence):
+            self.confidence = otherArea.confidence
         
         
 
@@ -155,14 +265,17 @@ class DetectedArea:
 
 
 class DetectedFace(DetectedArea):
-    def __init__(self, upperLeftPoint = (0,0), dimensions = (0,0), angle = None):
+    __slots__ = ("counterClockwiseAngle", "leftEye", "rightEye")
+
+    def __init__(self, upperLeftPoint = (0,0), dimensions = (0,0), angle = None, confidence = None):
         """
         Create an detectedFace object that is a detectedArea object but with angle property.
             :param upperLeftPoint (x,y): the 2-tuple coordinates of the upper left point of the rectangle encapsulates detected objects.
             :param dimension (w,h): the dimension of the box encapsulates the detected object.
             :param angle: the angle of the image when the detected object was found and returned by openCV.
+            :param confidence: the level weight detectMultiScale3 gave the detected face (higher is more confident), None if it isn't known
         """
-        super().__init__(upperLeftPoint=upperLeftPoint, dimensions=dimensions)
+        super().__init__(upperLeftPoint=upperLeftPoint, dimensions=dimensions, confidence=confidence)
         # face's angle is the counter clockwise angle of the right eye to the left eye
         self.counterClockwiseAngle = angle
         self.leftEye = None
@@ -174,14 +287,264 @@ class DetectedFace(DetectedArea):
         Return a deep copy of the detectedArea caller
             :return a deep copy of itself
         """
-        copyArea = DetectedFace()
-        copyArea.dimensions = (self.dimensions[0], self.dimensions[1])
-        copyArea.upperLeft = self.upperLeft.copy()
-        copyArea.upperRight = self.upperRight.copy()
-        copyArea.lowerLeft = self.lowerLeft.copy()
-        copyArea.lowerRight = self.lowerRight.copy()
-        copyArea.center = self.center.copy()
+        copyArea = DetectedFace(confidence = self.confidence)
+        self.HELPER_copyGeometry(copyArea)
         copyArea.counterClockwiseAngle = self.counterClockwiseAngle
         copyArea.leftEye = self.leftEye
         copyArea.rightEye = self.rightEye
-        return copyArea
\ No newline at end of file
+        return copyArea
+
+    def merge(self, otherArea):
+        """
+        Merge another face into itself, the same way DetectedArea.merge does. The angle and the eyes come with the smaller face.
+            :param otherArea: the DetectedFace that we are merging with
+        """
+        if self.radius > otherArea.radius:
+            otherArea.HELPER_copyGeometry(self)
+            self.counterClockwiseAngle = otherArea.counterClockwiseAngle
+            self.leftEye = otherArea.leftEye
+            self.rightEye = otherArea.rightEye
+        self.HELPER_mergeConfidence(otherArea)
+
+
+
+class DetectedAreaArray:
+    """
+    Array-backed storage for N DetectedAreas. Instead of five Point objects per area, the corners, centers, radii and angles of all the areas are kept 
+    in contiguous float32 numpy arrays so rotating, projecting, comparing and drawing the whole set runs as numpy operations.
+    The corners are stored in drawing order: upperLeft, upperRight, lowerRight, lowerLeft.
+    """
+    def __init__(self, corners = None, centers = None, angles = None, rects = None, confidences = None):
+        """
+        Construct a DetectedAreaArray obj.
+            :param corners: (N x 4 x 2) array of the corners of the areas
+            :param centers: (N x 2) array of the centers of the areas
+            :param angles: (N) array of the counter clockwise angles the areas were rotated by. Default to 0
+            :param rects: the (N x 4) detectMultiScale output the areas came from, if they haven't been moved since
+            :param confidences: (N) array of the level weights detectMultiScale3 gave the areas, None if they aren't known
+        """
+        if corners is None:
+            corners = np.zeros((0, 4, 2), dtype = np.float32)
+            centers = np.zeros((0, 2), dtype = np.float32)
+        self.corners = np.asarray(corners, dtype = np.float32)
+        self.centers = np.asarray(centers, dtype = np.float32)
+        # radius is the distance from the center to a corner, rotating and projecting don't change it
+        self.radii = np.sqrt(((self.corners[:, 0] - self.centers) ** 2).sum(axis = 1))
+        if angles is None:
+            angles = np.zeros(len(self.centers), dtype = np.float32)
+        self.angles = np.asarray(angles, dtype = np.float32)
+        self.rects = rects
+        self.confidences = None if confidences is None else np.asarray(confidences, dtype = np.float32).reshape(-1)
+
+    @staticmethod
+    def fromRects(rects, confidences = None):
+        """
+        Create a DetectedAreaArray from the (x, y, w, h) rectangles returned by detectMultiScale. The rectangles are kept as they are (no copy) 
+        and handed back by toRects as long as the areas aren't moved.
+            :param rects: the detectMultiScale output
+            :param confidences: the level weights returned by detectMultiScale3 with the rectangles, None if they aren't known
+            :return the DetectedAreaArray obj
+        """
+        rects = np.asarray(rects)
+        if rects.ndim != 2:
+            rects = rects.reshape((-1, 4))
+        (x, y, w, h) = rects.T.astype(np.float32)
+
+        corners = np.empty((len(rects), 4, 2), dtype = np.float32)
+        corners[:, 0, 0] = corners[:, 3, 0] = x
+        corners[:, 1, 0] = corners[:, 2, 0] = x + w
+        corners[:, 0, 1] = corners[:, 1, 1] = y
+        corners[:, 2, 1] = corners[:, 3, 1] = y + h
+        centers = np.stack((x + w/2, y + h/2), axis = 1)
+
+        return DetectedAreaArray(corners, centers, rects = rects, confidences = confidences)
+
+    @staticmethod
+    def fromDetectedAreas(areas):
+        """
+        Create a DetectedAreaArray from a list of DetectedArea objects.
+            :param areas: the list of DetectedArea objects
+            :return the DetectedAreaArray obj
+        """
+        if len(areas) == 0:
+            return DetectedAreaArray()
+        corners = [[(area.upperLeft.x, area.upperLeft.y), (area.upperRight.x, area.upperRight.y), (area.lowerRight.x, area.lowerRight.y), (area.lowerLeft.x, area.lowerLeft.y)] for area in areas]
+        centers = [(area.center.x, area.center.y) for area in areas]
+        angles = [getattr(area, "counterClockwiseAngle", None) or 0 for area in areas]
+        confidences = None
+        if all(area.confidence is not None for area in areas):
+            confidences = [area.confidence for area in areas]
+        return DetectedAreaArray(corners, centers, angles, confidences = confidences)
+
+    def __len__(self):
+        return len(self.centers)
+
+    def __iter__(self):
+        return iter(self.toDetectedAreas())
+
+    def select(self, indices):
+        """
+        Return a new DetectedAreaArray containing only the selected areas.
+            :param indices: an index array or a boolean mask
+            :return the DetectedAreaArray obj
+        """
+        return DetectedAreaArray(self.corners[indices], self.centers[indices], self.angles[indices], 
+                                 confidences = None if self.confidences is None else self.confidences[indices])
+
+    @staticmethod
+    def concatenate(arrays):
+        """
+        Put the areas of several DetectedAreaArrays into one.
+            :param arrays: a list of DetectedAreaArray objs
+            :return the DetectedAreaArray obj
+        """
+        if len(arrays) == 0:
+            return DetectedAreaArray()
+        confidences = None
+        if all(array.confidences is not None for array in arrays):
+            confidences = np.concatenate([array.confidences for array in arrays])
+        return DetectedAreaArray(np.concatenate([array.corners for array in arrays]), np.concatenate([array.centers for array in arrays]), 
+                                 np.concatenate([array.angles for array in arrays]), confidences = confidences)
+
+    def toRects(self):
+        """
+        Return the areas as (x, y, w, h) rectangles. If the areas haven't been moved since fromRects, the original detectMultiScale output is returned
+        without copying, otherwise the axis-aligned rectangles encapsulating the (rotated) areas are calculated.
+            :return (N x 4) array of rectangles
+        """
+        if self.rects is not None:
+            return self.rects
+        upperLeft = self.corners.min(axis = 1)
+        lowerRight = self.corners.max(axis = 1)
+        return np.hstack((upperLeft, lowerRight - upperLeft))
+
+    def toDetectedAreas(self):
+        """
+        Convert the array back into a list of DetectedArea objects.
+            :return a list of DetectedArea objects
+        """
+        widths = np.sqrt(((self.corners[:, 1] - self.corners[:, 0]) ** 2).sum(axis = 1))
+        heights = np.sqrt(((self.corners[:, 3] - self.corners[:, 0]) ** 2).sum(axis = 1))
+
+        confidences = [None] * len(self) if self.confidences is None else self.confidences.tolist()
+
+        areas = []
+        for (corners, center, width, height, radius, confidence) in zip(self.corners.tolist(), self.centers.tolist(), widths.tolist(), heights.tolist(), 
+                                                                        self.radii.tolist(), confidences):
+            area = DetectedArea(confidence = confidence)
+            (area.upperLeft, area.upperRight, area.lowerRight, area.lowerLeft) = [Point(x, y) for (x, y) in corners]
+            area.center = Point(center[0], center[1])
+            area.dimensions = (width, height)
+            area.radius = radius
+            areas.append(area)
+        return areas
+
+    def transform(self, transform, angle = 0):
+        """
+        Move all the areas with a Transform.
+            :param transform: the Transform object
+            :param angle: the counter clockwise angle the Transform rotates the areas by, added to the areas' angles
+        """
+        self.corners = transform.applyToPoints(self.corners.reshape((-1, 2))).astype(np.float32).reshape((-1, 4, 2))
+        self.centers = transform.applyToPoints(self.centers).astype(np.float32)
+        self.radii = self.radii * np.float32(transform.scale())
+        self.angles = self.angles + angle
+        self.rects = None
+
+    def rotateAreaCounterClockwise(self, origin, angle):
+        """
+        Rotate all the areas counter-clockwise around an origin by a given degree.
+            :param origin: the point where the areas are going to rotate around
+            :param angle: the angle the areas are going to rotate by
+        """
+        self.transform(Transform.rotationCounterClockwise(origin, angle), angle)
+
+    def rotateAreaClockwise(self, origin, angle):
+        """
+        Rotate all the areas clockwise around an origin by a given degree.
+            :param origin: the point where the areas are going to rotate around
+            :param angle: the angle the areas are going to rotate by
+        """
+        self.transform(Transform.rotationClockwise(origin, angle), -angle)
+
+    def projectArea(self, oldOrigin, newOrigin):
+        """
+        Project all the areas such that their new positions relative to newOrigin are the same as their current relative positions to oldOrigin.
+            :param oldOrigin: the old origin point
+            :param newOrigin: the projected old Origin
+        """
+        self.transform(Transform.projection(oldOrigin, newOrigin))
+
+    def distanceMatrix(self, otherArray):
+        """
+        Calculate the distances between the centers of every area in this array and every area in the other array.
+            :param otherArray: the other DetectedAreaArray
+            :return (N x M) matrix of center distances
+        """
+        return np.sqrt(((self.centers[:, None, :] - otherArray.centers[None, :, :]) ** 2).sum(axis = 2))
+
+    def overlap(self, otherArray):
+        """
+        Check for overlap between every area in this array and every area in the other array, with the same condition as DetectedArea.overlap.
+            :param otherArray: the other DetectedAreaArray
+            :return (N x M) boolean matrix
+        """
+        return self.distanceMatrix(otherArray) < (self.radii[:, None] + otherArray.radii[None, :])/4
+
+    def similarSize(self, otherArray, scale):
+        """
+        Compare the size of every area in this array with every area in the other array, with the same condition as DetectedArea.similarSize.
+            :param otherArray: the other DetectedAreaArray
+            :param scale: the smallest possible size the smaller area can be compared to the bigger area to be considered "similarSize"
+            :return (N x M) boolean matrix
+        """
+        minSize = np.minimum(self.radii[:, None], otherArray.radii[None, :])
+        maxSize = np.maximum(self.radii[:, None], otherArray.radii[None, :])
+        return minSize > maxSize * scale
+
+    def appropriateDistanceTo(self, otherArray, minAverageRadiusDistScale, maxAverageRadiusDistScale):
+        """
+        Decide for every area in this array and every area in the other array whether their distance is appropriate, with the same condition 
+        as DetectedArea.appropriateDistanceTo.
+            :param otherArray: the other DetectedAreaArray
+            :param minAverageRadiusDistScale: the mininum multiplier for the average radius between two detectedAreas 
+            :param maxAverageRadiusDistScale: the maximum multiplier for the average radius between two detectedAreas 
+            :return (N x M) boolean matrix
+        """
+        dist = self.distanceMatrix(otherArray)
+        averageRadius = (self.radii[:, None] + otherArray.radii[None, :])/2
+        return (dist < maxAverageRadiusDistScale * averageRadius) & (dist > minAverageRadiusDistScale * averageRadius)
+
+    def nonMaxSuppression(self, similarSizeScale, scores = None):
+        """
+        Group the areas that are duplicates of each other (DetectedArea.similarSize and DetectedArea.overlap both True) and keep the best scored 
+        area of every group. The duplicates of all the areas are found at once as an (N x N) matrix.
+            :param similarSizeScale: the scale parameter of DetectedArea.similarSize
+            :param scores: (N) array of scores, higher is better. If None, the areas' confidences if they are known, otherwise an area's score is the 
+            number of areas it overlaps with, since real objects are found many times (at several angles) while false positives are usually found once
+            :return the array of the kept areas' indices, best scored first
+        """
+        duplicates = self.similarSize(self, similarSizeScale) & self.overlap(self)
+        if scores is None:
+            scores = self.confidences if self.confidences is not None else duplicates.sum(axis = 1)
+
+        # stable sort so equal scores keep the order the areas were found in
+        order = np.argsort(-np.asarray(scores, dtype = np.float64), kind = "stable")
+        suppressed = np.zeros(len(self), dtype = bool)
+        kept = []
+        for i in order:
+            if suppressed[i]:
+                continue
+            kept.append(i)
+            suppressed |= duplicates[i]
+
+        return np.array(kept, dtype = np.intp)
+
+    def draw(self, canvas, color, thickness):
+        """
+        Draw the shapes of all the areas on top of the given image with specified color and thickness
+            :param canvas: the given image to be drawn over
+            :param color: the BGR-color specified for the areas
+            :param thickness: the specified thickness of the areas
+        """
+        cv.polylines(canvas, list(self.corners.astype(np.int32)), True, color, thickness = thickness)
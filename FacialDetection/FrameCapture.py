@@ -0,0 +1,132 @@
+import time
+import threading
+from collections import deque
+
+
+class FrameCapture:
+    """
+    FrameCapture reads the frames of a cv.VideoCapture on its own thread into a bounded ring buffer, so a slow decode or a stalled camera never blocks
+    the thread drawing the frames and running the detections, and the frames don't pile up in the capture's own buffer. What happens when the buffer
+    is full depends on dropPolicy:
+        "latest": only the newest frame is kept, the frame that wasn't read yet is dropped
+        "dropOldest": the oldest frame of the buffer is dropped to make room for the new one
+        "block": the capture waits until a frame is read, nothing is dropped (for video files, which would otherwise be decoded as fast as possible)
+    """
+    HARDCODED_dropPolicies = ("latest", "dropOldest", "block")
+
+    def __init__(self, video, bufferSize = 2, dropPolicy = "latest", lateAfter = None):
+        """
+        Construct a FrameCapture object, the capture thread starts with start()
+            :param video: the cv.VideoCapture object (anything with a read() returning (ret, frame))
+            :param bufferSize: the max number of frames waiting to be read ("latest" keeps only 1)
+            :param dropPolicy: "latest", "dropOldest" or "block", what happens to the frames once the buffer is full
+            :param lateAfter: a frame read more than that many seconds after it was captured is counted as late, None to not count them
+        """
+        if dropPolicy not in self.HARDCODED_dropPolicies:
+            raise ValueError("dropPolicy must be one of " + ", ".join(self.HARDCODED_dropPolicies))
+
+        self.video = video
+        self.dropPolicy = dropPolicy
+        self.bufferSize = 1 if dropPolicy == "latest" else max(1, bufferSize)
+        self.lateAfter = lateAfter
+
+        # buffer holds (frame number, capture time, frame), oldest first
+        self.buffer = deque()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.stopped = False
+        self.ended = False
+
+        # frame number of the last frame read, and the counters of the frames captured, read, dropped, and read late
+        self.lastFrameNumber = -1
+        self.framesCaptured = 0
+        self.framesRead = 0
+        self.framesDropped = 0
+        self.framesLate = 0
+
+
+    def start(self):
+        """
+        Start the capture thread.
+            :return this FrameCapture object
+        """
+        self.thread = threading.Thread(target = self.HELPER_captureLoop, name = "FrameCapture", daemon = True)
+        self.thread.start()
+        return self
+
+
+    def HELPER_captureLoop(self):
+        """
+        Read the frames of the video into the buffer until the video ends or stop() is called.
+        """
+        frameNumber = 0
+        while not self.stopped:
+            (ret, frame) = self.video.read()
+            captureTime = time.monotonic()
+
+            with self.condition:
+                if not ret:
+                    break
+
+                if len(self.buffer) >= self.bufferSize:
+                    if self.dropPolicy == "block":
+                        self.condition.wait_for(lambda: len(self.buffer) < self.bufferSize or self.stopped)
+                        if self.stopped:
+                            break
+                    else:
+                        self.buffer.popleft()
+                        self.framesDropped = self.framesDropped + 1
+
+                self.buffer.append((frameNumber, captureTime, frame))
+                self.framesCaptured = self.framesCaptured + 1
+                self.condition.notify_all()
+            frameNumber = frameNumber + 1
+
+        with self.condition:
+            self.ended = True
+            self.condition.notify_all()
+
+
+    def read(self, timeout = None):
+        """
+        Take the oldest frame of the buffer (the newest one with "latest"), waiting for the capture thread when the buffer is empty. Drop-in for
+        cv.VideoCapture.read.
+            :param timeout: max number of seconds to wait for a frame, None to wait until there is one or the video ends
+            :return a 2-tuple (True, frame), or (False, None) when the video ended (or no frame came in time)
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: len(self.buffer) != 0 or self.ended, timeout):
+                return (False, None)
+            if len(self.buffer) == 0:
+                return (False, None)
+
+            (frameNumber, captureTime, frame) = self.buffer.popleft()
+            self.framesRead = self.framesRead + 1
+            if self.lateAfter is not None and time.monotonic() - captureTime > self.lateAfter:
+                self.framesLate = self.framesLate + 1
+            self.lastFrameNumber = frameNumber
+            self.condition.notify_all()
+
+        return (True, frame)
+
+
+    def stop(self):
+        """
+        Stop the capture thread and wait for it to finish its current read. The frames left in the buffer are dropped. The video isn't released.
+        """
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+        with self.condition:
+            self.buffer.clear()
+
+
+    def stats(self):
+        """
+        Return the counters of the capture.
+            :return a dict with the number of frames captured, read, dropped and read late
+        """
+        with self.condition:
+            return {"captured": self.framesCaptured, "read": self.framesRead, "dropped": self.framesDropped, "late": self.framesLate}
@@ -0,0 +1,87 @@
+import time
+import math
+
+
+class FrameScheduler:
+    """
+    FrameScheduler paces the frames of a video by sleeping until the display time of the next frame, instead of spinning on the clock and taking a core
+    away from the detection threads. The display times are a fixed grid of frameInterval on a monotonic clock. What happens when a frame is drawn after
+    the display time of the frame after it depends on policy:
+        "catchUp": the next frames are drawn right away until the video is back on time, no frame is skipped
+        "skip": the display times already missed are skipped, the caller drops their frames to keep the video at its speed
+    """
+    HARDCODED_policies = ("catchUp", "skip")
+
+    def __init__(self, frameInterval, policy = "catchUp", clock = time.monotonic, sleep = time.sleep):
+        """
+        Construct a FrameScheduler object, the first frame is due frameInterval after start()
+            :param frameInterval: the number of seconds between two frames
+            :param policy: "catchUp" or "skip", what to do with the frames whose display time already passed
+            :param clock: the monotonic clock giving the time in seconds
+            :param sleep: the function sleeping for a number of seconds
+        """
+        if policy not in self.HARDCODED_policies:
+            raise ValueError("policy must be one of " + ", ".join(self.HARDCODED_policies))
+
+        self.frameInterval = frameInterval
+        self.policy = policy
+        self.clock = clock
+        self.sleep = sleep
+        self.nextFrame = None
+
+        # counters of the frames waited for and skipped, and the sums of the jitter (how late wait() returned after the display time) for its stats
+        self.frames = 0
+        self.framesSkipped = 0
+        self.jitterSum = 0
+        self.jitterSquaredSum = 0
+        self.jitterMax = 0
+
+
+    def start(self):
+        """
+        Start the grid of display times now.
+            :return this FrameScheduler object
+        """
+        self.nextFrame = self.clock() + self.frameInterval
+        return self
+
+
+    def wait(self):
+        """
+        Sleep until the display time of the next frame, then move on to the display time of the frame after it.
+            :return the number of frames whose display time was skipped (always 0 with "catchUp")
+        """
+        if self.nextFrame is None:
+            self.start()
+
+        now = self.clock()
+        if now < self.nextFrame:
+            self.sleep(self.nextFrame - now)
+            now = self.clock()
+
+        jitter = max(0, now - self.nextFrame)
+        self.frames = self.frames + 1
+        self.jitterSum = self.jitterSum + jitter
+        self.jitterSquaredSum = self.jitterSquaredSum + jitter * jitter
+        self.jitterMax = max(self.jitterMax, jitter)
+
+        skipped = 0
+        if self.policy == "skip" and jitter >= self.frameInterval:
+            skipped = int(jitter // self.frameInterval)
+            self.framesSkipped = self.framesSkipped + skipped
+        self.nextFrame = self.nextFrame + self.frameInterval * (skipped + 1)
+        return skipped
+
+
+    def stats(self):
+        """
+        Return the counters and the jitter of the frames waited for.
+            :return a dict with the number of frames waited for and skipped, and the mean, standard deviation and max jitter in milliseconds
+        """
+        if self.frames == 0:
+            return {"frames": 0, "skipped": self.framesSkipped, "meanJitterMs": 0, "stdJitterMs": 0, "maxJitterMs": 0}
+
+        mean = self.jitterSum / self.frames
+        variance = max(0, self.jitterSquaredSum / self.frames - mean * mean)
+        return {"frames": self.frames, "skipped": self.framesSkipped, "meanJitterMs": mean * 1000, "stdJitterMs": math.sqrt(variance) * 1000,
+                "maxJitterMs": self.jitterMax * 1000}
@@ -0,0 +1,137 @@
+import cv2 as cv
+import json
+import queue
+import threading
+
+
+"""
+Sinks are where VideoManager.runHeadless sends the faces tracked in every frame. Every sink has:
+    visual: True if the sink needs the frame with the faces drawn on it, the faces are only drawn when at least one sink is visual
+    write(frameNumber, faces, frame): take the faces of a frame, frame being the frame the faces were tracked in (drawn on if any sink is visual)
+    close(): flush and release what the sink holds, called once the video ended
+"""
+
+
+
+def faceToDict(face):
+    """
+    Convert a DetectedFace to a dict that can be written as json.
+        :param face: the DetectedFace object
+        :return a dict with the center, dimensions, counter clockwise angle, confidence and corners (upperLeft, upperRight, lowerRight, lowerLeft) of the face
+    """
+    return {"center": [float(face.center.x), float(face.center.y)],
+            "dimensions": [float(face.dimensions[0]), float(face.dimensions[1])],
+            "angle": None if face.counterClockwiseAngle is None else float(face.counterClockwiseAngle),
+            "confidence": None if face.confidence is None else float(face.confidence),
+            "corners": [[float(point.x), float(point.y)] for point in (face.upperLeft, face.upperRight, face.lowerRight, face.lowerLeft)]}
+
+
+
+class CallbackSink:
+    """
+    Call a function with the faces of every frame.
+    """
+    def __init__(self, callback, visual = False):
+        """
+        Construct a CallbackSink object
+            :param callback: the function called with (frameNumber, faces, frame)
+            :param visual: True if the callback needs the faces drawn on the frame
+        """
+        self.callback = callback
+        self.visual = visual
+
+    def write(self, frameNumber, faces, frame):
+        self.callback(frameNumber, faces, frame)
+
+    def close(self):
+        pass
+
+
+
+class JsonLinesSink:
+    """
+    Write the faces of every frame as a line of json {"frame": frameNumber, "faces": [faceToDict(face), ...]} to a file.
+    """
+    visual = False
+
+    def __init__(self, path):
+        """
+        Construct a JsonLinesSink object
+            :param path: the path to the json lines file, overwritten if it exists
+        """
+        self.file = open(path, "w")
+
+    def write(self, frameNumber, faces, frame):
+        self.file.write(json.dumps({"frame": frameNumber, "faces": [faceToDict(face) for face in faces]}) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+
+class VideoWriterSink:
+    """
+    Write the frames with the faces drawn on them to a video file. The frames are encoded on a background thread so a slow encoder doesn't hold up the
+    tracking, and the writer is opened with the dimensions of the first frame.
+    """
+    visual = True
+    HARDCODED_queueSize = 32
+
+    def __init__(self, path, fps, fourcc = "mp4v"):
+        """
+        Construct a VideoWriterSink object
+            :param path: the path to the video file, overwritten if it exists
+            :param fps: the fps of the video written
+            :param fourcc: the 4 characters code of the codec
+        """
+        self.path = path
+        self.fps = fps
+        self.fourcc = cv.VideoWriter_fourcc(*fourcc)
+        self.writer = None
+        # the frames waiting to be encoded, None tells the thread to stop
+        self.frames = queue.Queue(self.HARDCODED_queueSize)
+        self.thread = threading.Thread(target = self.HELPER_writeLoop, name = "VideoWriterSink", daemon = True)
+        self.thread.start()
+
+    def HELPER_writeLoop(self):
+        """
+        Encode the frames of the queue until close() is called.
+        """
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                break
+            if self.writer is None:
+                self.writer = cv.VideoWriter(self.path, self.fourcc, self.fps, (frame.shape[1], frame.shape[0]))
+            self.writer.write(frame)
+
+        if self.writer is not None:
+            self.writer.release()
+
+    def write(self, frameNumber, faces, frame):
+        self.frames.put(frame)
+
+    def close(self):
+        self.frames.put(None)
+        self.thread.join()
+
+
+
+class QueueSink:
+    """
+    Put (frameNumber, faces) of every frame in a queue, for another thread to consume. The faces are copies, the tracking keeps updating its own.
+    """
+    visual = False
+
+    def __init__(self, outputQueue = None):
+        """
+        Construct a QueueSink object
+            :param outputQueue: the queue.Queue to put the faces in, a new unbounded one if None
+        """
+        self.queue = queue.Queue() if outputQueue is None else outputQueue
+
+    def write(self, frameNumber, faces, frame):
+        self.queue.put((frameNumber, [face.copy() for face in faces]))
+
+    def close(self):
+        pass
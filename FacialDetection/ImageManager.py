@@ -3,8 +3,18 @@ import cv2 as cv
 from Point import Point
 from DetectedArea import DetectedArea
 from DetectedArea import DetectedFace
+from DetectedArea import DetectedAreaArray
+from Transform import Transform
+from SpatialIndex import SpatialIndex
 from helperFunctions import *
 import numpy as np
+import os
+import time
+import threading
+import itertools
+import atexit
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 
 """ 
@@ -31,10 +41,20 @@ class ImageManager:
     """
     A manager that stores the actual image and can do image processing function on it. This object will be used to take care of facial detection.
     """
-    haarcascade_eye = cv.CascadeClassifier("classifier/haarcascade_eye.xml")
-    haarcascade_face = cv.CascadeClassifier("classifier/haarcascade_frontalface_default.xml")
-    # haarcascade_face = cv.CascadeClassifier("classifier/lbpcascaade_frontalface_improved.xml")
-    haarcascade_nose = cv.CascadeClassifier("classifier/haarcascade_nose.xml")
+    HARDCODED_eyeCascadePath = "classifier/haarcascade_eye.xml"
+    HARDCODED_faceCascadePath = "classifier/haarcascade_frontalface_default.xml"
+    # HARDCODED_faceCascadePath = "classifier/lbpcascaade_frontalface_improved.xml"
+    HARDCODED_noseCascadePath = "classifier/haarcascade_nose.xml"
+    haarcascade_eye = cv.CascadeClassifier(HARDCODED_eyeCascadePath)
+    haarcascade_face = cv.CascadeClassifier(HARDCODED_faceCascadePath)
+    haarcascade_nose = cv.CascadeClassifier(HARDCODED_noseCascadePath)
+    # the classifiers above are shared and only used by the calling thread, worker threads load their own clones in here (see HELPER_threadCascade)
+    HELPER_threadCascades = threading.local()
+    # thread pools shared by every ImageManager, by number of workers, until shutdownExecutors is called (at the latest when the interpreter exits)
+    HELPER_executors = {}
+    HELPER_executorsLock = threading.Lock()
+    # detection settings of a detectBatch worker process, set once by HELPER_initBatchWorker
+    HELPER_batchSettings = None
     HARDCODED_similarSizeScale = 0.5
     HARDCODED_pairOfEyesDistanceRange = (1.5, 3.5)
     # eye and face min and max dimensions in a 500pixel x ? pixel images
@@ -42,20 +62,286 @@ class ImageManager:
     HARDCODED_eyeMaxDimensions = (200, 200)
     HARDCODED_faceMinDimensions = (80, 80)
     HARDCODED_faceMaxDimensions = (500, 500)
-
-    def __init__(self, img):
+    # tilts of pairs of eyes are rounded to multiples of this many degrees to reuse the rotated images of the cache, 
+    # which can hold that many bytes of rotated images
+    HARDCODED_rotationCacheAngleStep = 5
+    HARDCODED_rotationCacheMaxBytes = 16 * 1024 * 1024
+    # pairs of eyes leaning by at most that many degrees apart, whose face windows fit in a window at most that many times their area, are verified together
+    HARDCODED_pairClusterAngleRange = 10
+    HARDCODED_pairClusterMaxAreaRatio = 1.5
+    # overlapping face proposals of pairs of eyes leaning by at most that many degrees apart are the same face
+    HARDCODED_proposalAngleRange = 20
+    # the nose of a face window is looked for in a band of (width, height) eye radiuses right below and right above the eye line, 
+    # noses are at least that many eye radiuses wide and tall
+    HARDCODED_noseBandDimensions = (4, 3.5)
+    HARDCODED_noseMinDimensions = (0.8, 0.6)
+    HARDCODED_noseMinNeighbors = 3
+    # the coarse pass of findPairsOfEyesCoarseToFine scans these angles on the image downscaled by coarseSweepScale with a coarser pyramid and a lower 
+    # minNeighbors, then the fine pass scans at most fineSweepMaxAngles angles, the tilts of the coarse pairs of eyes less than fineSweepAngleRange 
+    # degrees apart being scanned once
+    HARDCODED_coarseSweepAngles = (-60, -30, 0, 30, 60, 90)
+    HARDCODED_coarseSweepScale = 0.5
+    HARDCODED_coarseSweepScaleFactor = 1.3
+    HARDCODED_coarseSweepMinNeighbors = 3
+    HARDCODED_fineSweepAngleRange = 20
+    HARDCODED_fineSweepMaxAngles = 4
+    # angles findFaces rotates the image by when none are given
+    HARDCODED_findFacesAngles = (0, 45, -45)
+
+    def __init__(self, img, workers = 1, rotationCacheAngleStep = HARDCODED_rotationCacheAngleStep, rotationCacheMaxBytes = HARDCODED_rotationCacheMaxBytes, 
+                 useConfidence = False, resolveOrientation = True, minFaceDimension = None):
         """
         Constructing an ImageManger object
             :param img: the image/frame that we will run facial detection on
+            :param workers: number of threads the angles and the pairs of eyes are scanned on at the same time, 1 to scan them one after another
+            :param rotationCacheAngleStep: the tilts of the pairs of eyes are rounded to multiples of this many degrees to look up the rotated images cache
+            :param rotationCacheMaxBytes: max number of bytes of rotated images kept in the cache, the least recently used ones are dropped first
+            :param useConfidence: if True, the classifiers run with detectMultiScale3 and the detected eyes and faces carry their level weights as 
+            confidence. Pairs of eyes are then verified best first and faces are picked by confidence instead of size
+            :param resolveOrientation: if True, the nose classifier decides whether the face of a pair of eyes is right side up or upside down before 
+            the face classifier runs, so the face window is scanned in that orientation first and the rescan the other way up is only needed when
+            the nose was wrong. Otherwise (or when the nose classifier can't tell) the face window is scanned upside down when no face is found 
+            right side up
+            :param minFaceDimension: the smallest face width (in pixels) to look for, the eye and face min and max dimensions (tuned for HARDCODED_faceMinDimensions 
+            faces) are scaled by the same ratio. None to keep them as they are. See findFacesTwoStage
         """
         # Blank canvas that we are going to use to store the rotated image
         self.image = img
         self.grayImage = cv.cvtColor(self.image, cv.COLOR_BGR2GRAY)
         self.imageCenter = Point(img.shape[1]/2, img.shape[0]/2)
+        self.workers = workers
+        self.executor = self.HELPER_executor(workers) if workers > 1 else None
+        self.useConfidence = useConfidence
+        self.resolveOrientation = resolveOrientation
+
+        # the size thresholds of detectMultiScale, in pixels of this image
+        self.dimensionsScale = 1 if minFaceDimension is None else minFaceDimension / self.HARDCODED_faceMinDimensions[0]
+        self.eyeMinDimensions = self.HELPER_scaleDimensions(self.HARDCODED_eyeMinDimensions)
+        self.eyeMaxDimensions = self.HELPER_scaleDimensions(self.HARDCODED_eyeMaxDimensions)
+        self.faceMinDimensions = self.HELPER_scaleDimensions(self.HARDCODED_faceMinDimensions)
+        self.faceMaxDimensions = self.HELPER_scaleDimensions(self.HARDCODED_faceMaxDimensions)
+
+        # rotationCache maps a counter clockwise angle to (rotated grayImage, its center, its number of bytes), least recently used first
+        self.rotationCache = OrderedDict()
+        self.rotationCacheAngleStep = rotationCacheAngleStep
+        self.rotationCacheMaxBytes = rotationCacheMaxBytes
+        self.rotationCacheBytes = 0
+        self.rotationCacheHits = 0
+        self.rotationCacheMisses = 0
+        self.rotationCacheLock = threading.Lock()
+
+        # the counters below are updated from the worker threads under statsLock
+        self.statsLock = threading.Lock()
+        # number of face scans of the last findFacesUsingPairOfEyes, and how many of them clustering the pairs of eyes saved
+        self.faceCascadeInvocations = 0
+        # number of pairs of eyes of the last findFacesUsingPairOfEyes whose face orientation the nose classifier decided
+        self.orientationsResolved = 0
+        # number of classifier window positions of the rotated images scanned so far (see HELPER_cascadeWork), and the angles and work of the last
+        # findPairsOfEyesCounterClockwiseMultipleAngles or findPairsOfEyesCoarseToFine
+        self.sweepCascadeWork = 0
+        self.angleSweepStats = None
+        self.pairVerificationStats = None
     
     
+    def HELPER_scaleDimensions(self, dimensions):
+        """
+        Scale HARDCODED (width, height) dimensions by dimensionsScale.
+            :param dimensions: (width, height) 2-tuple
+            :return the scaled (width, height) 2-tuple of ints
+        """
+        return (round(dimensions[0] * self.dimensionsScale), round(dimensions[1] * self.dimensionsScale))
+
+
+    @classmethod
+    def HELPER_executor(cls, workers):
+        """
+        Return the thread pool with the given number of workers, creating it the first time. The pools are shared by every ImageManager so 
+        the worker threads (and their classifier clones) are reused from one image/frame to the next.
+            :param workers: number of worker threads
+            :return a ThreadPoolExecutor object
+        """
+        with cls.HELPER_executorsLock:
+            executor = cls.HELPER_executors.get(workers)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "ImageManager")
+                cls.HELPER_executors[workers] = executor
+        return executor
+
+
+    @classmethod
+    def shutdownExecutors(cls):
+        """
+        Shut down the thread pools shared by the ImageManagers, waiting for the tasks running on them. Called when the interpreter exits, call it 
+        sooner to release the worker threads. The ImageManagers constructed before the call can't run their detections on multiple workers 
+        anymore, the ones constructed after it create new pools.
+        """
+        with cls.HELPER_executorsLock:
+            executors = list(cls.HELPER_executors.values())
+            cls.HELPER_executors.clear()
+        for executor in executors:
+            executor.shutdown(wait = True)
+
+
+    @classmethod
+    def HELPER_threadCascade(cls, cascadePath):
+        """
+        Return the CascadeClassifier loaded from cascadePath that belongs to the calling thread. A classifier shared between threads isn't safe to 
+        run detectMultiScale on at the same time, so every worker thread loads its own clone once and keeps it.
+            :param cascadePath: the path of the classifier xml file
+            :return the calling thread's CascadeClassifier object
+        """
+        cascades = getattr(cls.HELPER_threadCascades, "cascades", None)
+        if cascades is None:
+            cascades = {}
+            cls.HELPER_threadCascades.cascades = cascades
+
+        cascade = cascades.get(cascadePath)
+        if cascade is None:
+            cascade = cv.CascadeClassifier(cascadePath)
+            cascades[cascadePath] = cascade
+        return cascade
+
 
     
+    def HELPER_lookUpRotatedGrayImage(self, angle):
+        """
+        Look for the grayImage rotated counter clockwise by angle in the rotation cache, counting the hit or miss.
+            :param angle: the counter clockwise angle
+            :return a 2-tuple (rotated grayImage, Point of its center), None if it isn't cached
+        """
+        angle = angle % 360
+        with self.rotationCacheLock:
+            cached = self.rotationCache.get(angle)
+            if cached is None:
+                self.rotationCacheMisses = self.rotationCacheMisses + 1
+                return None
+
+            self.rotationCacheHits = self.rotationCacheHits + 1
+            self.rotationCache.move_to_end(angle)
+            return cached[:2]
+
+
+    def HELPER_cachedFaceAngle(self, angle):
+        """
+        Round the tilt of a pair of eyes to rotationCacheAngleStep if the grayImage is in the rotation cache rotated by that much, without counting 
+        a hit or a miss. This is the angle HELPER_verifyPairOfEyes straightens the face up by.
+            :param angle: the counter clockwise angle of the pair of eyes
+            :return the rounded angle if its rotated image is cached, angle otherwise
+        """
+        roundedAngle = round(angle / self.rotationCacheAngleStep) * self.rotationCacheAngleStep
+        with self.rotationCacheLock:
+            return roundedAngle if (-roundedAngle) % 360 in self.rotationCache else angle
+
+
+    def HELPER_rotatedGrayImage(self, angle):
+        """
+        Return the grayImage rotated counter clockwise by angle, from the rotation cache if it is there, otherwise rotate it and keep it in the cache.
+        The least recently used rotated images are dropped once the cache holds more than rotationCacheMaxBytes, a rotated image bigger than that on 
+        its own isn't kept at all.
+            :param angle: the counter clockwise angle
+            :return a 2-tuple (rotated grayImage, Point of its center). The rotated image is shared, don't modify it
+        """
+        angle = angle % 360
+        cached = self.HELPER_lookUpRotatedGrayImage(angle)
+        if cached is not None:
+            return cached
+
+        rotatedGrayImage = rotateCounterClockwise(self.grayImage, angle, allowView = True)
+        rotatedCenter = Point(rotatedGrayImage.shape[1]/2, rotatedGrayImage.shape[0]/2)
+        # right angles are views of grayImage and don't take any extra memory
+        size = 0 if np.shares_memory(rotatedGrayImage, self.grayImage) else rotatedGrayImage.nbytes
+
+        if size > self.rotationCacheMaxBytes:
+            # keeping it would drop every other rotated image and still not fit
+            return (rotatedGrayImage, rotatedCenter)
+
+        with self.rotationCacheLock:
+            if angle not in self.rotationCache:
+                self.rotationCache[angle] = (rotatedGrayImage, rotatedCenter, size)
+                self.rotationCacheBytes = self.rotationCacheBytes + size
+                while self.rotationCacheBytes > self.rotationCacheMaxBytes:
+                    (_, (_, _, droppedSize)) = self.rotationCache.popitem(last = False)
+                    self.rotationCacheBytes = self.rotationCacheBytes - droppedSize
+
+        return (rotatedGrayImage, rotatedCenter)
+
+
+    def HELPER_cropRotatedGrayImage(self, rotatedGrayImage, rotatedCenter, angle, center, size):
+        """
+        Cut a (width x height) window around center out of the grayImage rotated counter clockwise by angle. Gives the same patch as
+        extractRotatedPatch(self.grayImage, center, -angle, size) but without warping anything when the window is inside the rotated image.
+            :param rotatedGrayImage: the grayImage rotated counter clockwise by angle
+            :param rotatedCenter: the Point of the center of rotatedGrayImage
+            :param angle: the counter clockwise angle rotatedGrayImage was rotated by
+            :param center: the Point in the original image that ends up at the center of the patch
+            :param size: (width, height) of the patch
+            :return a 2-tuple with the first element being the patch, and the second element the Transform mapping patch coordinates back to 
+            the original image coordinates
+        """
+        (width, height) = (int(size[0]), int(size[1]))
+        rotatedToImage = Transform.rotationClockwise(rotatedCenter, angle).then(Transform.projection(rotatedCenter, self.imageCenter))
+        windowCenter = rotatedToImage.inverse().applyToPoint(center)
+        (minX, minY) = (int(round(windowCenter.x - width/2)), int(round(windowCenter.y - height/2)))
+
+        (rotatedHeight, rotatedWidth) = rotatedGrayImage.shape[:2]
+        if minX >= 0 and minY >= 0 and minX + width <= rotatedWidth and minY + height <= rotatedHeight:
+            patch = rotatedGrayImage[minY: minY + height, minX: minX + width]
+        else:
+            # parts of the window outside of the rotated image are black
+            patch = np.zeros((height, width), dtype = rotatedGrayImage.dtype)
+            (cropMinX, cropMinY) = (max(0, minX), max(0, minY))
+            (cropMaxX, cropMaxY) = (min(rotatedWidth, minX + width), min(rotatedHeight, minY + height))
+            if cropMinX < cropMaxX and cropMinY < cropMaxY:
+                patch[cropMinY - minY: cropMaxY - minY, cropMinX - minX: cropMaxX - minX] = rotatedGrayImage[cropMinY: cropMaxY, cropMinX: cropMaxX]
+
+        return (patch, Transform.translation(minX, minY).then(rotatedToImage))
+
+
+    def HELPER_detect(self, detector, image, scaleFactor, minNeighbors, minDimensions, maxDimensions):
+        """
+        Run the classifier on the image, with detectMultiScale3 to get the level weights as well when useConfidence is True.
+            :param detector: the haarcascade object that is going to scan the image
+            :param image: the image to scan
+            :param scaleFactor: scaleFactor parameter for detectMultiScale function
+            :param minNeighbors: minNeighbors parameter for detectMultiScale function
+            :param minDimensions: minSize parameter for detectMultiScale function
+            :param maxDimensions: maxSize parameter for detectMultiScale function
+            :return a 2-tuple with the first element being the detectMultiScale output, and the second element the level weights of 
+            the detected objects (None when useConfidence is False)
+        """
+        if not self.useConfidence:
+            return (detector.detectMultiScale(image, scaleFactor = scaleFactor, minNeighbors = minNeighbors, minSize = minDimensions, maxSize = maxDimensions), None)
+
+        (rawObjs, rejectLevels, levelWeights) = detector.detectMultiScale3(image, scaleFactor = scaleFactor, minNeighbors = minNeighbors, 
+            minSize = minDimensions, maxSize = maxDimensions, outputRejectLevels = True)
+        return (rawObjs, np.asarray(levelWeights, dtype = np.float32).reshape(-1))
+
+
+    @staticmethod
+    def HELPER_cascadeWork(detector, imageShape, scaleFactor, minDimensions, maxDimensions):
+        """
+        Count the classifier window positions detectMultiScale goes through on an image, over all the scales of its pyramid, to compare the cost of sweeps.
+            :param detector: the haarcascade object
+            :param imageShape: the shape of the scanned image
+            :param scaleFactor: scaleFactor parameter for detectMultiScale function
+            :param minDimensions: minSize parameter for detectMultiScale function
+            :param maxDimensions: maxSize parameter for detectMultiScale function
+            :return the number of window positions
+        """
+        (windowWidth, windowHeight) = detector.getOriginalWindowSize()
+        work = 0
+        factor = 1
+        # same scales as detectMultiScale, the image is shrunk until the window doesn't fit in it or gets bigger than maxDimensions
+        while True:
+            positionsWidth = round(imageShape[1] / factor) - windowWidth
+            positionsHeight = round(imageShape[0] / factor) - windowHeight
+            if positionsWidth <= 0 or positionsHeight <= 0 or round(windowWidth * factor) > maxDimensions[0] or round(windowHeight * factor) > maxDimensions[1]:
+                return work
+            if round(windowWidth * factor) >= minDimensions[0] and round(windowHeight * factor) >= minDimensions[1]:
+                work = work + positionsWidth * positionsHeight
+            factor = factor * scaleFactor
+
+
     def HELPER_runHaarDetectionCounterClockwiseAngle(self, detector, minDimensions, maxDimensions, angle, scaleFactor, minNeighbors):
         """
         Run the given haarDetection on the image rotated by the given angle and generate 1 array that 
@@ -64,7 +350,7 @@ class ImageManager:
             :param angle: the angle by which the image is rotated
             :param scaleFactor: scaleFactor parameter for detectMultiScale function
             :param minNeighbors: minNeighbors parameter for detectMultiScale function
-            :return a 2-tuple with the first element being an array containing all the raw coordinates of the detected objects in the rotated image,
+            :return a 2-tuple with the first element being a DetectedAreaArray containing all the raw coordinates of the detected objects in the rotated image,
             and the second element the Point object containing the coordinates of the center of the rotated image.
         """
 
@@ -72,20 +358,17 @@ class ImageManager:
 
         # finding objects in then given angle degree rotated image
        
-        rotatedGrayImage = rotateCounterClockwise(self.grayImage, angle)
+        # the rotated image is kept in the rotation cache, pairs of eyes tilted by about the same angle crop their faces out of it
+        (rotatedGrayImage, rotatedCenter) = self.HELPER_rotatedGrayImage(angle)
             
         # Collecting raw detected objects received from detectMultiScale
-        rawObjs = detector.detectMultiScale(rotatedGrayImage, scaleFactor = scaleFactor, minNeighbors = minNeighbors, minSize = minDimensions, maxSize = maxDimensions)
+        (rawObjs, confidences) = self.HELPER_detect(detector, rotatedGrayImage, scaleFactor, minNeighbors, minDimensions, maxDimensions)
+        work = self.HELPER_cascadeWork(detector, rotatedGrayImage.shape, scaleFactor, minDimensions, maxDimensions)
+        with self.statsLock:
+            self.sweepCascadeWork = self.sweepCascadeWork + work
             
-        detectedAreas = []
-        rotatedCenter = Point(rotatedGrayImage.shape[1]/2, rotatedGrayImage.shape[0]/2)
-
-        for obj in rawObjs:
-            # Convert raw information into DetectedArea obj
-            area = DetectedArea((obj[0], obj[1]), (obj[2], obj[3]))
-
-            # Put the translated DetectedArea into translatedObj array
-            detectedAreas.append(area)
+        # Convert raw information into one DetectedAreaArray obj (no copy of rawObjs)
+        detectedAreas = DetectedAreaArray.fromRects(rawObjs, confidences)
 
         return (detectedAreas, rotatedCenter)    
 
@@ -93,18 +376,17 @@ class ImageManager:
     def HELPER_rotateDetectedAreaClockwise(self, rawPositions, origin, angle):
         """
         Rotate detectedAreas in rawPositions around the given origin
-            :param rawPositions: the array that contains detectedAreas with raw values taken from detectMultiScale
+            :param rawPositions: the DetectedAreaArray that contains detectedAreas with raw values taken from detectMultiScale
             :param origin: the origin which the detectedAreas are rotating around
             :param angle: the angle by which the image was rotated when detectMultiScale ran
-            :return an array containing detectedAreas with translated coordinates in the non-rotated image
+            :return the DetectedAreaArray containing detectedAreas with translated coordinates in the non-rotated image
         """
         angle = angle % 360
         if angle == 0:
             return rawPositions
 
         # Translate the coordinates to the coordinates in the non-rotated image
-        for area in rawPositions:
-            area.rotateAreaClockwise(origin, angle)
+        rawPositions.rotateAreaClockwise(origin, angle)
 
         return rawPositions
 
@@ -113,12 +395,11 @@ class ImageManager:
         """
         Project the raw positions such that the new positions relative to self.imageCenter is the same
         as relative positions of the old Coordinates to rotatedCenter.
-            :param rawPositions: the array that contains detectedAreas
-            :return an array containing detectedAreas with projected coordinates
+            :param rawPositions: the DetectedAreaArray that contains detectedAreas
+            :return the DetectedAreaArray containing detectedAreas with projected coordinates
         """
         # Translate the coordinates to the coordinates in the non-rotated image
-        for area in rawPositions:
-            area.projectArea(rotatedCenter, self.imageCenter)
+        rawPositions.projectArea(rotatedCenter, self.imageCenter)
 
         return rawPositions
 
@@ -126,7 +407,7 @@ class ImageManager:
     def HELPER_standardizeCounterClockwiseDetectedArea(self, detectedAreas, rotatedCenter, angle):
         """
         Translate the coordinates of counter clockwise rotated detectedAreas to the original image coordinates
-            :param detectedAreas: a list of detectedArea objects
+            :param detectedAreas: a DetectedAreaArray obj
             :param rotatedCenter: the rotated image's center's point object
             :param angle: the angle by which the image was rotated counter clockwise by
             :return a list of translated detectedAreas for the nonrotated image
@@ -134,70 +415,212 @@ class ImageManager:
 
         AllObjects = []    
 
-        self.HELPER_rotateDetectedAreaClockwise(detectedAreas, rotatedCenter, angle)
-        self.HELPER_projectDetectedArea(detectedAreas, rotatedCenter)
+        # Rotating clockwise around rotatedCenter then projecting rotatedCenter onto imageCenter, done as one Transform for the whole array
+        rotatedToImage = Transform.rotationClockwise(rotatedCenter, angle).then(Transform.projection(rotatedCenter, self.imageCenter))
+        detectedAreas.transform(rotatedToImage, -angle)
         AllObjects.append(detectedAreas)
 
         return AllObjects
         
 
-    def HELPER_mergeDetectedObjs(self, list):
+    def HELPER_mergeDetectedObjs(self, list, uniqueObjs = None, uniqueIndex = None):
         """
         Given a list of any number of arrays of (detected objects, rotatedCenter), scan through all of them and if find two duplicates (similar detected objects with similar 
         sizes and positions), merge them and put all the unique detected object in an array. 
-            :param list: a list of arrays
-            :return an array that contains all the unique detected objects.
-        """
-        array0 = list[0]
-        others = []
-        for i in range(1,len(list)):
-            others.append(list[i])
-
-
-        # checking duplicates in the first array
-        i = 0
-        while i < len(array0) - 1:
-            j = i + 1
-            while j < len(array0):
-                if array0[i].similarSize(array0[j], self.HARDCODED_similarSizeScale) and array0[i].overlap(array0[j]):
-                        array0[i].merge(array0[j])
-                        array0.pop(j)
-                        j = j - 1
-                j = j + 1
-            i = i + 1
-
-        # check for duplicates in the other arrays. Merge them if they are, append them if they arent
-        for array in others:
+            :param list: a list of arrays (lists of DetectedArea or DetectedAreaArray objs)
+            :param uniqueObjs: the unique objects of a previous call to merge the new objects into (updated in place), None to start from scratch
+            :param uniqueIndex: the SpatialIndex holding uniqueObjs (updated in place), None to start from scratch
+            :return an array that contains all the unique detected objects, a DetectedAreaArray if list only has DetectedAreaArray objs and 
+            there is no previous call to merge into
+        """
+        if uniqueObjs is None and len(list) > 0 and all(isinstance(array, DetectedAreaArray) for array in list):
+            return self.HELPER_mergeDetectedAreaArray(DetectedAreaArray.concatenate(list))
+
+        if uniqueObjs is None:
+            uniqueObjs = []
+            # uniqueIndex holds the unique objects found so far so duplicates are looked up around their position instead of against every unique object
+            uniqueIndex = SpatialIndex()
+
+        for array in list:
             for area in array:
-                matched = False
-                # Scan through the array to find matches
-                for area0 in array0:
-                    if area0.similarSize(area, self.HARDCODED_similarSizeScale) and area0.overlap(area):
-                        area0.merge(area)
-                        matched = True
-                        break
-                
-                # if didnt find any matches then append it onto array0
-                if matched == False:
-                    array0.append(area)    
+                duplicate = uniqueIndex.findDuplicate(area, self.HARDCODED_similarSizeScale)
+
+                # if didnt find any matches then it is a new unique object
+                if duplicate is None:
+                    uniqueObjs.append(area)
+                    uniqueIndex.insert(area)
+                else:
+                    # merging can move the duplicate so take it out of the index while it happens
+                    uniqueIndex.remove(duplicate)
+                    duplicate.merge(area)
+                    uniqueIndex.insert(duplicate)
         
-        return array0
+        return uniqueObjs
+
+
+    def HELPER_mergeDetectedAreaArray(self, areas):
+        """
+        Merge the duplicates of a DetectedAreaArray the same way HELPER_mergeDetectedObjs merges DetectedArea objects, without building them: the 
+        duplicates of every area are found at once as an (N x N) matrix, and a unique area is the index of the area whose geometry it has.
+            :param areas: the DetectedAreaArray obj
+            :return a DetectedAreaArray with the unique areas, in the order they were found
+        """
+        duplicates = areas.similarSize(areas, self.HARDCODED_similarSizeScale) & areas.overlap(areas)
+
+        # for every unique area: the area it has the geometry of, its best confidence, and when it was last inserted since the duplicate merged with
+        # is the first inserted one (a merged area is inserted again in the SpatialIndex)
+        representatives = np.empty(len(areas), dtype = np.intp)
+        confidences = np.empty(len(areas), dtype = np.float32)
+        insertions = np.empty(len(areas), dtype = np.intp)
+        uniqueCount = 0
+        insertionCount = 0
+
+        for i in range(len(areas)):
+            matches = np.flatnonzero(duplicates[representatives[:uniqueCount], i])
+
+            # if didnt find any matches then it is a new unique area
+            if len(matches) == 0:
+                duplicate = uniqueCount
+                uniqueCount = uniqueCount + 1
+                representatives[duplicate] = i
+                if areas.confidences is not None:
+                    confidences[duplicate] = areas.confidences[i]
+            else:
+                # merging keeps the geometry of the smaller area and the best confidence of the two
+                duplicate = matches[np.argmin(insertions[matches])]
+                if areas.radii[representatives[duplicate]] > areas.radii[i]:
+                    representatives[duplicate] = i
+                if areas.confidences is not None:
+                    confidences[duplicate] = max(confidences[duplicate], areas.confidences[i])
+            insertions[duplicate] = insertionCount
+            insertionCount = insertionCount + 1
+
+        uniqueAreas = areas.select(representatives[:uniqueCount])
+        if areas.confidences is not None:
+            # the merged areas keep the best confidence of their duplicates
+            uniqueAreas.confidences = confidences[:uniqueCount]
+        return uniqueAreas
+
+
+    def HELPER_suppressDetectedObjs(self, list, scores = None):
+        """
+        Given a list of any number of arrays of detected objects, run non-maximum suppression over all of them at once: duplicates (similar sizes and 
+        overlapping positions) are grouped and only the best scored object of every group is kept.
+            :param list: a list of arrays (lists of DetectedArea or DetectedAreaArray objs)
+            :param scores: the scores of the objects in the same order as they are in list, None to score by number of duplicates
+            :return an array that contains all the unique detected objects, best scored first, a DetectedAreaArray if list only has DetectedAreaArray objs
+        """
+        if all(isinstance(array, DetectedAreaArray) for array in list):
+            areas = DetectedAreaArray.concatenate(list)
+            return areas.select(areas.nonMaxSuppression(self.HARDCODED_similarSizeScale, scores))
 
+        objs = [area for array in list for area in array]
+        kept = DetectedAreaArray.fromDetectedAreas(objs).nonMaxSuppression(self.HARDCODED_similarSizeScale, scores)
+        return [objs[i] for i in kept]
 
-    def HELPER_findEyesCounterClockwiseAngle(self, angle, scaleFactor, minNeighbors):
+
+    def HELPER_combineDetectedObjs(self, list, mergeStrategy):
+        """
+        Combine the detected objects found at different angles with the given merge strategy.
+            :param list: a list of arrays (lists of DetectedArea or DetectedAreaArray objs)
+            :param mergeStrategy: "greedy" to merge duplicates one pair at a time (HELPER_mergeDetectedObjs), "nms" for non-maximum suppression 
+            over all of them at once (HELPER_suppressDetectedObjs)
+            :return an array that contains all the unique detected objects, a DetectedAreaArray if list only has DetectedAreaArray objs
+        """
+        if mergeStrategy == "greedy":
+            return self.HELPER_mergeDetectedObjs(list)
+        if mergeStrategy == "nms":
+            return self.HELPER_suppressDetectedObjs(list)
+        raise ValueError(f"Unknown merge strategy {mergeStrategy}, expected \"greedy\" or \"nms\"")
+
+
+    def HELPER_findEyesCounterClockwiseAngle(self, angle, scaleFactor, minNeighbors, detector = None):
         """
         Find the (non-paired) eyes in the counter clockwise rotated image. Merge the duplicates and return them in an array
             :param angle: the angle by which the image is rotated by counter clockwise
             :param scaleFactor: detectMultiscale parameter
             :param minNeighbors: detectMultiscale parameter
-            :return an array of detected eyes in the counter clockwise rotated image
+            :param detector: the eye classifier to use, None for the shared haarcascade_eye
+            :return a DetectedAreaArray of the detected eyes in the counter clockwise rotated image
         """
-        (detectedEyes, rotatedCenter) = self.HELPER_runHaarDetectionCounterClockwiseAngle(self.haarcascade_eye, self.HARDCODED_eyeMinDimensions, self.HARDCODED_eyeMaxDimensions, angle, scaleFactor, minNeighbors)
+        if detector is None:
+            detector = self.haarcascade_eye
+        (detectedEyes, rotatedCenter) = self.HELPER_runHaarDetectionCounterClockwiseAngle(detector, self.eyeMinDimensions, self.eyeMaxDimensions, angle, scaleFactor, minNeighbors)
         eyes = self.HELPER_mergeDetectedObjs(self.HELPER_standardizeCounterClockwiseDetectedArea(detectedEyes, rotatedCenter, angle))
            
         return eyes
 
 
+    def HELPER_findEyesForMergeCounterClockwiseAngle(self, angle, scaleFactor, minNeighbors, mergeStrategy, detector):
+        """
+        Find the eyes in the counter clockwise rotated image the way mergeStrategy needs them to combine the angles later on.
+            :param angle: the angle by which the image is rotated by counter clockwise
+            :param scaleFactor: detectMultiscale parameter
+            :param minNeighbors: detectMultiscale parameter
+            :param mergeStrategy: "greedy" to merge the duplicates of this angle already, "nms" to keep the raw eyes
+            :param detector: the eye classifier to use
+            :return a list of arrays of detected eyes in the original image coordinates
+        """
+        if mergeStrategy == "nms":
+            # keep the raw eyes, they are all suppressed together afterward
+            (detectedEyes, rotatedCenter) = self.HELPER_runHaarDetectionCounterClockwiseAngle(detector, self.eyeMinDimensions, self.eyeMaxDimensions, angle, scaleFactor, minNeighbors)
+            return self.HELPER_standardizeCounterClockwiseDetectedArea(detectedEyes, rotatedCenter, angle)
+        return [self.HELPER_findEyesCounterClockwiseAngle(angle, scaleFactor, minNeighbors, detector)]
+
+
+
+    def HELPER_pairEyes(self, eyes):
+        """
+        Pair up the eyes that have similar sizes and are an appropriate distance (HARDCODED_pairOfEyesDistanceRange average radii) away from each other.
+        The eyes of a DetectedAreaArray are compared all at once as (N x N) matrices and only the paired eyes are built as DetectedArea objects, 
+        otherwise the eyes are put in a SpatialIndex so every eye only looks at the ring around itself where its partners can be, among the eyes 
+        of compatible sizes.
+            :param eyes: an array of detected eyes (list of DetectedArea or DetectedAreaArray obj)
+            :return an array of pairs of eyes, 2-tuples with the first element being the left-most eye and the second element the right-most eye
+        """
+        (minDistanceScale, maxDistanceScale) = self.HARDCODED_pairOfEyesDistanceRange
+
+        if isinstance(eyes, DetectedAreaArray):
+            # every pair once, the eye found later first like the SpatialIndex does it
+            (laterEyes, earlierEyes) = np.nonzero(np.tril(eyes.similarSize(eyes, self.HARDCODED_similarSizeScale) & 
+                                                          eyes.appropriateDistanceTo(eyes, minDistanceScale, maxDistanceScale), -1))
+            pairedEyes = np.union1d(laterEyes, earlierEyes)
+            areas = dict(zip(pairedEyes.tolist(), eyes.select(pairedEyes).toDetectedAreas()))
+
+            pairOfEyes = []
+            for (i, j) in zip(laterEyes.tolist(), earlierEyes.tolist()):
+                (eye, otherEye) = (areas[i], areas[j])
+                # Let the left most eye be the first eye. This is for calculating relative angle of the face in findFacesUsingPairOfEyes method
+                if otherEye.center.x < eye.center.x:
+                    pairOfEyes.append((otherEye, eye))
+                else:
+                    pairOfEyes.append((eye, otherEye))
+            return pairOfEyes
+
+        pairOfEyes = []
+        eyesIndex = SpatialIndex()
+
+        for eye in eyes:
+            # Partners with a similar size have a radius within similarSizeScale of this eye's radius, which bounds the average radius and so the ring
+            minRadius = eye.radius * self.HARDCODED_similarSizeScale
+            maxRadius = eye.radius / self.HARDCODED_similarSizeScale
+            minDistance = minDistanceScale * (eye.radius + minRadius)/2
+            maxDistance = maxDistanceScale * (eye.radius + maxRadius)/2
+
+            # Only the eyes inserted before this one, so every pair is found once and no eye is paired with itself
+            for otherEye in eyesIndex.query(eye.center, minRadius, maxRadius, maxDistance, minDistance):
+                if otherEye.similarSize(eye, self.HARDCODED_similarSizeScale) and otherEye.appropriateDistanceTo(eye, minDistanceScale, maxDistanceScale):
+                    # Let the left most eye be the first eye. This is for calculating relative angle of the face in findFacesUsingPairOfEyes method
+                    if otherEye.center.x < eye.center.x:
+                        pairOfEyes.append((otherEye, eye))
+                    else:
+                        pairOfEyes.append((eye, otherEye))
+
+            eyesIndex.insert(eye)
+
+        return pairOfEyes
+
+
 
     def findPairsOfEyesCounterClockwiseAngle(self, angle, scaleFactor, minNeighbors):
         """
@@ -211,49 +634,111 @@ class ImageManager:
         
         eyes = self.HELPER_findEyesCounterClockwiseAngle(angle, scaleFactor, minNeighbors)
 
-        pairOfEyes = []
-        
-        for i in range(len(eyes) - 1):
-            for j in range(i,len(eyes)):
-                if eyes[i].similarSize(eyes[j], self.HARDCODED_similarSizeScale):
-                    dist = eyes[i].center.distTo(eyes[j].center)
-                    averageRadius = (eyes[1].radius + eyes[j].radius)/2
-                    if dist < self.HARDCODED_pairOfEyesDistanceRange[1] * averageRadius and dist > self.HARDCODED_pairOfEyesDistanceRange[0] * averageRadius:
-                        # Let the left most eye be the first eye. This is for calculating relative angle of the face in findFacesUsingPairOfEyes method
-                        if eyes[i].center.x < eyes[j].center.x:
-                            pairOfEyes.append((eyes[i], eyes[j]))
-                        else:
-                            pairOfEyes.append((eyes[j], eyes[i]))
-
-        return pairOfEyes
+        return self.HELPER_pairEyes(eyes)
 
 
-    def findPairsOfEyesCounterClockwiseMultipleAngles(self, angles, scaleFactor, minNeighbors):
+    def findPairsOfEyesCounterClockwiseMultipleAngles(self, angles, scaleFactor, minNeighbors, mergeStrategy = "greedy"):
         """
         Find the pairs of eyes in the counter clockwise rotated images. Return them in an array containing 2-tuple with the 
         first element being the left-most eye and the second element the right-most eye.
             :param angles: the angles by which the image is rotated by counter clockwise
             :param scaleFactor: detectMultiscale parameter
             :param minNeighbors: detectMultiscale parameter
+            :param mergeStrategy: "greedy" to merge duplicate eyes one pair at a time, "nms" to run non-maximum suppression on the eyes of all the angles at once
             :return an array of pairs of eyes 
         """
+        sweepCascadeWork = self.sweepCascadeWork
+
+        if self.executor is None:
+            eyesOfAngles = [self.HELPER_findEyesForMergeCounterClockwiseAngle(angle, scaleFactor, minNeighbors, mergeStrategy, self.haarcascade_eye) for angle in angles]
+        else:
+            # every angle is rotated and scanned on a worker thread with its own classifier, map keeps the angles in order so the merge is the same
+            eyesOfAngles = self.executor.map(lambda angle: self.HELPER_findEyesForMergeCounterClockwiseAngle(angle, scaleFactor, minNeighbors, mergeStrategy, 
+                self.HELPER_threadCascade(self.HARDCODED_eyeCascadePath)), angles)
+
         eyes = []
-        for angle in angles:
-            eyes.append(self.HELPER_findEyesCounterClockwiseAngle(angle, scaleFactor, minNeighbors))
+        for eyesOfAngle in eyesOfAngles:
+            eyes.extend(eyesOfAngle)
 
-        eyes = self.HELPER_mergeDetectedObjs(eyes)
+        eyes = self.HELPER_combineDetectedObjs(eyes, mergeStrategy)
 
-        pairOfEyes = []
-        
-        for i in range(len(eyes) - 1):
-            for j in range(i,len(eyes)):
-                if eyes[i].similarSize(eyes[j], self.HARDCODED_similarSizeScale):
-                    if eyes[i].appropriateDistanceTo(eyes[j], self.HARDCODED_pairOfEyesDistanceRange[0], self.HARDCODED_pairOfEyesDistanceRange[1]):
-                        # Let the left most eye be the first eye. This is for calculating relative angle of the face in findFacesUsingPairOfEyes method
-                        if eyes[i].center.x < eyes[j].center.x:
-                            pairOfEyes.append((eyes[i], eyes[j]))
-                        else:
-                            pairOfEyes.append((eyes[j], eyes[i]))
+        work = self.sweepCascadeWork - sweepCascadeWork
+        self.angleSweepStats = {"angles": list(angles), "cascadeWork": work}
+
+        return self.HELPER_pairEyes(eyes)
+
+
+    def HELPER_fineSweepAngles(self, pairOfEyes):
+        """
+        Pick the angles to straighten the faces of the pairs of eyes up by: the tilts of the pairs less than fineSweepAngleRange degrees apart are
+        averaged into one angle (rounded to rotationCacheAngleStep), the angles shared by the most pairs first.
+            :param pairOfEyes: an array of pairs of eyes
+            :return a list of at most fineSweepMaxAngles counter clockwise angles
+        """
+        # rotating the image counter clockwise by the opposite of the face angle straightens the face up
+        tilts = sorted(-self.HELPER_faceWindowOfPair(pair)[0] for pair in pairOfEyes)
+
+        groups = []
+        while len(tilts) != 0:
+            # the tilt with the most other tilts around it, then the most upright one
+            center = max(tilts, key = lambda tilt: (sum(1 for other in tilts if abs(other - tilt) <= self.HARDCODED_fineSweepAngleRange), -abs(tilt)))
+            group = [tilt for tilt in tilts if abs(tilt - center) <= self.HARDCODED_fineSweepAngleRange]
+            tilts = [tilt for tilt in tilts if abs(tilt - center) > self.HARDCODED_fineSweepAngleRange]
+            groups.append(group)
+
+        angles = []
+        for group in groups[:self.HARDCODED_fineSweepMaxAngles]:
+            angle = round(sum(group) / len(group) / self.rotationCacheAngleStep) * self.rotationCacheAngleStep
+            if angle not in angles:
+                angles.append(angle)
+        return angles
+
+
+    def findPairsOfEyesCoarseToFine(self, scaleFactor, minNeighbors, mergeStrategy = "greedy", coarseAngles = HARDCODED_coarseSweepAngles):
+        """
+        Find the pairs of eyes without picking the angles: a coarse pass scans coarseAngles on the image downscaled by coarseSweepScale with a coarser 
+        pyramid to find the tilts of the faces, then only the angles that straighten those faces up are scanned at full resolution. When the eyes are
+        too small for the coarse image (no pair of eyes there), the findFacesAngles are scanned instead. The angles and the cascade work of both passes 
+        end up in angleSweepStats, comparable to the one of findPairsOfEyesCounterClockwiseMultipleAngles.
+            :param scaleFactor: detectMultiscale parameter of the fine pass
+            :param minNeighbors: detectMultiscale parameter of the fine pass
+            :param mergeStrategy: "greedy" or "nms", how duplicate eyes of the fine pass are merged
+            :param coarseAngles: the counter clockwise angles of the coarse pass
+            :return an array of pairs of eyes 
+        """
+        (height, width) = self.grayImage.shape[:2]
+        coarseScale = self.HARDCODED_coarseSweepScale
+        coarseImage = cv.resize(self.image, (round(width * coarseScale), round(height * coarseScale)), interpolation = cv.INTER_AREA)
+        # the minFaceDimension faces are coarseSweepScale times smaller in the coarse image, its size thresholds are scaled for them
+        coarseMngr = ImageManager(coarseImage, workers = self.workers, rotationCacheAngleStep = self.rotationCacheAngleStep,
+                                  rotationCacheMaxBytes = self.rotationCacheMaxBytes, useConfidence = self.useConfidence,
+                                  resolveOrientation = self.resolveOrientation, minFaceDimension = self.HARDCODED_faceMinDimensions[0] * self.dimensionsScale * coarseScale)
+
+        coarseScaleFactor = max(scaleFactor, self.HARDCODED_coarseSweepScaleFactor)
+        coarseMinNeighbors = min(minNeighbors, self.HARDCODED_coarseSweepMinNeighbors)
+        if coarseMngr.executor is None:
+            eyesOfAngles = [coarseMngr.HELPER_findEyesCounterClockwiseAngle(angle, coarseScaleFactor, coarseMinNeighbors) for angle in coarseAngles]
+        else:
+            eyesOfAngles = list(coarseMngr.executor.map(lambda angle: coarseMngr.HELPER_findEyesCounterClockwiseAngle(angle, coarseScaleFactor, coarseMinNeighbors, 
+                coarseMngr.HELPER_threadCascade(coarseMngr.HARDCODED_eyeCascadePath)), coarseAngles))
+
+        # the eyes of every angle are paired on their own, a face only shows up as a pair at the angles close to its tilt
+        coarsePairOfEyes = []
+        for eyesOfAngle in eyesOfAngles:
+            coarsePairOfEyes.extend(coarseMngr.HELPER_pairEyes(eyesOfAngle))
+        fineAngles = self.HELPER_fineSweepAngles(coarsePairOfEyes)
+
+        # without any pair the eyes are too small to be found in the coarse image, the fixed angles are swept at full resolution instead
+        if len(fineAngles) == 0:
+            fineAngles = list(self.HARDCODED_findFacesAngles)
+
+        pairOfEyes = self.findPairsOfEyesCounterClockwiseMultipleAngles(fineAngles, scaleFactor, minNeighbors, mergeStrategy)
+
+        fineCascadeWork = self.angleSweepStats["cascadeWork"]
+        with self.statsLock:
+            self.sweepCascadeWork = self.sweepCascadeWork + coarseMngr.sweepCascadeWork
+        self.angleSweepStats = {"angles": fineAngles, "cascadeWork": coarseMngr.sweepCascadeWork + fineCascadeWork, "coarseAngles": list(coarseAngles), 
+            "coarseCascadeWork": coarseMngr.sweepCascadeWork, "fineCascadeWork": fineCascadeWork}
 
         return pairOfEyes
 
@@ -416,178 +901,723 @@ class ImageManager:
         return debugArrayFaces
 
 
-    def findFacesUsingPairOfEyes(self, pairOfEyes, scaleFactor, minNeighbors):
+    def HELPER_faceWindowOfPair(self, pair, angle = None):
         """
-        Using given pairs of eyes, for each pair of similar-size eyes, find the angle the face is leaning, crop the area the face could be out and run haarDetection on that area.
-        Return an array of all detectedAreas encapsulating faces.
-            :param pairOfEyes: 2-tuple (left eye, right eye)
+        Find the angle the face of a pair of eyes is leaning and the window the face could be in.
+            :param pair: 2-tuple (left eye, right eye)
+            :param angle: the counter clockwise angle to straighten the face up by, None for the relative angle of the right eye to the left eye
+            :return a 4-tuple (counter clockwise angle of the face, Point of the center of the window, (width, height) of the straightened window, 
+            min radius of the rectangle encapsulating the face)
+        """
+        # For right now, let face width be 6 average radius, and height be 10 average radius with 5 average radiuses from 2 eyes center to the top 
+        # 5 average radiuses from 2 eyes center to the chin. I'm going to make the height ratio 3 top:5 bottom once i added mouth/nose detection for orientation
+        (leftEye, rightEye) = pair
+        eyeAverageRadius = (leftEye.radius + rightEye.radius)/2
+        # halfFaceDimensions store the distance from faceOrigin to the left border, to the upper border, and to the lower border
+        # faceMinRadius is the min radius of the rectangle encapsulating the detected Face
+        halfFaceDimensions = (eyeAverageRadius * 4, eyeAverageRadius * 5, eyeAverageRadius * 5)
+        faceMinRadius = eyeAverageRadius * 3
+
+        # relative angle is the relative angle of the right eye to the left eye, but I limit the ranges from 270 -> 0 -> 90 degree because faces usually aren't up side down, 
+        # still this function takes care of that case also (scan it upside down when find no face)
+        if angle is None:
+            angle = (leftEye.center.relativeCounterClockwiseAngle(rightEye.center) + 90) % 180 - 90
+        faceOrigin = Point((leftEye.center.x + rightEye.center.x)/2,(leftEye.center.y + rightEye.center.y)/2)
+
+        # The window center is below/above faceOrigin (in the straightened face) when the upper and lower borders aren't equally far from it
+        faceWindowDimensions = (halfFaceDimensions[0] * 2, halfFaceDimensions[1] + halfFaceDimensions[2])
+        faceWindowCenter = Point(faceOrigin.x, faceOrigin.y + (halfFaceDimensions[2] - halfFaceDimensions[1])/2).rotatePointCounterClockwise(faceOrigin, angle)
+
+        return (angle, faceWindowCenter, faceWindowDimensions, faceMinRadius)
+
+
+    def HELPER_detectFaces(self, detector, image, scaleFactor, minNeighbors):
+        """
+        Run the face classifier on an image (a face window), counting the invocation in faceCascadeInvocations.
+            :param detector: the face classifier to use
+            :param image: the image to scan
             :param scaleFactor: parameter for detectMultiScale
             :param minNeighbors: parameter for detectedMultiScale
-            return array of all detected faces
+            :return a 2-tuple (detectMultiScale output, level weights or None), see HELPER_detect
         """
+        with self.statsLock:
+            self.faceCascadeInvocations = self.faceCascadeInvocations + 1
+        return self.HELPER_detect(detector, image, scaleFactor, minNeighbors, self.faceMinDimensions, self.faceMaxDimensions)
 
-        faces = [] 
 
-        # For right now, let face width be 6 average radius, and height be 10 average radius with 5 average radiuses from 2 eyes center to the top 
-        # 5 average radiuses from 2 eyes center to the chin. I'm going to make the height ratio 3 top:5 bottom once i added mouth/nose detection for orientation
-        
-        for pair in pairOfEyes:
-            
-            leftEye = pair[0]
-            rightEye = pair[1]
-            eyeAverageRadius = (leftEye.radius + rightEye.radius)/2
-            # halfFaceDimensions store the distance from faceOrigin to the left border, to the upper border, and to the lower border
-            # faceMinRadius is the min radius of the rectangle encapsulating the detected Face
-            halfFaceDimensions = (eyeAverageRadius * 4, eyeAverageRadius * 5, eyeAverageRadius * 5)
-            faceMinRadius = eyeAverageRadius * 3
+    @staticmethod
+    def HELPER_bestFace(detectedFaces, confidences):
+        """
+        Pick the face to keep out of the faces found in a face window: the most confident one when the confidences are known, otherwise the biggest one.
+            :param detectedFaces: the detectMultiScale output (4-tuples (x, y, w, h))
+            :param confidences: the level weights of the faces, or None
+            :return a 2-tuple (the kept face's (x, y, w, h), its confidence or None)
+        """
+        if confidences is not None:
+            best = int(np.argmax(confidences))
+            return (detectedFaces[best], float(confidences[best]))
 
-            # relative angle is the relative angle of the right eye to the left eye, but I limit the ranges from 270 -> 0 -> 90 degree because faces usually aren't up side down, 
-            # still this function takes care of that case also (scan it upside down when find no face)
-            relativeCounterClockwiseAngle = (leftEye.center.relativeCounterClockwiseAngle(rightEye.center) + 90) % 180 - 90
-            originalImageCenter = Point(self.grayImage.shape[1]/2, self.grayImage.shape[0]/2)
-            faceOrigin = Point((leftEye.center.x + rightEye.center.x)/2,(leftEye.center.y + rightEye.center.y)/2)
-           
-            # Rotate the face origin point and the image such that the face is straightened up
-            rotatedGrayImage = rotateClockwise(self.grayImage, relativeCounterClockwiseAngle)
-            rotatedImageCenter = Point(rotatedGrayImage.shape[1]/2, rotatedGrayImage.shape[0]/2)
-            rotatedFaceOrigin = faceOrigin.rotatePointClockwise(originalImageCenter, relativeCounterClockwiseAngle).projectPoint(originalImageCenter, rotatedImageCenter)
+        # merge smaller faces to the biggest face
+        biggestFace = detectedFaces[0]
+        for i in range(1, len(detectedFaces)):
+            # Doesn't have to be too complicated, if one dimension is larger the other is 99% of the time larger as well
+            if detectedFaces[i][2] > biggestFace[2]:
+                biggestFace = detectedFaces[i]
+        return (biggestFace, None)
 
-            # Crop the potential face out
-            cropRangeMinY = int(max(0, rotatedFaceOrigin.y - halfFaceDimensions[1]))
-            cropRangeMaxY = int(min(rotatedGrayImage.shape[0], rotatedFaceOrigin.y + halfFaceDimensions[2]))
 
-            cropRangeMinX = int(max(0, rotatedFaceOrigin.x - halfFaceDimensions[0]))
-            cropRangeMaxX = int(min(rotatedGrayImage.shape[1], rotatedFaceOrigin.x + halfFaceDimensions[0]))
+    def HELPER_pairConfidence(self, pair):
+        """
+        Return the confidence of a pair of eyes, the confidence of its least confident eye.
+            :param pair: 2-tuple (left eye, right eye)
+            :return the confidence, None if the eyes' confidences aren't known
+        """
+        if pair[0].confidence is None or pair[1].confidence is None:
+            return None
+        return min(pair[0].confidence, pair[1].confidence)
 
-            try:
-                rotatedCrop = np.zeros((cropRangeMaxY - cropRangeMinY, cropRangeMaxX - cropRangeMinX), dtype='uint8')
-                rotatedCrop[0: rotatedCrop.shape[0], 0: rotatedCrop.shape[1]] = \
-                    rotatedGrayImage[cropRangeMinY:cropRangeMaxY, cropRangeMinX:cropRangeMaxX]
-             
-            except:
-                rotatedCrop = np.zeros((cropRangeMaxY - cropRangeMinY, cropRangeMaxX - cropRangeMinX, 3), dtype ='uint8')
-                rotatedCrop[0: rotatedCrop.shape[0], 0: rotatedCrop.shape[1]] = \
-                    rotatedGrayImage[cropRangeMinY:cropRangeMaxY, cropRangeMinX:cropRangeMaxX]
-        
-            rotatedFaceCenter = Point((cropRangeMinX + cropRangeMaxX)/2, (cropRangeMinY + cropRangeMaxY)/2)
-            croppedCenter = Point(rotatedCrop.shape[1]/2, rotatedCrop.shape[0]/2)
 
+    def HELPER_proposeFaces(self, pairOfEyes):
+        """
+        Predict the face box of every pair of eyes (its face window, see HELPER_faceWindowOfPair) and merge the proposals describing the same face:
+        similar sizes, overlapping and leaning by at most HARDCODED_proposalAngleRange apart (e.g. the same eyes found at different angles, or an 
+        eyebrow paired instead of an eye). Only one pair of every group of duplicates is worth verifying.
+            :param pairOfEyes: an array of pairs of eyes
+            :return an array of the pairs of eyes with distinct proposals, the pair closest to the middle of its group for every group
+        """
+        proposalsIndex = SpatialIndex()
+        # groups maps the first proposal of every group to the list of (pair, proposal) of the group, in the order they were found
+        groups = {}
 
-            # find the face in the cropped Area
-            detectedFaces = self.haarcascade_face.detectMultiScale(rotatedCrop, scaleFactor, minNeighbors, minSize = self.HARDCODED_faceMinDimensions, maxSize = self.HARDCODED_faceMaxDimensions)
-            boolUpSideDown = False
+        for pair in pairOfEyes:
+            (angle, faceWindowCenter, faceWindowDimensions, faceMinRadius) = self.HELPER_faceWindowOfPair(pair)
+            proposal = DetectedFace((faceWindowCenter.x - faceWindowDimensions[0]/2, faceWindowCenter.y - faceWindowDimensions[1]/2), faceWindowDimensions, angle)
+
+            duplicate = proposalsIndex.findDuplicate(proposal, self.HARDCODED_similarSizeScale, 
+                lambda other: abs(other.counterClockwiseAngle - angle) <= self.HARDCODED_proposalAngleRange)
+            if duplicate is None:
+                proposalsIndex.insert(proposal)
+                groups[proposal] = [(pair, proposal)]
+            else:
+                groups[duplicate].append((pair, proposal))
 
+        distinctPairs = []
+        for group in groups.values():
+            middle = Point(sum(proposal.center.x for (pair, proposal) in group)/len(group), sum(proposal.center.y for (pair, proposal) in group)/len(group))
+            distinctPairs.append(min(group, key = lambda member: member[1].center.distTo(middle))[0])
 
-            # if found no faces right side up
-            if len(detectedFaces) == 0:
-                # Scan the image upside down
-                rotatedCrop = rotateClockwise(rotatedCrop, 180)
-                detectedFaces = self.haarcascade_face.detectMultiScale(rotatedCrop, scaleFactor, minNeighbors, minSize = self.HARDCODED_faceMinDimensions, maxSize = self.HARDCODED_faceMaxDimensions)
-                if len(detectedFaces) == 0:
+        return distinctPairs
+
+
+    def HELPER_clusterPairsOfEyes(self, pairOfEyes):
+        """
+        Plan the face verification: group the pairs of eyes leaning by about the same angle (at most HARDCODED_pairClusterAngleRange apart) 
+        whose face windows are close enough that scanning one window around all of them costs about as much as scanning them one by one 
+        (at most HARDCODED_pairClusterMaxAreaRatio times the area of the windows).
+            :param pairOfEyes: an array of pairs of eyes
+            :return a list of clusters, a cluster being a 3-tuple (counter clockwise angle, Point of the center of the union window, (width, height) of the 
+            straightened union window) and the list of the pairs of eyes in it
+        """
+        windows = [(pair,) + self.HELPER_faceWindowOfPair(pair) for pair in pairOfEyes]
+        windows.sort(key = lambda window: window[1])
+
+        # every cluster is [pairs, windows, min angle, sum of the window areas, union window]
+        clusters = []
+        for window in windows:
+            (pair, angle, windowCenter, windowDimensions, faceMinRadius) = window
+            windowArea = windowDimensions[0] * windowDimensions[1]
+
+            for cluster in clusters:
+                # pairs are sorted by angle so the cluster's min angle stays the same
+                if angle - cluster[2] > self.HARDCODED_pairClusterAngleRange:
                     continue
-                boolUpSideDown = True
+                unionWindow = self.HELPER_unionWindow(cluster[1] + [window], (cluster[2] + angle)/2)
+                if unionWindow[2][0] * unionWindow[2][1] <= self.HARDCODED_pairClusterMaxAreaRatio * (cluster[3] + windowArea):
+                    cluster[0].append(pair)
+                    cluster[1].append(window)
+                    cluster[3] = cluster[3] + windowArea
+                    cluster[4] = unionWindow
+                    break
+            else:
+                clusters.append([[pair], [window], angle, windowArea, (angle, windowCenter, windowDimensions)])
 
+        return [(cluster[4], cluster[0]) for cluster in clusters]
 
-            # merge smaller faces to the biggest face
-            biggestFace = detectedFaces[0]
-            for i in range(1, len(detectedFaces)):
-                # Doesn't have to be too complicated, if one dimension is larger the other is 99% of the time larger as well
-                if detectedFaces[i][2] > biggestFace[2]:
-                    biggestFace = detectedFaces[i]
 
+    def HELPER_unionWindow(self, windows, angle):
+        """
+        Find the smallest window straightened up by angle containing all the given face windows.
+            :param windows: a list of face windows (pair, counter clockwise angle, Point of the center, (width, height), min face radius)
+            :param angle: the counter clockwise angle of the union window
+            :return a 3-tuple (angle, Point of the center of the union window, (width, height) of the straightened union window)
+        """
+        corners = []
+        for (pair, windowAngle, windowCenter, windowDimensions, faceMinRadius) in windows:
+            (halfWidth, halfHeight) = (windowDimensions[0]/2, windowDimensions[1]/2)
+            for (x, y) in [(-halfWidth, -halfHeight), (halfWidth, -halfHeight), (halfWidth, halfHeight), (-halfWidth, halfHeight)]:
+                corners.append(Point(windowCenter.x + x, windowCenter.y + y).rotatePointCounterClockwise(windowCenter, windowAngle).exportCoordinates())
 
-            # if face's radius is too small then its not a face (face right now is a 4-tuple (x, y, w, h))
-            if biggestFace[2] ** 2 + biggestFace[3] ** 2 < (faceMinRadius * 2) ** 2:
+        # the bounding box of the corners once straightened up by angle
+        straighten = Transform.rotationClockwise(self.imageCenter, angle)
+        straightenedCorners = straighten.applyToPoints(corners)
+        (minX, minY) = straightenedCorners.min(axis = 0)
+        (maxX, maxY) = straightenedCorners.max(axis = 0)
+        unionCenter = straighten.inverse().applyToPoint(Point((minX + maxX)/2, (minY + maxY)/2))
 
-                if boolUpSideDown:
-                    continue
+        return (angle, unionCenter, (maxX - minX, maxY - minY))
 
-                # Scan the image upside down in case of upside down faces
-                rotatedCrop = rotateClockwise(rotatedCrop, 180)
-                detectedFaces = self.haarcascade_face.detectMultiScale(rotatedCrop, scaleFactor, minNeighbors, minSize = self.HARDCODED_faceMinDimensions, maxSize = self.HARDCODED_faceMaxDimensions)
-                if len(detectedFaces) == 0:
-                    continue
-                boolUpSideDown = True
 
-                
-                # merge smaller faces to the biggest face
-                biggestFace = detectedFaces[0]
-                for i in range(1, len(detectedFaces)):
-                    # if one dimension is larger the other is 99% of the time larger as well
-                    if detectedFaces[i][2] > biggestFace[2]:
-                        biggestFace = detectedFaces[i]
+    def HELPER_verifyClusterOfPairsOfEyes(self, cluster, scaleFactor, minNeighbors, detector):
+        """
+        Verify a cluster of pairs of eyes (see HELPER_clusterPairsOfEyes) with a single face scan of the union window, then give every pair of eyes 
+        the biggest face centered in its own face window, leaning by the pair's own angle. The pairs left without a face are verified one by one 
+        with HELPER_verifyPairOfEyes, which also looks for upside down faces.
+            :param cluster: a 2-tuple (union window, list of pairs of eyes), the union window can be None for a single pair
+            :param scaleFactor: parameter for detectMultiScale
+            :param minNeighbors: parameter for detectedMultiScale
+            :param detector: the face classifier to use
+            :return a 2-tuple with the first element being a list with the DetectedFace (or None) of every pair, and the second element the number of
+            pairs verified by the shared scan
+        """
+        (unionWindow, pairs) = cluster
+        if len(pairs) == 1:
+            return ([self.HELPER_verifyPairOfEyes(pairs[0], scaleFactor, minNeighbors, detector)], 0)
+
+        (angle, unionCenter, unionDimensions) = unionWindow
+
+        (unionCrop, cropToImage) = extractRotatedPatch(self.grayImage, unionCenter, angle, unionDimensions)
+        (detectedFaces, confidences) = self.HELPER_detectFaces(detector, unionCrop, scaleFactor, minNeighbors)
+        if confidences is None:
+            confidences = [None] * len(detectedFaces)
+        imageToCrop = cropToImage.inverse()
+
+        faces = []
+        sharedVerifications = 0
+        for pair in pairs:
+            (leftEye, rightEye) = pair
+            (pairAngle, faceWindowCenter, faceWindowDimensions, faceMinRadius) = self.HELPER_faceWindowOfPair(pair, angle)
+            faceWindowCenter = imageToCrop.applyToPoint(faceWindowCenter)
+
+            # the biggest (or most confident) face big enough for the pair's eyes whose center is in the pair's own face window, the faces 
+            # HELPER_verifyPairOfEyes would have found (face right now is a 4-tuple (x, y, w, h))
+            biggestFace = None
+            for ((x, y, w, h), confidence) in zip(detectedFaces, confidences):
+                if abs(x + w/2 - faceWindowCenter.x) <= faceWindowDimensions[0]/2 and abs(y + h/2 - faceWindowCenter.y) <= faceWindowDimensions[1]/2 and \
+                        w ** 2 + h ** 2 >= (faceMinRadius * 2) ** 2:
+                    if biggestFace is None or (confidence > faceConfidence if confidence is not None else w > biggestFace[2]):
+                        (biggestFace, faceConfidence) = ((x, y, w, h), confidence)
+
+            if biggestFace is None:
+                faces.append(self.HELPER_verifyPairOfEyes(pair, scaleFactor, minNeighbors, detector))
+                continue
+
+            # the union window is straightened up by the cluster's angle, the face leans by the angle of the pair whose window holds it, rounded the
+            # way HELPER_verifyPairOfEyes rounds it
+            ownAngle = self.HELPER_cachedFaceAngle(self.HELPER_faceWindowOfPair(pair)[0])
+            face = DetectedFace((biggestFace[0], biggestFace[1]), (biggestFace[2], biggestFace[3]), ownAngle, None if faceConfidence is None else float(faceConfidence))
+            face.transformArea(cropToImage)
+            face.rotateAreaCounterClockwise(face.center, ownAngle - angle)
+            face.leftEye = leftEye
+            face.rightEye = rightEye
+            faces.append(face)
+            sharedVerifications = sharedVerifications + 1
+
+        return (faces, sharedVerifications)
+
+
+    def HELPER_orientationOfFaceWindow(self, rotatedCrop, eyeLineCenter, eyeAverageRadius):
+        """
+        Tell whether the straightened face window of a pair of eyes holds a face right side up or upside down by looking for a nose in the small band 
+        right below the eye line and in the one right above it (turned upside down), much cheaper than scanning the whole window with the face classifier.
+            :param rotatedCrop: the straightened face window
+            :param eyeLineCenter: Point between the two eyes in rotatedCrop
+            :param eyeAverageRadius: the average radius of the two eyes
+            :return True if the face is right side up, False if it is upside down, None if the nose classifier can't tell (no nose or a nose on both sides)
+        """
+        bandWidth = int(eyeAverageRadius * self.HARDCODED_noseBandDimensions[0])
+        bandHeight = int(eyeAverageRadius * self.HARDCODED_noseBandDimensions[1])
+        noseMinDimensions = (int(eyeAverageRadius * self.HARDCODED_noseMinDimensions[0]), int(eyeAverageRadius * self.HARDCODED_noseMinDimensions[1]))
+        (noseWindowWidth, noseWindowHeight) = self.haarcascade_nose.getOriginalWindowSize()
+        if bandWidth < noseWindowWidth or bandHeight < noseWindowHeight:
+            return None
+
+        left = max(0, int(eyeLineCenter.x - bandWidth/2))
+        eyeLine = int(eyeLineCenter.y)
+        belowBand = rotatedCrop[eyeLine: eyeLine + bandHeight, left: left + bandWidth]
+        # turned upside down so the nose of an upside down face stands right side up
+        aboveBand = rotateClockwise(rotatedCrop[max(0, eyeLine - bandHeight): eyeLine, left: left + bandWidth], 180)
+
+        noseDetector = self.haarcascade_nose if self.executor is None else self.HELPER_threadCascade(self.HARDCODED_noseCascadePath)
+        nosesBelow = noseDetector.detectMultiScale(belowBand, 1.1, self.HARDCODED_noseMinNeighbors, minSize = noseMinDimensions)
+        nosesAbove = noseDetector.detectMultiScale(aboveBand, 1.1, self.HARDCODED_noseMinNeighbors, minSize = noseMinDimensions)
+
+        if (len(nosesBelow) == 0) == (len(nosesAbove) == 0):
+            return None
+        with self.statsLock:
+            self.orientationsResolved = self.orientationsResolved + 1
+        return len(nosesBelow) != 0
+
+
+    def HELPER_verifyPairOfEyes(self, pair, scaleFactor, minNeighbors, detector):
+        """
+        Using the given pair of eyes, find the angle the face is leaning, crop the area the face could be out and run haarDetection on that area.
+            :param pair: 2-tuple (left eye, right eye)
+            :param scaleFactor: parameter for detectMultiScale
+            :param minNeighbors: parameter for detectedMultiScale
+            :param detector: the face classifier to use
+            :return the detected face as a DetectedFace object, None if there is no face around the pair of eyes
+        """
 
-                # if face's radius is too small then its not a face (face right now is a 4-tuple (x, y, w, h))
-                if biggestFace[2] ** 2 + biggestFace[3] ** 2 < (faceMinRadius * 2) ** 2:
-                    continue
+        (leftEye, rightEye) = pair
+        (relativeCounterClockwiseAngle, faceWindowCenter, faceWindowDimensions, faceMinRadius) = self.HELPER_faceWindowOfPair(pair)
+
+        # If the image was already rotated by about the same angle (rounded to rotationCacheAngleStep), straighten the face up by that angle instead
+        roundedAngle = round(relativeCounterClockwiseAngle / self.rotationCacheAngleStep) * self.rotationCacheAngleStep
+        cachedRotation = self.HELPER_lookUpRotatedGrayImage(-roundedAngle)
+        if cachedRotation is not None:
+            (relativeCounterClockwiseAngle, faceWindowCenter, faceWindowDimensions, faceMinRadius) = self.HELPER_faceWindowOfPair(pair, roundedAngle)
+
+        # Cut the potential face straight out of the original image, rotated such that the face is straightened up
+        if cachedRotation is not None:
+            (rotatedCrop, cropToImage) = self.HELPER_cropRotatedGrayImage(cachedRotation[0], cachedRotation[1], -roundedAngle, faceWindowCenter, faceWindowDimensions)
+        else:
+            # only the window is warped, a single pair of eyes doesn't pay for rotating (and caching) the whole image
+            (rotatedCrop, cropToImage) = extractRotatedPatch(self.grayImage, faceWindowCenter, relativeCounterClockwiseAngle, faceWindowDimensions)
+        croppedCenter = Point(rotatedCrop.shape[1]/2, rotatedCrop.shape[0]/2)
+
+        # orientation is True/False when the nose tells the face is right side up/upside down, then the face window is scanned that way first and 
+        # only scanned the other way when no face is found
+        orientation = None
+        if self.resolveOrientation:
+            eyeLineCenter = cropToImage.inverse().applyToPoint(Point((leftEye.center.x + rightEye.center.x)/2, (leftEye.center.y + rightEye.center.y)/2))
+            orientation = self.HELPER_orientationOfFaceWindow(rotatedCrop, eyeLineCenter, (leftEye.radius + rightEye.radius)/2)
+
+        boolUpSideDown = False
+        if orientation is False:
+            rotatedCrop = rotateClockwise(rotatedCrop, 180, allowView = True)
+            boolUpSideDown = True
+
+        # find the face in the cropped Area
+        (detectedFaces, confidences) = self.HELPER_detectFaces(detector, rotatedCrop, scaleFactor, minNeighbors)
+
+
+        # if found no faces the first way up
+        boolRescanned = False
+        if len(detectedFaces) == 0:
+            # Scan the image the other way up
+            rotatedCrop = rotateClockwise(rotatedCrop, 180, allowView = True)
+            (detectedFaces, confidences) = self.HELPER_detectFaces(detector, rotatedCrop, scaleFactor, minNeighbors)
+            if len(detectedFaces) == 0:
+                return None
+            boolUpSideDown = not boolUpSideDown
+            boolRescanned = True
 
 
+        # keep the biggest (or most confident) face
+        (biggestFace, faceConfidence) = self.HELPER_bestFace(detectedFaces, confidences)
+
+
+        # if face's radius is too small then its not a face (face right now is a 4-tuple (x, y, w, h))
+        if biggestFace[2] ** 2 + biggestFace[3] ** 2 < (faceMinRadius * 2) ** 2:
+
+            if boolRescanned:
+                return None
+
+            # Scan the image the other way up in case the face is that way
+            rotatedCrop = rotateClockwise(rotatedCrop, 180, allowView = True)
+            (detectedFaces, confidences) = self.HELPER_detectFaces(detector, rotatedCrop, scaleFactor, minNeighbors)
+            if len(detectedFaces) == 0:
+                return None
+            boolUpSideDown = not boolUpSideDown
 
-            biggestFace = DetectedFace((biggestFace[0],biggestFace[1]), (biggestFace[2], biggestFace[3]))
-            
-            
             
+            # keep the biggest (or most confident) face
+            (biggestFace, faceConfidence) = self.HELPER_bestFace(detectedFaces, confidences)
 
+            # if face's radius is too small then its not a face (face right now is a 4-tuple (x, y, w, h))
+            if biggestFace[2] ** 2 + biggestFace[3] ** 2 < (faceMinRadius * 2) ** 2:
+                return None
 
-            if boolUpSideDown:
-                biggestFace.rotateAreaClockwise(croppedCenter, 180)
 
-            # Convert biggestFace coordinates from being in the cropped image to the original image
-            biggestFace.projectArea(croppedCenter, rotatedFaceCenter)
-            biggestFace.rotateAreaCounterClockwise(rotatedImageCenter, relativeCounterClockwiseAngle)
-            biggestFace.projectArea(rotatedImageCenter, originalImageCenter)
 
+        biggestFace = DetectedFace((biggestFace[0],biggestFace[1]), (biggestFace[2], biggestFace[3]), confidence = faceConfidence)
 
-            
-            # if the face found was upside down, then face angle = eye's relative angle + 180, the eyes are swapped
-            if boolUpSideDown:
-                counterClockwiseFaceAngle = (relativeCounterClockwiseAngle + 180) % 360
-                biggestFace.counterClockwiseAngle = counterClockwiseFaceAngle
-                biggestFace.leftEye = rightEye
-                biggestFace.rightEye = leftEye
-            # if not then = eye's relative angle, the eyes are in the same order
+        # Convert biggestFace coordinates from being in the (upside down) cropped image to the original image
+        if boolUpSideDown:
+            biggestFace.transformArea(Transform.rotationClockwise(croppedCenter, 180).then(cropToImage))
+        else:
+            biggestFace.transformArea(cropToImage)
+
+
+        
+        # if the face found was upside down, then face angle = eye's relative angle + 180, the eyes are swapped
+        if boolUpSideDown:
+            counterClockwiseFaceAngle = (relativeCounterClockwiseAngle + 180) % 360
+            biggestFace.counterClockwiseAngle = counterClockwiseFaceAngle
+            biggestFace.leftEye = rightEye
+            biggestFace.rightEye = leftEye
+        # if not then = eye's relative angle, the eyes are in the same order
+        else:
+            counterClockwiseFaceAngle = relativeCounterClockwiseAngle
+            biggestFace.counterClockwiseAngle = counterClockwiseFaceAngle
+            biggestFace.leftEye = leftEye
+            biggestFace.rightEye = rightEye
+
+        return biggestFace
+
+
+    def findFacesUsingPairOfEyes(self, pairOfEyes, scaleFactor, minNeighbors, clusterPairs = False, mergeProposals = False, maxFaces = None, minConfidence = None, 
+                                 deadline = None):
+        """
+        Using given pairs of eyes, for each pair of similar-size eyes, find the angle the face is leaning, crop the area the face could be out and run haarDetection on that area.
+        Return an array of all detectedAreas encapsulating faces. How many face scans were run (and saved by clustering) is kept in pairVerificationStats.
+            :param pairOfEyes: 2-tuple (left eye, right eye)
+            :param scaleFactor: parameter for detectMultiScale
+            :param minNeighbors: parameter for detectedMultiScale
+            :param clusterPairs: if True, pairs leaning by about the same angle and close to each other are verified with one scan (HELPER_clusterPairsOfEyes).
+            The shared scan only looks for right side up faces without the nose classifier, the pairs it finds no face for are verified one by one
+            :param mergeProposals: if True, pairs predicting the same face box are only verified once (HELPER_proposeFaces). The other pairs of a group 
+            are dropped without being verified, so a face only the dropped pairs would have found is lost
+            :param maxFaces: stop verifying pairs once that many faces are found, None to verify all of them. With useConfidence the most confident 
+            pairs are verified first, so these are the most likely faces
+            :param minConfidence: only verify the pairs of eyes at least that confident (needs useConfidence), None to verify all of them
+            :param deadline: time.monotonic() time after which no more pairs are verified, None to verify all of them. pairVerificationStats tells 
+            how many clusters of pairs were verified
+            return array of all detected faces
+        """
+        if minConfidence is not None and not self.useConfidence:
+            raise ValueError("minConfidence needs the confidences of the eyes, construct the ImageManager with useConfidence = True")
+
+        self.faceCascadeInvocations = 0
+        self.orientationsResolved = 0
+        numberOfPairs = len(pairOfEyes)
+
+        # rank the pairs of eyes best first (stable, pairs with the same confidence stay in the same order), and drop the ones under the floor
+        if self.useConfidence:
+            pairOfEyes = sorted(pairOfEyes, key = lambda pair: -(self.HELPER_pairConfidence(pair) or 0))
+            if minConfidence is not None:
+                pairOfEyes = [pair for pair in pairOfEyes if (self.HELPER_pairConfidence(pair) or 0) >= minConfidence]
+
+        if mergeProposals:
+            pairOfEyes = self.HELPER_proposeFaces(pairOfEyes)
+
+        if clusterPairs:
+            clusters = self.HELPER_clusterPairsOfEyes(pairOfEyes)
+            # verify the clusters in the order of their best ranked pair
+            rank = {id(pair): i for (i, pair) in enumerate(pairOfEyes)}
+            clusters.sort(key = lambda cluster: min(rank[id(pair)] for pair in cluster[1]))
+        else:
+            clusters = [(None, [pair]) for pair in pairOfEyes]
+
+        # without maxFaces or deadline all the clusters are verified at once, otherwise a batch (one per worker) at a time until there are enough faces
+        # or there is no time left
+        if maxFaces is None and deadline is None:
+            batchSize = max(1, len(clusters))
+        else:
+            batchSize = self.workers if self.executor is not None else 1
+
+        faces = []
+        verifiedClusters = []
+        for start in range(0, len(clusters), batchSize):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            batch = clusters[start: start + batchSize]
+            if self.executor is None:
+                verifiedBatch = [self.HELPER_verifyClusterOfPairsOfEyes(cluster, scaleFactor, minNeighbors, self.haarcascade_face) for cluster in batch]
             else:
-                counterClockwiseFaceAngle = relativeCounterClockwiseAngle
-                biggestFace.counterClockwiseAngle = counterClockwiseFaceAngle
-                biggestFace.leftEye = leftEye
-                biggestFace.rightEye = rightEye
-            
+                # every cluster is cropped and scanned on a worker thread with its own classifier, map keeps the faces in the order of the clusters
+                verifiedBatch = list(self.executor.map(lambda cluster: self.HELPER_verifyClusterOfPairsOfEyes(cluster, scaleFactor, minNeighbors, 
+                    self.HELPER_threadCascade(self.HARDCODED_faceCascadePath)), batch))
+
+            verifiedClusters.extend(verifiedBatch)
+            faces.extend(face for (clusterFaces, sharedVerifications) in verifiedBatch for face in clusterFaces if face is not None)
+            if maxFaces is not None and len(faces) >= maxFaces:
+                break
+
+        if maxFaces is not None:
+            faces = faces[:maxFaces]
 
-            faces.append(biggestFace)
+        # every pair verified by a shared scan would have needed its own scan at least
+        sharedScans = sum(1 for (window, pairs) in clusters[:len(verifiedClusters)] if len(pairs) > 1)
+        self.pairVerificationStats = {"pairs": numberOfPairs, "proposals": len(pairOfEyes), "clusters": len(clusters), "verifiedClusters": len(verifiedClusters),
+            "cascadeInvocations": self.faceCascadeInvocations, "orientationsResolved": self.orientationsResolved,
+            "cascadeInvocationsSaved": sum(sharedVerifications for (clusterFaces, sharedVerifications) in verifiedClusters) - sharedScans}
 
         return faces
 
 
-    def findFacesCounterClockwiseAngle(self, angle, scaleFactor, minNeighbors):
+    def findFacesCounterClockwiseAngle(self, angle, scaleFactor, minNeighbors, maxFaces = None, minConfidence = None):
         """
         Find faces in the image and return them as detectedArea objects in an array
             :param angle: counter clockwise angle by which the image is rotated
             :param scaleFactor: paramter for detectMultiScale
             :param minNeighbors: parameter for detectMultiScale
+            :param maxFaces: stop once that many faces are found, None to find all of them (see findFacesUsingPairOfEyes)
+            :param minConfidence: only verify the pairs of eyes at least that confident, None to verify all of them (see findFacesUsingPairOfEyes)
             :return an array of faces as detectedFace objects
         """
-        return self.findFacesUsingPairOfEyes(self.findPairsOfEyesCounterClockwiseAngle(angle, scaleFactor, minNeighbors), scaleFactor, minNeighbors)
+        return self.findFacesUsingPairOfEyes(self.findPairsOfEyesCounterClockwiseAngle(angle, scaleFactor, minNeighbors), scaleFactor, minNeighbors, 
+            maxFaces = maxFaces, minConfidence = minConfidence)
 
 
-    def findFacesCounterClockwiseMultipleAngles(self, angles, scaleFactor, minNeighbors):
+    def findFacesCounterClockwiseMultipleAngles(self, angles, scaleFactor, minNeighbors, mergeStrategy = "greedy", maxFaces = None, minConfidence = None):
         """
         Find faces in the image and return them as detectedArea objects in an array
             :param angles: counter clockwise angles by which the image is rotated
             :param scaleFactor: paramter for detectMultiScale
             :param minNeighbors: parameter for detectMultiScale
+            :param mergeStrategy: "greedy" or "nms", how duplicate eyes are merged. With "nms", duplicate faces found through different pairs of eyes are suppressed too
+            :param maxFaces: stop once that many faces are found, None to find all of them (see findFacesUsingPairOfEyes)
+            :param minConfidence: only verify the pairs of eyes at least that confident, None to verify all of them (see findFacesUsingPairOfEyes)
             :return an array of faces as detectedFace objects
         """
-        return self.findFacesUsingPairOfEyes(self.findPairsOfEyesCounterClockwiseMultipleAngles(angles, scaleFactor, minNeighbors), scaleFactor, minNeighbors)
+        faces = self.findFacesUsingPairOfEyes(self.findPairsOfEyesCounterClockwiseMultipleAngles(angles, scaleFactor, minNeighbors, mergeStrategy), scaleFactor, minNeighbors, 
+            maxFaces = maxFaces, minConfidence = minConfidence)
+        if mergeStrategy == "nms":
+            faces = self.HELPER_suppressDetectedObjs([faces])
+        return faces
 
-                
 
+    def findFacesCoarseToFine(self, scaleFactor, minNeighbors, mergeStrategy = "greedy", maxFaces = None, minConfidence = None):
+        """
+        Find faces in the image like findFacesCounterClockwiseMultipleAngles, the angles being picked by findPairsOfEyesCoarseToFine
+            :param scaleFactor: paramter for detectMultiScale
+            :param minNeighbors: parameter for detectMultiScale
+            :param mergeStrategy: "greedy" or "nms", how duplicate eyes are merged. With "nms", duplicate faces found through different pairs of eyes are suppressed too
+            :param maxFaces: stop once that many faces are found, None to find all of them (see findFacesUsingPairOfEyes)
+            :param minConfidence: only verify the pairs of eyes at least that confident, None to verify all of them (see findFacesUsingPairOfEyes)
+            :return an array of faces as detectedFace objects
+        """
+        faces = self.findFacesUsingPairOfEyes(self.findPairsOfEyesCoarseToFine(scaleFactor, minNeighbors, mergeStrategy), scaleFactor, minNeighbors, 
+            maxFaces = maxFaces, minConfidence = minConfidence)
+        if mergeStrategy == "nms":
+            faces = self.HELPER_suppressDetectedObjs([faces])
+        return faces
 
 
+    def findFacesTwoStage(self, scaleFactor, minNeighbors, angles = HARDCODED_findFacesAngles, mergeStrategy = "greedy", maxFaces = None, minConfidence = None):
+        """
+        Find faces in the image like findFacesCounterClockwiseMultipleAngles, in two stages for big images: the eyes are found and paired on the image 
+        downscaled until the minFaceDimension faces are HARDCODED_faceMinDimensions big, then every pair of eyes is verified on a rotated patch of the 
+        full resolution image with the size thresholds of minFaceDimension.
+            :param scaleFactor: paramter for detectMultiScale
+            :param minNeighbors: parameter for detectMultiScale
+            :param angles: counter clockwise angles by which the downscaled image is rotated
+            :param mergeStrategy: "greedy" or "nms", how duplicate eyes are merged. With "nms", duplicate faces found through different pairs of eyes are suppressed too
+            :param maxFaces: stop once that many faces are found, None to find all of them (see findFacesUsingPairOfEyes)
+            :param minConfidence: only verify the pairs of eyes at least that confident, None to verify all of them (see findFacesUsingPairOfEyes)
+            :return an array of faces as detectedFace objects
+        """
+        # the eyes of the smallest faces looked for are still big enough for the eye classifier at this level
+        detectionScale = 1 / self.dimensionsScale
+        if detectionScale >= 1:
+            return self.findFacesCounterClockwiseMultipleAngles(angles, scaleFactor, minNeighbors, mergeStrategy, maxFaces, minConfidence)
+
+        (height, width) = self.grayImage.shape[:2]
+        detectionImage = cv.resize(self.image, (round(width * detectionScale), round(height * detectionScale)), interpolation = cv.INTER_AREA)
+        # the minFaceDimension faces are HARDCODED_faceMinDimensions big in the downscaled image, its size thresholds are scaled for them
+        detectionMngr = ImageManager(detectionImage, workers = self.workers, rotationCacheAngleStep = self.rotationCacheAngleStep,
+                                     rotationCacheMaxBytes = self.rotationCacheMaxBytes, useConfidence = self.useConfidence,
+                                     resolveOrientation = self.resolveOrientation, minFaceDimension = self.HARDCODED_faceMinDimensions[0])
+        detectionPairOfEyes = detectionMngr.findPairsOfEyesCounterClockwiseMultipleAngles(angles, scaleFactor, minNeighbors, mergeStrategy)
+
+        # bring the eyes back to the full resolution image, an eye can be in more than one pair
+        detectionToImage = Transform.scaling(1 / detectionScale)
+        scaledEyes = {}
+        pairOfEyes = []
+        for pair in detectionPairOfEyes:
+            for eye in pair:
+                if id(eye) not in scaledEyes:
+                    scaledEye = eye.copy()
+                    scaledEye.transformArea(detectionToImage)
+                    scaledEyes[id(eye)] = scaledEye
+            pairOfEyes.append((scaledEyes[id(pair[0])], scaledEyes[id(pair[1])]))
+
+        faces = self.findFacesUsingPairOfEyes(pairOfEyes, scaleFactor, minNeighbors, maxFaces = maxFaces, minConfidence = minConfidence)
+        if mergeStrategy == "nms":
+            faces = self.HELPER_suppressDetectedObjs([faces])
+        return faces
+
+
+    def findFaces(self, scaleFactor, minNeighbors, angles = HARDCODED_findFacesAngles, deadlineMs = None):
+        """
+        Find faces in the image like findFacesCounterClockwiseMultipleAngles, but doing the most promising work first so it can give the best faces found 
+        so far once deadlineMs is over: the upright image first then the angles closest to it, and after every batch of angles (one angle per worker) the 
+        new pairs of eyes (most confident first with useConfidence) are verified before the next batch is scanned. The deadline is checked between two 
+        pieces of work (one batch of angles, one batch of clusters of pairs), a piece of work that already started is finished.
+            :param scaleFactor: paramter for detectMultiScale
+            :param minNeighbors: parameter for detectMultiScale
+            :param angles: counter clockwise angles by which the image is rotated
+            :param deadlineMs: time budget in milliseconds, None to do all the work
+            :return a 2-tuple with the first element being an array of faces as detectedFace objects, and the second element True if all the angles and
+            pairs of eyes were done, False if the deadline stopped the detection early
+        """
+        deadline = None if deadlineMs is None else time.monotonic() + deadlineMs / 1000
 
+        # the upright image first, then the smallest tilts since faces usually aren't leaning much
+        angles = sorted(angles, key = lambda angle: abs((angle + 180) % 360 - 180))
 
+        eyes = []
+        eyesIndex = SpatialIndex()
+        verifiedPairs = set()
+        faces = []
+        complete = True
+
+        batchSize = self.workers if self.executor is not None else 1
+        for start in range(0, len(angles), batchSize):
+            if deadline is not None and time.monotonic() >= deadline:
+                complete = False
+                break
+
+            batch = angles[start: start + batchSize]
+            if self.executor is None:
+                eyesOfAngles = [self.HELPER_findEyesCounterClockwiseAngle(angle, scaleFactor, minNeighbors) for angle in batch]
+            else:
+                # every angle of the batch is rotated and scanned on a worker thread with its own classifier, map keeps the angles in order
+                eyesOfAngles = self.executor.map(lambda angle: self.HELPER_findEyesCounterClockwiseAngle(angle, scaleFactor, minNeighbors, 
+                    self.HELPER_threadCascade(self.HARDCODED_eyeCascadePath)), batch)
+            for eyesOfAngle in eyesOfAngles:
+                self.HELPER_mergeDetectedObjs([eyesOfAngle], eyes, eyesIndex)
+
+            # only the pairs that haven't been verified after the previous angles
+            newPairs = [pair for pair in self.HELPER_pairEyes(eyes) if (id(pair[0]), id(pair[1])) not in verifiedPairs]
+            faces.extend(self.findFacesUsingPairOfEyes(newPairs, scaleFactor, minNeighbors, deadline = deadline))
+            verifiedPairs.update((id(pair[0]), id(pair[1])) for pair in newPairs)
 
+            if self.pairVerificationStats["verifiedClusters"] < self.pairVerificationStats["clusters"]:
+                complete = False
+                break
 
+        # pairs of eyes found after different angles can describe the same face
+        faces = self.HELPER_suppressDetectedObjs([faces])
 
+        return (faces, complete)
 
 
+    @staticmethod
+    def HELPER_initBatchWorker(settings):
+        """
+        Set up a detectBatch worker process: keep the detection settings so they aren't sent with every chunk, and warm the classifiers up
+        once so the first image of the worker doesn't pay for it.
+            :param settings: dictionary with the angles, scaleFactor, minNeighbors, mergeStrategy and resizeTo parameters of detectBatch
+        """
+        # the worker processes already run in parallel, OpenCV's own threads would only compete with the other workers
+        cv.setNumThreads(1)
+        ImageManager.HELPER_batchSettings = settings
 
+        warmUpImage = np.zeros((64, 64), dtype = 'uint8')
+        for cascade in (ImageManager.haarcascade_eye, ImageManager.haarcascade_face):
+            cascade.detectMultiScale(warmUpImage)
+
+
+    @staticmethod
+    def HELPER_detectBatchImage(pathOrArray):
+        """
+        Run findFacesCounterClockwiseMultipleAngles on one image of a detectBatch worker, with the settings given to HELPER_initBatchWorker.
+            :param pathOrArray: the path of the image (decoded here, in the worker) or the image itself
+            :return an array of faces as detectedFace objects in the coordinates of the original image, None if the image can't be read
+        """
+        settings = ImageManager.HELPER_batchSettings
+
+        if isinstance(pathOrArray, np.ndarray):
+            image = pathOrArray
+        else:
+            image = cv.imread(os.fspath(pathOrArray))
+            if image is None:
+                return None
+
+        # the HARDCODED dimensions are for images resized to 500 pixels, faces are scaled back to the original image afterward
+        resizeScale = 1
+        if settings["resizeTo"] is not None:
+            resizeScale = min(image.shape[:2]) / settings["resizeTo"]
+            image = resizeMinTo(image, settings["resizeTo"])
+
+        faces = ImageManager(image).findFacesCounterClockwiseMultipleAngles(settings["angles"], settings["scaleFactor"], settings["minNeighbors"], settings["mergeStrategy"])
+
+        if resizeScale != 1:
+            resizedToImage = Transform.scaling(resizeScale)
+            for face in faces:
+                face.transformArea(resizedToImage)
+                # a pair of eyes can be shared by more than one face
+                face.leftEye = face.leftEye.copy()
+                face.leftEye.transformArea(resizedToImage)
+                face.rightEye = face.rightEye.copy()
+                face.rightEye.transformArea(resizedToImage)
+
+        return faces
+
+
+    @staticmethod
+    def HELPER_detectBatchChunk(chunk):
+        """
+        Run HELPER_detectBatchImage on a chunk of images of a detectBatch worker.
+            :param chunk: a list of (index, path or image) 2-tuples
+            :return a list of (index, faces) 2-tuples
+        """
+        return [(index, ImageManager.HELPER_detectBatchImage(pathOrArray)) for (index, pathOrArray) in chunk]
+
+
+    @staticmethod
+    def detectBatch(pathsOrArrays, workers = None, angles = (45, 0, -45), scaleFactor = 1.1, minNeighbors = 10, mergeStrategy = "greedy", resizeTo = 500, 
+                    chunkSize = 8, maxPendingChunks = None, ordered = True):
+        """
+        Find the faces of many images on a pool of worker processes. The images are sent to the workers in chunks of chunkSize, and at most 
+        maxPendingChunks chunks are waiting or running at once, so pathsOrArrays can be a generator over any number of images and memory stays bounded
+        (the next chunks are only read from pathsOrArrays once the results before them are consumed).
+        Give paths rather than images: paths are decoded by the workers, images have to be copied over to them.
+            :param pathsOrArrays: an iterable of image paths and/or images
+            :param workers: number of worker processes, None for one per cpu
+            :param angles: counter clockwise angles by which the images are rotated, parameter for findFacesCounterClockwiseMultipleAngles
+            :param scaleFactor: paramter for detectMultiScale
+            :param minNeighbors: parameter for detectMultiScale
+            :param mergeStrategy: "greedy" or "nms", parameter for findFacesCounterClockwiseMultipleAngles
+            :param resizeTo: the images are resized such that their smaller dimension is resizeTo pixels before the detection, None to keep them as they are.
+            The faces are always in the coordinates of the original images
+            :param chunkSize: number of images sent to a worker at once
+            :param maxPendingChunks: max number of chunks waiting or running at once, None for 2 per worker
+            :param ordered: if True the results come in the same order as pathsOrArrays, if False as soon as they are done
+            :return a generator of (index, faces) 2-tuples, index being the position of the image in pathsOrArrays and faces an array of detectedFace objects 
+            (None if the image couldn't be read)
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if maxPendingChunks is None:
+            maxPendingChunks = 2 * workers
+        if chunkSize < 1 or maxPendingChunks < 1:
+            raise ValueError(f"chunkSize and maxPendingChunks must be at least 1, got {chunkSize} and {maxPendingChunks}")
+
+        settings = {"angles": tuple(angles), "scaleFactor": scaleFactor, "minNeighbors": minNeighbors, "mergeStrategy": mergeStrategy, "resizeTo": resizeTo}
+        indexedImages = enumerate(pathsOrArrays)
+
+        with ProcessPoolExecutor(max_workers = workers, initializer = ImageManager.HELPER_initBatchWorker, initargs = (settings,)) as executor:
+            pending = deque()
+            try:
+                while True:
+                    # fill up the pending chunks (backpressure: nothing more is read from pathsOrArrays until a chunk is done)
+                    while len(pending) < maxPendingChunks:
+                        chunk = list(itertools.islice(indexedImages, chunkSize))
+                        if len(chunk) == 0:
+                            break
+                        pending.append(executor.submit(ImageManager.HELPER_detectBatchChunk, chunk))
+
+                    if len(pending) == 0:
+                        return
+
+                    if ordered:
+                        doneChunks = [pending.popleft()]
+                    else:
+                        (done, notDone) = wait(pending, return_when = FIRST_COMPLETED)
+                        doneChunks = [future for future in pending if future in done]
+                        pending = deque(future for future in pending if future in notDone)
+
+                    for future in doneChunks:
+                        for result in future.result():
+                            yield result
+            finally:
+                # the caller stopped early (or a chunk failed), don't run the chunks nobody is going to read
+                for future in pending:
+                    future.cancel()
+
+
+
+atexit.register(ImageManager.shutdownExecutors)
@@ -5,6 +5,8 @@ class Point:
     """ 
     Point stores information of a point in an image and can calculate distance from itself to other Points.
     """
+    __slots__ = ("x", "y")
+
     def __init__(self, xCoord, yCoord, angle = 0):
         """ 
         Construct a point object.
@@ -115,6 +117,7 @@ class Point:
         projectedY = self.y + newOrigin.y - oldOrigin.y
         return Point(projectedX, projectedY)
 
+
     
     def relativeCounterClockwiseAngle(self, otherPoint):
         """
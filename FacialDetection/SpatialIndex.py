@@ -0,0 +1,104 @@
+import math
+
+
+class SpatialIndex:
+    """
+    SpatialIndex stores DetectedAreas in uniform grids over their centers, one grid per radius bucket (areas whose radii are within a factor of 2
+    share a bucket, and the grid cells of a bucket are as large as its biggest radius). Looking for duplicates or partners of an area then only
+    scans the few cells around it in the buckets of compatible sizes instead of every stored area.
+    """
+    def __init__(self):
+        """
+        Construct an empty SpatialIndex object.
+        """
+        # buckets maps a radius bucket to its grid, a grid maps a (column, row) cell to the list of entries (insertion number, x, y, radius, area)
+        self.buckets = {}
+        self.count = 0
+
+    @staticmethod
+    def HELPER_bucketOf(radius):
+        """
+        Return the radius bucket an area belongs to. Radii under 1 pixel all share bucket 0.
+            :param radius: the radius of the area
+            :return the bucket number
+        """
+        return math.floor(math.log2(max(radius, 1)))
+
+    def insert(self, area):
+        """
+        Store an area in the index using its current center and radius.
+            :param area: the DetectedArea object
+        """
+        bucket = self.HELPER_bucketOf(area.radius)
+        cellSize = 2 ** (bucket + 1)
+        (x, y) = (area.center.x, area.center.y)
+
+        grid = self.buckets.setdefault(bucket, {})
+        grid.setdefault((math.floor(x / cellSize), math.floor(y / cellSize)), []).append((self.count, x, y, area.radius, area))
+        self.count = self.count + 1
+
+    def remove(self, area):
+        """
+        Remove an area from the index. The area must not have been moved since it was inserted.
+            :param area: the DetectedArea object
+        """
+        bucket = self.HELPER_bucketOf(area.radius)
+        cellSize = 2 ** (bucket + 1)
+        cell = (math.floor(area.center.x / cellSize), math.floor(area.center.y / cellSize))
+
+        entries = self.buckets[bucket][cell]
+        for i in range(len(entries)):
+            if entries[i][4] is area:
+                entries.pop(i)
+                return
+
+    def query(self, center, minRadius, maxRadius, maxDistance, minDistance = 0):
+        """
+        Find the stored areas with a radius between minRadius and maxRadius whose centers are between minDistance and maxDistance away from center.
+            :param center: the Point the distances are measured from
+            :param minRadius: the smallest radius accepted
+            :param maxRadius: the biggest radius accepted
+            :param maxDistance: the biggest center distance accepted
+            :param minDistance: the smallest center distance accepted
+            :return a list of the matching areas, in the order they were inserted
+        """
+        found = []
+        (x, y) = (center.x, center.y)
+
+        for bucket in range(self.HELPER_bucketOf(minRadius), self.HELPER_bucketOf(maxRadius) + 1):
+            grid = self.buckets.get(bucket)
+            if grid is None:
+                continue
+
+            # only the cells the circle of radius maxDistance around center touches
+            cellSize = 2 ** (bucket + 1)
+            for column in range(math.floor((x - maxDistance) / cellSize), math.floor((x + maxDistance) / cellSize) + 1):
+                for row in range(math.floor((y - maxDistance) / cellSize), math.floor((y + maxDistance) / cellSize) + 1):
+                    for entry in grid.get((column, row), ()):
+                        (number, entryX, entryY, entryRadius, area) = entry
+                        if entryRadius < minRadius or entryRadius > maxRadius:
+                            continue
+                        distance = math.sqrt((entryX - x)**2 + (entryY - y)**2)
+                        if distance <= maxDistance and distance >= minDistance:
+                            found.append(entry)
+
+        found.sort(key = lambda entry: entry[0])
+        return [entry[4] for entry in found]
+
+    def findDuplicate(self, area, similarSizeScale, condition = None):
+        """
+        Find the first stored area that is a duplicate of the given area, meaning DetectedArea.similarSize and DetectedArea.overlap are both True.
+            :param area: the DetectedArea object
+            :param similarSizeScale: the scale parameter of DetectedArea.similarSize
+            :param condition: optional function taking a stored area, which also has to return True for it to be a duplicate
+            :return the first inserted duplicate, None if there isn't any
+        """
+        # similar sizes are within similarSizeScale of each other and overlapping centers are closer than a quarter of the sum of the radii
+        minRadius = area.radius * similarSizeScale
+        maxRadius = area.radius / similarSizeScale
+        maxDistance = (area.radius + maxRadius)/4
+
+        for other in self.query(area.center, minRadius, maxRadius, maxDistance):
+            if other.similarSize(area, similarSizeScale) and other.overlap(area) and (condition is None or condition(other)):
+                return other
+        return None
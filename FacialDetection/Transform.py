@@ -0,0 +1,122 @@
+import math
+import numpy as np
+from Point import Point
+
+
+class Transform:
+    """
+    Transform stores a 2x3 affine matrix (the same layout cv.getRotationMatrix2D and cv.warpAffine use) that moves points from one image to another.
+    Rotations and projections can be chained into a single Transform, which is then applied to any number of points with one matrix multiplication
+    instead of rotating/projecting the points one at a time.
+    """
+    def __init__(self, matrix = None):
+        """
+        Construct a Transform object.
+            :param matrix: the 2x3 affine matrix. If None, the Transform doesn't move anything (identity)
+        """
+        if matrix is None:
+            self.matrix = np.array([[1, 0, 0], [0, 1, 0]], dtype = np.float64)
+        else:
+            self.matrix = np.array(matrix, dtype = np.float64).reshape((2, 3))
+
+    @staticmethod
+    def rotationCounterClockwise(origin, angle):
+        """
+        Create the Transform rotating points counter-clockwise around origin by angle, the same way Point.rotatePointCounterClockwise does.
+            :param origin: the point where the points are going to rotate around
+            :param angle: the angle the points are going to be rotated by
+            :return the rotating Transform
+        """
+        angle = angle % 360
+
+        # Keep right angles exact, sin/cos of pi/2 multiples aren't
+        if angle % 90 == 0:
+            (cos, sin) = [(1, 0), (0, 1), (-1, 0), (0, -1)][int(angle // 90)]
+        else:
+            cos = math.cos(angle * math.pi / 180)
+            sin = math.sin(angle * math.pi / 180)
+
+        # y axis points down in images, so counter-clockwise on screen is x' = cos * dx + sin * dy, y' = - sin * dx + cos * dy
+        return Transform([[cos, sin, (1 - cos) * origin.x - sin * origin.y],
+                          [-sin, cos, sin * origin.x + (1 - cos) * origin.y]])
+
+    @staticmethod
+    def rotationClockwise(origin, angle):
+        """
+        Create the Transform rotating points clockwise around origin by angle, the same way Point.rotatePointClockwise does.
+            :param origin: the point where the points are going to rotate around
+            :param angle: the angle the points are going to be rotated by
+            :return the rotating Transform
+        """
+        return Transform.rotationCounterClockwise(origin, -angle)
+
+    @staticmethod
+    def translation(deltaX, deltaY):
+        """
+        Create the Transform moving points by (deltaX, deltaY).
+            :param deltaX: the distance moved along the x axis
+            :param deltaY: the distance moved along the y axis
+            :return the translating Transform
+        """
+        return Transform([[1, 0, deltaX], [0, 1, deltaY]])
+
+    @staticmethod
+    def scaling(scale):
+        """
+        Create the Transform scaling points away from (0, 0) by scale, like the one moving points from a resized image back to the original image.
+            :param scale: the scale factor, the same for both axes
+            :return the scaling Transform
+        """
+        return Transform([[scale, 0, 0], [0, scale, 0]])
+
+    @staticmethod
+    def projection(oldOrigin, newOrigin):
+        """
+        Create the Transform moving points such that their position relative to newOrigin is the same as their position relative to oldOrigin,
+        the same way Point.projectPoint does.
+            :param oldOrigin: the old origin point
+            :param newOrigin: the projected old Origin
+            :return the projecting Transform
+        """
+        return Transform.translation(newOrigin.x - oldOrigin.x, newOrigin.y - oldOrigin.y)
+
+    def then(self, otherTransform):
+        """
+        Compose the current Transform with another one.
+            :param otherTransform: the Transform applied after the current one
+            :return a Transform equivalent to applying the current Transform then otherTransform
+        """
+        return Transform(otherTransform.matrix[:, :2] @ self.matrix + np.array([[0, 0, otherTransform.matrix[0, 2]], [0, 0, otherTransform.matrix[1, 2]]]))
+
+    def scale(self):
+        """
+        Return how much the Transform scales lengths by. Rotations and projections don't change lengths (scale of 1).
+            :return the scale factor, for Transforms that scale both axes the same
+        """
+        return math.sqrt(abs(np.linalg.det(self.matrix[:, :2])))
+
+    def inverse(self):
+        """
+        Return the Transform undoing the current one.
+            :return the inverse Transform
+        """
+        linearInverse = np.linalg.inv(self.matrix[:, :2])
+        return Transform(np.hstack((linearInverse, - linearInverse @ self.matrix[:, 2:])))
+
+    def applyToPoints(self, points):
+        """
+        Apply the Transform to many points at once.
+            :param points: a (N x 2) array-like of (x, y) coordinates
+            :return a (N x 2) numpy array of the transformed coordinates
+        """
+        points = np.asarray(points, dtype = np.float64).reshape((-1, 2))
+        return points @ self.matrix[:, :2].T + self.matrix[:, 2]
+
+    def applyToPoint(self, point):
+        """
+        Apply the Transform to a single Point.
+            :param point: the Point object
+            :return the transformed point as a separated object
+        """
+        matrix = self.matrix
+        return Point(matrix[0, 0] * point.x + matrix[0, 1] * point.y + matrix[0, 2], matrix[1, 0] * point.x + matrix[1, 1] * point.y + matrix[1, 2])
@@ -3,9 +3,17 @@ from numpy import append
 from DetectedArea import DetectedArea, DetectedFace
 from ImageManager import ImageManager
 from Point import Point
+from Transform import Transform
+from SpatialIndex import SpatialIndex
 from helperFunctions import *
+from FrameCapture import FrameCapture
+from FrameScheduler import FrameScheduler
+import os
 import time
 import threading, queue
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 """
 The idea is that VideoManagers take care of both displaying the original frames when its time and do detections on the given frames.
@@ -28,16 +36,38 @@ class VideoManager:
     HARDCODED_updateFaceLocationSearchMultiplier = 1.4
     HARDCODED_similarSizeScale = 0.5
     HARDCODED_faceNotFoundCountLimit = 3
-
-    def __init__(self, videoFps = 0, dir = ""):
+    # the macro facial detection is given this many frames to find faces before it returns the best faces found so far
+    HARDCODED_macroDetectionFrameBudget = 6
+    # at most this many frames wait for the display to read them, the older ones are dropped unless the capture blocks
+    HARDCODED_captureBufferSize = 4
+    # number of frames of the segments processFileSegments decodes in parallel
+    HARDCODED_segmentLength = 150
+    # number of segments the worker reading the rest of the video after a missed seek can get ahead of the stitching by
+    HARDCODED_fallbackQueueSize = 2
+
+    def __init__(self, videoFps = 0, dir = "", dropPolicy = None, captureBufferSize = HARDCODED_captureBufferSize, schedulePolicy = "catchUp"):
         """
         Construct a VideoManager object
             :param videoFps: the fps of the input video
             :param dir: the directory to the video
+            :param dropPolicy: what the capture does with the frames the display is too slow to read, "latest", "dropOldest" or "block" (see FrameCapture).
+            None to block on video files, where every frame is there to be read, and to keep only the latest frame of live streams
+            :param captureBufferSize: the max number of captured frames waiting to be read
+            :param schedulePolicy: what the display does once it's behind the video, "catchUp" or "skip" (see FrameScheduler)
         """
         self.videoFps = videoFps
         self.video = cv.VideoCapture(dir)
-        self.faces = []
+        self.HELPER_resetTracking()
+
+        if dropPolicy is None:
+            dropPolicy = "block" if isinstance(dir, str) and os.path.isfile(dir) else "latest"
+        self.dropPolicy = dropPolicy
+        self.captureBufferSize = captureBufferSize
+        # the capture thread of the display method running, the frames are read from it instead of from the video itself
+        self.capture = None
+        self.schedulePolicy = schedulePolicy
+        # the scheduler pacing the frames of the display method running, None when the method draws the frames as soon as they come
+        self.scheduler = None
 
 
 
@@ -48,12 +78,13 @@ class VideoManager:
         haar_cascasde_face = cv.CascadeClassifier("classifier/haarcascade_frontalface_default.xml")
 
         frameTimeInterval = 1/self.videoFps
+        self.HELPER_startCapture()
         # if frame is read correctly/ new frame is available, then ret is True. 
         
         prev_frame = time.time()
         while True:
         # Capture frame-by-frame
-            ret, frame = self.video.read()
+            ret, frame = self.capture.read()
             # if frame is read correctly ret is True
             if not ret:
                 print("Can't receive frame (stream end?). Exiting ...")
@@ -80,6 +111,7 @@ class VideoManager:
             if cv.waitKey(1) == ord('q'):
                 break
             # When everything done, release the capture
+        self.HELPER_printCaptureStats(self.HELPER_stopCapture())
         self.video.release()
         cv.destroyAllWindows()
 
@@ -91,10 +123,11 @@ class VideoManager:
         """
         haar_cascasde_face = cv.CascadeClassifier("classifier/haarcascade_frontalface_default.xml")
 
-        # frameTimeInterval, prev_frame, and next_frame are used to determine the frame rate of the video, how often do we check for new frames
+        # frameTimeInterval is the frame time of the video, the scheduler sleeps until it's time for the next frame to be drawn
         frameTimeInterval = 1/self.videoFps
+        self.HELPER_startCapture()
+        self.scheduler = FrameScheduler(frameTimeInterval, self.schedulePolicy).start()
         prev_frame = time.time()
-        next_frame = prev_frame + frameTimeInterval
 
         # actual_prev_frame and actual_next_frame are for determining the actual fps/frame time when displayed. The deviation from the actual fps/frametime values is because
         # of rendering and image processings applied to the image
@@ -110,63 +143,56 @@ class VideoManager:
 
         while bool_DisplayingVideo:
             
-            # if its next time for the next frame to be drawn
-            if time.time() >= next_frame:
-
-                # Capture frame-by-frame
-                ret, frame = self.video.read()
+            # sleep until it's time for the next frame to be drawn, then capture it
+            ret, frame = self.HELPER_nextFrame()
 
-                # if frame is read correctly/ new frame is available, then ret is True. 
-                if not ret:
-                    print("Can't receive frame. Exiting ...")
-                    bool_DisplayingVideo = False
-                    continue               
-                
-                # set new frame target (next_frame) after check if new frame is available instead of before. This is to make sure when live capturing 
-                # the newest image will be shown as soon as they are ready. If this was to be put before checking if new frame is available, newest 
-                # frame have to wait till the next frameTimeInterval to be shown, which increases latency
-                prev_frame = next_frame
-                next_frame = prev_frame + frameTimeInterval
+            # if frame is read correctly/ new frame is available, then ret is True. 
+            if not ret:
+                print("Can't receive frame. Exiting ...")
+                bool_DisplayingVideo = False
+                continue               
+            
 
-                # Our operations on the frame come here
-                debug_frameCount = debug_frameCount + 1
+            # Our operations on the frame come here
+            debug_frameCount = debug_frameCount + 1
 
-                frame = resizeMinTo500(frame)
+            frame = resizeMinTo500(frame)
 
-                # startTime = time.time()
-                grayFrame = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
-                # print(f"grayscale runtime {time.time() - startTime:0.6f} seconds")
-                
-                # startTime = time.time()
-                faces = haar_cascasde_face.detectMultiScale(grayFrame, 2, 6, minSize = (30,30))
-                # print(f"Haarcascade Runtime {time.time() - startTime:0.6f} seconds")
+            # startTime = time.time()
+            grayFrame = cv.cvtColor(frame, cv.COLOR_BGR2GRAY)
+            # print(f"grayscale runtime {time.time() - startTime:0.6f} seconds")
+            
+            # startTime = time.time()
+            faces = haar_cascasde_face.detectMultiScale(grayFrame, 2, 6, minSize = (30,30))
+            # print(f"Haarcascade Runtime {time.time() - startTime:0.6f} seconds")
 
-                for (x,y,w,h) in faces:
-                    cv.rectangle(frame, (x,y), (x+w, y+h), (255, 255, 0), 2)
-                
+            for (x,y,w,h) in faces:
+                cv.rectangle(frame, (x,y), (x+w, y+h), (255, 255, 0), 2)
+            
 
 
 
-                # Calculating fps, timeFrame, video speed
-                actual_next_frame = time.time()
-                frameTime = actual_next_frame - actual_prev_frame
-                
-                actual_prev_frame = actual_next_frame
-                fps = 1/frameTime
-                videoSpeed = frameTimeInterval * 100 / frameTime
-                
-                # Display the resulting frame
-                cv.putText(frame, f"DEBUG {fps:0.2f} FPS", (12, 20), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.putText(frame, f"DEBUG FrameTime {frameTime*1000:0.2f}ms", (12, 60), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.putText(frame, f"DEBUG video speed {videoSpeed:0.2f}%", (12, 100), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                # print(f"DEBUG interval {frameTimeInterval*1000:0.2f} frameTime {frameTime*1000:0.2f}")
-                cv.imshow('video standard method', frame)
+            # Calculating fps, timeFrame, video speed
+            actual_next_frame = time.time()
+            frameTime = actual_next_frame - actual_prev_frame
+            
+            actual_prev_frame = actual_next_frame
+            fps = 1/frameTime
+            videoSpeed = frameTimeInterval * 100 / frameTime
+            
+            # Display the resulting frame
+            cv.putText(frame, f"DEBUG {fps:0.2f} FPS", (12, 20), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.putText(frame, f"DEBUG FrameTime {frameTime*1000:0.2f}ms", (12, 60), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.putText(frame, f"DEBUG video speed {videoSpeed:0.2f}%", (12, 100), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            # print(f"DEBUG interval {frameTimeInterval*1000:0.2f} frameTime {frameTime*1000:0.2f}")
+            cv.imshow('video standard method', frame)
 
 
-                if cv.waitKey(1) & 0xFF == ord('q'):
-                    bool_DisplayingVideo = False
-                    continue
+            if cv.waitKey(1) & 0xFF == ord('q'):
+                bool_DisplayingVideo = False
+                continue
 
+        self.HELPER_printCaptureStats(self.HELPER_stopCapture())
         print(f"DEBUG Video length {time.time() - debug_startTime:0.2f}")
         print(f"DEBUG Average fps {debug_frameCount / (time.time() - debug_startTime):0.2f} ")
 
@@ -176,10 +202,11 @@ class VideoManager:
         SHOW THEM HOW BAD IT IS TO JUST RUN DETECTION ON EVERY FRAMES
         """
 
-        # frameTimeInterval, prev_frame, and next_frame are used to determine the frame rate of the video, how often do we check for new frames
+        # frameTimeInterval is the frame time of the video, the scheduler sleeps until it's time for the next frame to be drawn
         frameTimeInterval = 1/self.videoFps
+        self.HELPER_startCapture()
+        self.scheduler = FrameScheduler(frameTimeInterval, self.schedulePolicy).start()
         prev_frame = time.time()
-        next_frame = prev_frame + frameTimeInterval
 
         # actual_prev_frame and actual_next_frame are for determining the actual fps/frame time when displayed. The deviation from the actual fps/frametime values is because
         # of rendering and image processings applied to the image
@@ -195,56 +222,49 @@ class VideoManager:
 
         while bool_DisplayingVideo:
             
-            # if its next time for the next frame to be drawn
-            if time.time() >= next_frame:
-
-                # Capture frame-by-frame
-                ret, frame = self.video.read()
+            # sleep until it's time for the next frame to be drawn, then capture it
+            ret, frame = self.HELPER_nextFrame()
 
-                # if frame is read correctly/ new frame is available, then ret is True. 
-                if not ret:
-                    print("Can't receive frame. Exiting ...")
-                    bool_DisplayingVideo = False
-                    continue               
-                
-                # set new frame target (next_frame) after check if new frame is available instead of before. This is to make sure when live capturing 
-                # the newest image will be shown as soon as they are ready. If this was to be put before checking if new frame is available, newest 
-                # frame have to wait till the next frameTimeInterval to be shown, which increases latency
-                prev_frame = next_frame
-                next_frame = prev_frame + frameTimeInterval
+            # if frame is read correctly/ new frame is available, then ret is True. 
+            if not ret:
+                print("Can't receive frame. Exiting ...")
+                bool_DisplayingVideo = False
+                continue               
+            
 
-                # Our operations on the frame come here
-                debug_frameCount = debug_frameCount + 1
+            # Our operations on the frame come here
+            debug_frameCount = debug_frameCount + 1
 
-                frame = resizeMinTo500(frame)
-                frameMgnr = ImageManager(frame)
-                # startTime = time.time()
-                faces = frameMgnr.findFacesCounterClockwiseMultipleAngles((0, 45), 1.2, 10)
-                # print(f"Runtime {time.time() - startTime:0.6f} seconds")
-                for face in faces:
-                    face.draw(frame, (255, 255, 255), 2)
+            frame = resizeMinTo500(frame)
+            frameMgnr = ImageManager(frame)
+            # startTime = time.time()
+            faces = frameMgnr.findFacesCounterClockwiseMultipleAngles((0, 45), 1.2, 10)
+            # print(f"Runtime {time.time() - startTime:0.6f} seconds")
+            for face in faces:
+                face.draw(frame, (255, 255, 255), 2)
 
 
 
-                # Calculating fps, timeFrame, video speed
-                actual_next_frame = time.time()
-                frameTime = actual_next_frame - actual_prev_frame
+            # Calculating fps, timeFrame, video speed
+            actual_next_frame = time.time()
+            frameTime = actual_next_frame - actual_prev_frame
 
-                actual_prev_frame = actual_next_frame
-                fps = 1/frameTime
-                videoSpeed = frameTimeInterval * 100 / frameTime
+            actual_prev_frame = actual_next_frame
+            fps = 1/frameTime
+            videoSpeed = frameTimeInterval * 100 / frameTime
 
-                # Display the resulting frame
-                cv.putText(frame, f"DEBUG {fps:0.2f} FPS", (12, 20), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.putText(frame, f"DEBUG FrameTime {frameTime*1000:0.2f}ms", (12, 60), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.putText(frame, f"DEBUG video speed {videoSpeed:0.2f}%", (12, 100), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.imshow('video unoptimized', frame)
+            # Display the resulting frame
+            cv.putText(frame, f"DEBUG {fps:0.2f} FPS", (12, 20), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.putText(frame, f"DEBUG FrameTime {frameTime*1000:0.2f}ms", (12, 60), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.putText(frame, f"DEBUG video speed {videoSpeed:0.2f}%", (12, 100), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.imshow('video unoptimized', frame)
 
 
-                if cv.waitKey(1) & 0xFF == ord('q'):
-                    bool_DisplayingVideo = False
-                    continue
+            if cv.waitKey(1) & 0xFF == ord('q'):
+                bool_DisplayingVideo = False
+                continue
 
+        self.HELPER_printCaptureStats(self.HELPER_stopCapture())
         print(f"DEBUG Video length {time.time() - debug_startTime:0.2f}")
         print(f"DEBUG Average fps {debug_frameCount / (time.time() - debug_startTime):0.2f} ")
 
@@ -266,10 +286,11 @@ class VideoManager:
         faceDetectionThread.start()
 
 
-        # frameTimeInterval, prev_frame, and next_frame are used to determine the frame rate of the video, how often do we check for new frames
+        # frameTimeInterval is the frame time of the video, the scheduler sleeps until it's time for the next frame to be drawn
         frameTimeInterval = 1/self.videoFps
+        self.HELPER_startCapture()
+        self.scheduler = FrameScheduler(frameTimeInterval, self.schedulePolicy).start()
         prev_frame = time.time()
-        next_frame = prev_frame + frameTimeInterval
 
         # actual_prev_frame and actual_next_frame are for determining the actual fps/frame time when displayed. The deviation from the actual fps/frametime values is because
         # of rendering and image processings applied to the image
@@ -286,72 +307,65 @@ class VideoManager:
 
         while bool_DisplayingVideo:
             
-            # if its next time for the next frame to be drawn
-            if time.time() >= next_frame:
+            # sleep until it's time for the next frame to be drawn, then capture it
+            ret, frame = self.HELPER_nextFrame()
 
-                # Capture frame-by-frame
-                ret, frame = self.video.read()
+            # if frame is read correctly/ new frame is available, then ret is True. 
+            if not ret:
+                print("Can't receive frame. Exiting ...")
+                bool_DisplayingVideo = False
+                continue               
+            
+            # resizing the frame to fit my tiny monitor, and to increase haarcascade detection performance too ye
+            frame = resizeMinTo500(frame)
+            
 
-                # if frame is read correctly/ new frame is available, then ret is True. 
-                if not ret:
-                    print("Can't receive frame. Exiting ...")
-                    bool_DisplayingVideo = False
-                    continue               
-                
-                # resizing the frame to fit my tiny monitor, and to increase haarcascade detection performance too ye
-                frame = resizeMinTo500(frame)
+            # Our operations on the frame come here
+            debug_frameCount = debug_frameCount + 1
+
+            # variable face detection scanning fps
+            if not faceDetectionThread.is_alive():
+                print(f"DEBUG frameSkip {debug_frameSkip + 1} frames")
+                debug_frameSkip = 0
+                # getting the most recent faces' positions
+                if not outputQueue.empty():
+                    faces = outputQueue.get()
                 
-                # set new display time target (next_frame) after check if new frame is available instead of before. This is to make sure when live capturing 
-                # the newest image will be shown as soon as they are ready (variable fps maybe). If this was to be put before checking if new frame is available, newest 
-                # frame have to wait till the next frameTimeInterval to be shown if it misses the frame display time target, which increases latency (MAYBE :thonking:?)
-                prev_frame = next_frame
-                next_frame = prev_frame + frameTimeInterval
-
-                # Our operations on the frame come here
-                debug_frameCount = debug_frameCount + 1
-
-                # variable face detection scanning fps
-                if not faceDetectionThread.is_alive():
-                    print(f"DEBUG frameSkip {debug_frameSkip + 1} frames")
-                    debug_frameSkip = 0
-                    # getting the most recent faces' positions
-                    if not outputQueue.empty():
-                        faces = outputQueue.get()
-                    
-
-                    frameMgnr = ImageManager(frame)
-                    args = [(45, 0, -45), 1.2, 10]
-                    faceDetectionThread = threading.Thread(target = self.HELPER_findFacesCounterClockwiseMultipleAngles_to_outputQueue, args = [frameMgnr, args, outputQueue])
-                    faceDetectionThread.start()
-                else:
-                    debug_frameSkip = debug_frameSkip + 1
 
+                frameMgnr = ImageManager(frame)
+                args = [(45, 0, -45), 1.2, 10, self.HARDCODED_macroDetectionFrameBudget * frameTimeInterval * 1000]
+                faceDetectionThread = threading.Thread(target = self.HELPER_findFaces_to_outputQueue, args = [frameMgnr, args, outputQueue])
+                faceDetectionThread.start()
+            else:
+                debug_frameSkip = debug_frameSkip + 1
 
-                for face in faces:
-                    face.draw(frame, (255, 255, 255), 2)
 
+            for face in faces:
+                face.draw(frame, (255, 255, 255), 2)
 
 
-                # Calculating fps, timeFrame, video speed
-                actual_next_frame = time.time()
-                frameTime = actual_next_frame - actual_prev_frame
 
-                actual_prev_frame = actual_next_frame
-                fps = 1/frameTime
-                videoSpeed = frameTimeInterval * 100 / frameTime
+            # Calculating fps, timeFrame, video speed
+            actual_next_frame = time.time()
+            frameTime = actual_next_frame - actual_prev_frame
 
-                # Display the resulting frame
-                cv.putText(frame, f"DEBUG {fps:0.2f} FPS", (12, 20), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.putText(frame, f"DEBUG FrameTime {frameTime*1000:0.2f}ms", (12, 60), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.putText(frame, f"DEBUG video speed {videoSpeed:0.2f}%", (12, 100), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.imshow('video optimized', frame)
+            actual_prev_frame = actual_next_frame
+            fps = 1/frameTime
+            videoSpeed = frameTimeInterval * 100 / frameTime
 
-                
+            # Display the resulting frame
+            cv.putText(frame, f"DEBUG {fps:0.2f} FPS", (12, 20), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.putText(frame, f"DEBUG FrameTime {frameTime*1000:0.2f}ms", (12, 60), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.putText(frame, f"DEBUG video speed {videoSpeed:0.2f}%", (12, 100), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.imshow('video optimized', frame)
 
-                if cv.waitKey(1) & 0xFF == ord('q'):
-                    bool_DisplayingVideo = False
-                    continue
+            
 
+            if cv.waitKey(1) & 0xFF == ord('q'):
+                bool_DisplayingVideo = False
+                continue
+
+        self.HELPER_printCaptureStats(self.HELPER_stopCapture())
         print(f"DEBUG Video length {time.time() - debug_startTime:0.2f}")
         print(f"DEBUG Average fps {debug_frameCount / (time.time() - debug_startTime):0.2f} ")
 
@@ -366,21 +380,15 @@ class VideoManager:
 
         To improve the choppy framerate, I use past locations and run basic haarcascade facial detection (microFacialDetection) on those areas only. Then run eye detection in the new detected faces to update the angles of the faces.
         """
-        # currentDetectedFacesManager is an array that store the tuples of most recent position of the detected faces and an int indicating to whether should the face be displayed on the frame (0 means yes, > 0 means no) 
-        currentDetectedFacesManager = []
-        # while shadowDetectedFaces store the faces detected by macro facial detection, which lags 2-6 frames behind
-        shadowDetectedFaces = []
-        # outputQueue is used for storing threaded functions output
-        outputQueue = queue.Queue()
-        # this is a thread
-        faceDetectionThread = threading.Thread()
-        faceDetectionThread.start()
+        # the faces tracked start empty, the first macro facial detection runs on the first frame
+        self.HELPER_resetTracking()
 
 
-        # frameTimeInterval, prev_frame, and next_frame are used to determine the frame rate of the video, how often do we check for new frames
+        # frameTimeInterval is the frame time of the video, the scheduler sleeps until it's time for the next frame to be drawn
         frameTimeInterval = 1/self.videoFps
+        self.HELPER_startCapture()
+        self.scheduler = FrameScheduler(frameTimeInterval, self.schedulePolicy).start()
         prev_frame = time.time()
-        next_frame = prev_frame + frameTimeInterval
 
         # actual_prev_frame and actual_next_frame are for determining the actual fps/frame time when displayed. The deviation from the actual fps/frametime values is because
         # of rendering and image processings applied to the image
@@ -392,322 +400,720 @@ class VideoManager:
         # startTime, endTime, frameCount are used for debugging (checking average fps)
         debug_startTime = time.time()
         debug_frameCount = 0
-        debug_frameSkip = 0
 
 
         while bool_DisplayingVideo:
 
 
-            # print(f"DEBUG currentDetectedFacesManager length {len(currentDetectedFacesManager)}")
-            # print(f"DEBUG shadowDetectedFaces length {len(shadowDetectedFaces)}")
-
-
-            # if its next time for the next frame to be drawn
-            if time.time() >= next_frame:
+            # sleep until it's time for the next frame to be drawn, then capture it
+            ret, frame = self.HELPER_nextFrame()
 
-                # Capture frame-by-frame
-                ret, frame = self.video.read()
+            # if frame is read correctly/ new frame is available, then ret is True. 
+            if not ret:
+                print("Can't receive frame. Exiting ...")
+                bool_DisplayingVideo = False
+                continue               
+            
+            # resizing the frame to fit my tiny monitor, and to increase haarcascade detection performance too ye
+            min500frame = resizeMinTo500(frame)
+            
 
-                # if frame is read correctly/ new frame is available, then ret is True. 
-                if not ret:
-                    print("Can't receive frame. Exiting ...")
-                    bool_DisplayingVideo = False
-                    continue               
-                
-                # resizing the frame to fit my tiny monitor, and to increase haarcascade detection performance too ye
-                min500frame = resizeMinTo500(frame)
-                
-                # set new display time target (next_frame) after check if new frame is available instead of before. This is to make sure when live capturing 
-                # the newest image will be shown as soon as they are ready (variable fps maybe). If this was to be put before checking if new frame is available, newest 
-                # frame have to wait till the next frameTimeInterval to be shown if it misses the frame display time target, which increases latency (MAYBE :thonking:?)
-                prev_frame = next_frame
-                next_frame = prev_frame + frameTimeInterval
-
-                # Our operations on the frame come here
-                debug_frameCount = debug_frameCount + 1
-
-
-                # variable face detection scanning fps
-                if not faceDetectionThread.is_alive():
-                    # --- MACRO FACIAL DETECTION SECTION --- MACRO FACIAL DETECTION SECTION --- MACRO FACIAL DETECTION SECTION --- MACRO FACIAL DETECTION SECTION --- MACRO FACIAL DETECTION SECTION --- #
-
-                    # If the previous thoroughly facial detection (my implementation) has finished running
-                    # print(f"DEBUG frameSkip {debug_frameSkip + 1} frames")
-                    debug_frameSkip = 0
-
-                    # delayDetectedFaces is the array that store detectedArea objs returned by previously called findFacesCounterClockwiseMultipleAngles function. 
-                    # These objs dont represent the current faces, but faces found in 2-6 frames previously when the function was called
-                    delayDetectedFaces = []
-                    # getting the most recent thoroughly detected faces' positions
-                    if not outputQueue.empty():
-                        delayDetectedFaces = outputQueue.get()
-
-                        # print(f"DEBUG delayDetectedFaces length {len(delayDetectedFaces)}")
-                    
-
-                    # Merging the macro facial detection into the micro facial detection list
-                    if len(shadowDetectedFaces) == 0:
-                        shadowDetectedFaces = delayDetectedFaces
-                        for shadowFace in shadowDetectedFaces:
-                            currentDetectedFacesManager.append([shadowFace.copy(), 0])
-                    elif len(delayDetectedFaces) != 0:
-
-                        # check if there's a new face detected by macro facial detection
-                        for shadowFace in shadowDetectedFaces:
-                            
-                            bool_innerLoop = False
-                            i = 0
-                            if i < len(delayDetectedFaces):
-                                bool_innerLoop = True
-
-                            while bool_innerLoop:
-                                delayFace = delayDetectedFaces[i]
-                                # if the face returned by macro facial detection has already exists then pop it off
-                                if shadowFace.similarSize(delayFace, self.HARDCODED_similarSizeScale) and shadowFace.overlap(delayFace):
-                                    delayDetectedFaces.pop(i)
-                                    i = i - 1
-                                i = i + 1
-                                if i >= len(delayDetectedFaces):
-                                    bool_innerLoop = False
-                        
-                        # if there are faces that haven't been detected then add them to the currentDetectedFacesManager list
-                        if len(delayDetectedFaces) != 0:
-                            for newFace in delayDetectedFaces:
-                                currentDetectedFacesManager.append([newFace, 0])
-
-          
-
-                    # Run the next macro facial detection (my implementation) in a seperate thread to avoid interfering with updating new frames
-                    frameMgnr = ImageManager(min500frame)
-                    args = [(45, 0, -45), 1.1, 10]
-                    faceDetectionThread = threading.Thread(target = self.HELPER_findFacesCounterClockwiseMultipleAngles_to_outputQueue, args= [frameMgnr, args, outputQueue])
-                    faceDetectionThread.start()
-
-                    # update the shadowDetectedFace list for when the thread finished running
-                    for currentFaceManager in currentDetectedFacesManager:
-                        currentFace = currentFaceManager[0]
-                        shadowDetectedFaces.append(currentFace.copy())
-
-
-                else:
-                    
-                    
-
-                    debug_frameSkip = debug_frameSkip + 1
-
-                    # --- MICRO FACIAL DETECTION SECTION --- MICRO FACIAL DETECTION SECTION --- MICRO FACIAL DETECTION SECTION --- MICRO FACIAL DETECTION SECTION --- MICRO FACIAL DETECTION SECTION --- #
-
-                    # updating the detected faces in the last frame by searching around their area
-                    if len(currentDetectedFacesManager) != 0:
-                        bool_loop = True
-                        index_currentDetectedFacesManager = 0
-                        if index_currentDetectedFacesManager >= len(currentDetectedFacesManager):
-                            bool_loop = False
-                        while bool_loop:
-                            face = currentDetectedFacesManager[index_currentDetectedFacesManager][0]
-
-                            dimensions = face.dimensions
-                            counterClockwiseAngle = face.counterClockwiseAngle
-                            faceCenter = Point(face.center.x, face.center.y)
-
-                            
-                            # rotate clockwise because the face's angle is the counter clockwise angle of the right eye to the left eye
-                            frameOrigin = Point(min500frame.shape[1]/2, min500frame.shape[0]/2)
-                            rotatedFrame = rotateClockwise(min500frame, counterClockwiseAngle)
-                            rotatedFrameOrigin = Point(rotatedFrame.shape[1]/2, rotatedFrame.shape[0]/2)
-
-                            # rotate clockwise the faceCenter and project it to the new image
-                            rotatedFaceCenter = faceCenter.rotatePointClockwise(frameOrigin, counterClockwiseAngle)
-                            rotatedFaceCenter = rotatedFaceCenter.projectPoint(frameOrigin, rotatedFrameOrigin)
-
-                            # Calculate the region of the potential face
-                            searchingDimensions = (dimensions[0] * self.HARDCODED_updateFaceLocationSearchMultiplier, dimensions[1] * self.HARDCODED_updateFaceLocationSearchMultiplier)
-                            cropRangeMinY = int(max(0, rotatedFaceCenter.y - searchingDimensions[1] / 2))
-                            cropRangeMaxY = int(min(rotatedFrame.shape[0], rotatedFaceCenter.y + searchingDimensions[1] / 2))
-
-                            cropRangeMinX = int(max(0, rotatedFaceCenter.x - searchingDimensions[0] / 2))
-                            cropRangeMaxX = int(min(rotatedFrame.shape[1], rotatedFaceCenter.x + searchingDimensions[0] / 2 ))
-                            
-                            # Cropping out the region of the potential face
-                            try:
-                                croppedPotentialFace = np.zeros((cropRangeMaxY - cropRangeMinY, cropRangeMaxX - cropRangeMinX), dtype='uint8')
-                                croppedPotentialFace[0: croppedPotentialFace.shape[0], 0: croppedPotentialFace.shape[1]] = \
-                                    rotatedFrame[cropRangeMinY:cropRangeMaxY, cropRangeMinX:cropRangeMaxX]
-                            
-                            except:
-                                croppedPotentialFace = np.zeros((cropRangeMaxY - cropRangeMinY, cropRangeMaxX - cropRangeMinX, 3), dtype ='uint8')
-                                croppedPotentialFace[0: croppedPotentialFace.shape[0], 0: croppedPotentialFace.shape[1]] = \
-                                    rotatedFrame[cropRangeMinY:cropRangeMaxY, cropRangeMinX:cropRangeMaxX]
-                            
-
-                            croppedPotentialFaceCenter = Point(croppedPotentialFace.shape[1]/2 , croppedPotentialFace.shape[0]/2)
-
-                            # gray scale the image
-                            grayCroppedPotentialFace = cv.cvtColor(croppedPotentialFace, cv.COLOR_BGR2GRAY)
-                            # run basic haarcascade facial detection on it
-                            # CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ? CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ? CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ?
-                            detectedFaces = haarcascade_FacialDetection(grayCroppedPotentialFace, 1.2, 6)
-                            
-
-                            # if found nothing then move to the next face's last frame location
-                            if len(detectedFaces) == 0:
-                                
-                                # increment the faceNotFoundCount
-                                faceNotFoundCount = currentDetectedFacesManager[index_currentDetectedFacesManager][1] 
-                                faceNotFoundCount = faceNotFoundCount + 1
-                                if faceNotFoundCount >= self.HARDCODED_faceNotFoundCountLimit:
-
-                                    currentDetectedFacesManager.pop(index_currentDetectedFacesManager)
-                                    # if there's still more currentFaceManager to iterate
-                                    if index_currentDetectedFacesManager < len(currentDetectedFacesManager):
-                                        continue
-                                    
-                                    # if there's no more currentFaceManager to iterate then break the loop
-                                    bool_loop = False
-                                    continue
-                                
-                                # update faceNotFoundCount
-                                currentDetectedFacesManager[index_currentDetectedFacesManager][1] = faceNotFoundCount
-
-                                # if still under the faceNotFoundLimit then continue iterating
-                                continue
-                            
-                            # if found anything, then convert the rectangle coordinates received from detectMultiScale function to a detectedFace obj.
-                            biggestFace = detectedFaces[0]
-                            for i in range(1, len(detectedFaces)):
-                                # comparing the dimensions (width only, cause if width is > then height is also >) among all the faces found. 
-                                if biggestFace[2] < detectedFaces[i][2]:
-                                    biggestFace = detectedFaces[i]
-                            
-                            # Creating DetectedFace obj representing the biggest face found in the potential region above
-                            biggestFace = DetectedFace((biggestFace[0], biggestFace[1]), (biggestFace[2], biggestFace[3]))
-
-                            # Finding biggestFace's angle
-                            # CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ? CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ? CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ?
-                            
-                            # find the eyes
-                            tempEyesArray = haarcascade_EyeDetection(grayCroppedPotentialFace, 1.2, 10)
-                            detectedEyes = []
-
-                            if face.leftEye != None:
-                                referenceEye = face.leftEye
-                            elif face.rightEye != None:
-                                referenceEye = face.rightEye 
-                            else:
-                                faceUpperLeftPoint = biggestFace.upperLeft
-                                # if the face has no eyes found, then create a standard reference eye
-                                # HARDCODED ___ Eye's width is usually at most 3/8 of face's width. Eye's height is usually at most 1/3 of face's height
-                                referenceEye = DetectedArea((faceUpperLeftPoint.x + biggestFace.dimensions[0]/8, faceUpperLeftPoint.y + biggestFace.dimensions[1]/6), (biggestFace.dimensions[0]* 3/ 8, biggestFace.dimensions[1]/3) )
-
-                            for (x, y, w, h)in tempEyesArray:
-                                eye = DetectedArea((x, y), (w, h))
-                                # If the shape and size of the eye found in the image is approximately the same as the reference eye
-                                if eye.similarSize(referenceEye, self.HARDCODED_similarSizeScale):
-                                    detectedEyes.append(eye)
-                            
-                            # find the pairs of eyes
-                            if len(detectedEyes) > 1:
-                                # This might be slightlyyyyy overkill but usually there's like at most 2-3 eyes so it wont be too computationally heavy.
-                                for i in range(len(detectedEyes)):
-                                    j = i + 1
-                                    for j in range(len(detectedEyes)):
-                                        if detectedEyes[i].appropriateDistanceTo(detectedEyes[j], self.HARDCODED_pairOfEyesDistanceRange[0], self.HARDCODED_pairOfEyesDistanceRange[1]):
-                                            leftEye = detectedEyes[i]
-                                            rightEye = detectedEyes[j]
-                                            if detectedEyes[i].center.x > detectedEyes[j].center.x:
-                                                leftEye = detectedEyes[j]
-                                                rightEye = detectedEyes[i]
-                                            # if the distance of LeftEye's center to face's upperLeft Point ~ that of RightEye's center to face's upperRight Point
-                                            # and distance of LeftEye's center to face's lowerLeft Point ~ that of RightEye's center to face's lowerRight Point
-                                            # then this is probably the right pair of eyes
-                                            upperLeftDist = leftEye.center.distTo(biggestFace.upperLeft)
-                                            upperRightDist = rightEye.center.distTo(biggestFace.upperRight)
-                                            lowerLeftDist = leftEye.center.distTo(biggestFace.lowerLeft)
-                                            lowerRightDist = rightEye.center.distTo(biggestFace.lowerRight)
-                                            criterias = 0
-                                            if upperLeftDist < upperRightDist and upperLeftDist > upperRightDist * self.HARDCODED_distanceVariation_EyeToCorners_MinOfMax:
-                                                criterias = criterias + 1
-                                            if upperRightDist <= upperLeftDist and upperRightDist > upperLeftDist * self.HARDCODED_distanceVariation_EyeToCorners_MinOfMax:
-                                                criterias = criterias + 1
-                                            if lowerLeftDist < lowerRightDist and lowerLeftDist > lowerRightDist * self.HARDCODED_distanceVariation_EyeToCorners_MinOfMax:
-                                                criterias = criterias + 1
-                                            if lowerRightDist <= lowerLeftDist and lowerRightDist > lowerLeftDist * self.HARDCODED_distanceVariation_EyeToCorners_MinOfMax:
-                                                criterias = criterias + 1
-                                            if criterias == 2:
-                                                biggestFace.leftEye = leftEye
-                                                biggestFace.rightEye = rightEye
-                                                break
-
-                            # find the face's angle using the pair of eyes
-                            if biggestFace.leftEye != None and biggestFace.rightEye != None:
-                                # calculate teh relative angle created by the two eyes
-                                relativeCounterClockwiseAngle = biggestFace.leftEye.center.relativeCounterClockwiseAngle(biggestFace.rightEye.center)
-                                # the face's current angle is the already rotated angle pre-haarcascade detection + the relative angle
-                                biggestFace.counterClockwiseAngle = counterClockwiseAngle + relativeCounterClockwiseAngle
-                                biggestFace.rotateAreaCounterClockwise(biggestFace.center, relativeCounterClockwiseAngle)
-                            else:
-                                # if there's not a pair of eyes then the face's angle = the previous face that was detected in the same area's angle
-                                biggestFace.counterClockwiseAngle = counterClockwiseAngle
-                            
-
-                            # Returning the face's coordinates to the original frame
-                            biggestFace.projectArea(croppedPotentialFaceCenter, rotatedFaceCenter)
-                            biggestFace.rotateAreaCounterClockwise(rotatedFrameOrigin, biggestFace.counterClockwiseAngle)
-                            biggestFace.projectArea(rotatedFrameOrigin, frameOrigin)
-                            
-                            # update the face's location and reset faceNotFoundCount value to 0
-                            currentDetectedFacesManager[index_currentDetectedFacesManager][0] = biggestFace
-                            currentDetectedFacesManager[index_currentDetectedFacesManager][1] = 0
-
-                            # continue iterating the currentFaceManager
-                            index_currentDetectedFacesManager = index_currentDetectedFacesManager + 1
-                            if index_currentDetectedFacesManager >= len(currentDetectedFacesManager):
-                                bool_loop = False
+            # Our operations on the frame come here
+            debug_frameCount = debug_frameCount + 1
 
-    
 
+            # run the next macro facial detection once the previous one finished, and update the faces around their last locations in between
+            faces = self.HELPER_trackFaces(min500frame, frameTimeInterval)
 
-                for faceManager in currentDetectedFacesManager:
-                    face = faceManager[0]
-                    face.draw(min500frame, (255, 255, 255), 2)
+            for face in faces:
+                face.draw(min500frame, (255, 255, 255), 2)
 
 
 
-                # Calculating fps, timeFrame, video speed
-                actual_next_frame = time.time()
-                frameTime = actual_next_frame - actual_prev_frame
+            # Calculating fps, timeFrame, video speed
+            actual_next_frame = time.time()
+            frameTime = actual_next_frame - actual_prev_frame
 
-                actual_prev_frame = actual_next_frame
-                fps = 1/frameTime
-                videoSpeed = frameTimeInterval * 100 / frameTime
+            actual_prev_frame = actual_next_frame
+            fps = 1/frameTime
+            videoSpeed = frameTimeInterval * 100 / frameTime
 
-                # Display the resulting frame
-                cv.putText(min500frame, f"DEBUG {fps:0.2f} FPS", (12, 20), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.putText(min500frame, f"DEBUG FrameTime {frameTime*1000:0.2f}ms", (12, 60), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.putText(min500frame, f"DEBUG video speed {videoSpeed:0.2f}%", (12, 100), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-                cv.imshow('video EVEN MORE optimized', min500frame)
+            # Display the resulting frame
+            cv.putText(min500frame, f"DEBUG {fps:0.2f} FPS", (12, 20), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.putText(min500frame, f"DEBUG FrameTime {frameTime*1000:0.2f}ms", (12, 60), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.putText(min500frame, f"DEBUG video speed {videoSpeed:0.2f}%", (12, 100), cv.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv.imshow('video EVEN MORE optimized', min500frame)
 
-                
+            
 
-                if cv.waitKey(1) & 0xFF == ord('q'):
-                    bool_DisplayingVideo = False
-                    continue
+            if cv.waitKey(1) & 0xFF == ord('q'):
+                bool_DisplayingVideo = False
+                continue
 
+        self.HELPER_printCaptureStats(self.HELPER_stopCapture())
         print(f"DEBUG Video length {time.time() - debug_startTime:0.2f}")
         print(f"DEBUG Average fps {debug_frameCount / (time.time() - debug_startTime):0.2f} ")
     
 
     
     
-    def HELPER_findFacesCounterClockwiseMultipleAngles_to_outputQueue(self, frameManager, arguments, outputQueue):
+    def runHeadless(self, sinks, maxFrames = None):
+        """
+        Track the faces of the video the way displayEvenMoreOptimizedMethod does but without any window, the faces of every frame go to the sinks
+        (see FrameSinks) instead. The frames are tracked as fast as they come (the capture blocks on video files and keeps the latest frame of live
+        streams), and the faces are only drawn on the frames when at least one sink is visual.
+            :param sinks: the list of sink objects, the faces are in the coordinates of the original frames like with processFile
+            :param maxFrames: stop after this many frames, None to run until the video ends
+            :return the number of frames tracked
+        """
+        frameTimeInterval = 1/self.videoFps
+        visual = any(sink.visual for sink in sinks)
+        self.HELPER_resetTracking()
+        self.HELPER_startCapture()
+
+        frameCount = 0
+        try:
+            while maxFrames is None or frameCount < maxFrames:
+                ret, frame = self.capture.read()
+                if not ret:
+                    break
+
+                # the faces are tracked in the same resized frames as the display methods
+                min500frame = resizeMinTo500(frame)
+                faces = VideoManager.HELPER_scaleFacesToFrame(self.HELPER_trackFaces(min500frame, frameTimeInterval), min500frame, frame)
+
+                if visual:
+                    for face in faces:
+                        face.draw(frame, (255, 255, 255), 2)
+                for sink in sinks:
+                    sink.write(self.capture.lastFrameNumber, faces, frame)
+                frameCount = frameCount + 1
+        finally:
+            self.HELPER_stopCapture()
+            # the macro facial detection left running would share the classifiers with the next one
+            if self.macroDetectionThread.is_alive():
+                self.macroDetectionThread.join()
+            for sink in sinks:
+                sink.close()
+
+        return frameCount
+
+
+
+    @staticmethod
+    def processFile(path, sinks, every = 1, workers = None, angles = (45, 0, -45), scaleFactor = 1.1, minNeighbors = 10, mergeStrategy = "greedy",
+                    chunkSize = 4):
+        """
+        Find the faces of a video file as fast as the cpus allow: no pacing at the video's fps and no tracking in between detections, every processed
+        frame goes through the full findFacesCounterClockwiseMultipleAngles pipeline on a pool of worker processes (see ImageManager.detectBatch).
+        The frames are decoded here while the workers detect the frames sent before them, and the faces of every frame go to the sinks in order.
+            :param path: the path to the video file
+            :param sinks: the list of sink objects (see FrameSinks), the faces are in the coordinates of the original frames
+            :param every: process every every-th frame, the frames in between are skipped without being converted
+            :param workers: number of worker processes, None for one per cpu
+            :param angles: counter clockwise angles by which the frames are rotated, parameter for findFacesCounterClockwiseMultipleAngles
+            :param scaleFactor: paramter for detectMultiScale
+            :param minNeighbors: parameter for detectMultiScale
+            :param mergeStrategy: "greedy" or "nms", parameter for findFacesCounterClockwiseMultipleAngles
+            :param chunkSize: number of frames sent to a worker at once
+            :return a dict with the number of frames decoded and processed, the seconds it took, and the processed frames per second
+        """
+        if every < 1:
+            raise ValueError(f"every must be at least 1, got {every}")
+
+        video = cv.VideoCapture(path)
+        visual = any(sink.visual for sink in sinks)
+        # frame number (and the frame itself for the visual sinks) of the frames sent to the workers whose faces haven't come back yet
+        sentFrames = deque()
+        decodedFrames = [0]
+
+        def framesToProcess():
+            while True:
+                ret, frame = video.read()
+                if not ret:
+                    return
+                sentFrames.append((decodedFrames[0], frame if visual else None))
+                decodedFrames[0] = decodedFrames[0] + 1
+                yield frame
+
+                # the skipped frames are only grabbed, not converted
+                for i in range(every - 1):
+                    if not video.grab():
+                        return
+                    decodedFrames[0] = decodedFrames[0] + 1
+
+        startTime = time.monotonic()
+        processedFrames = 0
+        try:
+            for (index, faces) in ImageManager.detectBatch(framesToProcess(), workers, angles, scaleFactor, minNeighbors, mergeStrategy, chunkSize = chunkSize):
+                (frameNumber, frame) = sentFrames.popleft()
+                if visual:
+                    for face in faces:
+                        face.draw(frame, (255, 255, 255), 2)
+                for sink in sinks:
+                    sink.write(frameNumber, faces, frame)
+                processedFrames = processedFrames + 1
+        finally:
+            video.release()
+            for sink in sinks:
+                sink.close()
+
+        seconds = time.monotonic() - startTime
+        return {"frames": decodedFrames[0], "processedFrames": processedFrames, "seconds": seconds, "fps": processedFrames / seconds if seconds > 0 else 0}
+
+
+
+    @staticmethod
+    def processFileSegments(path, sinks, segmentLength = HARDCODED_segmentLength, every = 1, workers = None, angles = (45, 0, -45), scaleFactor = 1.1,
+                            minNeighbors = 10, mergeStrategy = "greedy", maxPendingSegments = None):
+        """
+        Find the faces of every frame of a video file with the decoding split across worker processes too: the video is cut into segments of
+        segmentLength frames, and every worker seeks to its segment (CAP_PROP_POS_FRAMES), decodes it and tracks its faces. The full
+        findFacesCounterClockwiseMultipleAngles pipeline runs on every every-th frame, the frames in between are tracked from it the way
+        runHeadless does. The tracking starts over from a full detection on the first frame of every segment. The faces of every frame go to the
+        sinks in order. The segments are cut from the frame count of the video, which can be an estimate: the video ends at the first segment ending
+        before its last frame, the segments after it are cancelled.
+        If a seek misses its segment (or a worker finds the video at another frame than expected in it), the video can't be seeked reliably: the
+        segments not stitched yet are cancelled and the rest of the video is read by a single worker from the start of the segment, the way processFile
+        reads it. That worker sends the frames back segmentLength frames at a time through a bounded queue, so the rest of the video is never held in
+        memory at once.
+        The annotated frames of the visual sinks are sent back from the workers, keep segmentLength small when using them.
+            :param path: the path to the video file
+            :param sinks: the list of sink objects (see FrameSinks), the faces are in the coordinates of the original frames
+            :param segmentLength: number of frames of a segment, rounded up to a multiple of every so the detections stay every every-th frame
+            :param every: run the full facial detection on every every-th frame, track the faces in between
+            :param workers: number of worker processes, None for one per cpu
+            :param angles: counter clockwise angles by which the frames are rotated, parameter for findFacesCounterClockwiseMultipleAngles
+            :param scaleFactor: paramter for detectMultiScale
+            :param minNeighbors: parameter for detectMultiScale
+            :param mergeStrategy: "greedy" or "nms", parameter for findFacesCounterClockwiseMultipleAngles
+            :param maxPendingSegments: max number of segments waiting or running at once, None for 2 per worker
+            :return a dict with the number of frames and segments, the number of seeks that missed their segment (the video is then read in a
+            single segment from there), the seconds it took, and the frames per second
+        """
+        if every < 1 or segmentLength < 1:
+            raise ValueError(f"every and segmentLength must be at least 1, got {every} and {segmentLength}")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if maxPendingSegments is None:
+            maxPendingSegments = 2 * workers
+        segmentLength = -(-segmentLength // every) * every
+
+        # the frame count can be an estimate, the last segment reads until the video ends and any segment can come back short or empty
+        video = cv.VideoCapture(path)
+        frameCount = int(video.get(cv.CAP_PROP_FRAME_COUNT))
+        video.release()
+        starts = list(range(0, max(frameCount, 1), segmentLength))
+        segments = iter([(start, starts[i + 1] if i + 1 < len(starts) else None) for (i, start) in enumerate(starts)])
+
+        settings = {"every": every, "angles": tuple(angles), "scaleFactor": scaleFactor, "minNeighbors": minNeighbors, "mergeStrategy": mergeStrategy,
+                    "visual": any(sink.visual for sink in sinks), "segmentLength": segmentLength}
+        startTime = time.monotonic()
+        processedFrames = 0
+        processedSegments = 0
+        seekFallbacks = 0
+
+        with ProcessPoolExecutor(max_workers = workers, initializer = VideoManager.HELPER_initSegmentWorker) as executor:
+            pending = deque()
+            try:
+                while True:
+                    while len(pending) < maxPendingSegments:
+                        segment = next(segments, None)
+                        if segment is None:
+                            break
+                        pending.append((segment, executor.submit(VideoManager.HELPER_processSegment, path, segment[0], segment[1], settings)))
+
+                    if len(pending) == 0:
+                        break
+
+                    # the segments are stitched back in order
+                    ((start, end), future) = pending.popleft()
+                    (results, seekLanded) = future.result()
+                    if not seekLanded:
+                        # the seeks of the other segments can't be trusted either, one worker reads the rest of the video from the start of the segment
+                        seekFallbacks = seekFallbacks + 1
+                        for (pendingSegment, pendingFuture) in pending:
+                            pendingFuture.cancel()
+                        pending.clear()
+                        for results in VideoManager.HELPER_readRestOfVideo(executor, path, start, settings):
+                            processedFrames = processedFrames + VideoManager.HELPER_writeSegmentResults(sinks, results)
+                            processedSegments = processedSegments + 1
+                        break
+
+                    processedFrames = processedFrames + VideoManager.HELPER_writeSegmentResults(sinks, results)
+                    if len(results) > 0:
+                        processedSegments = processedSegments + 1
+
+                    # a segment ending before its last frame ended the video, the segments after it have no frames to stitch
+                    if end is None or len(results) < end - start:
+                        break
+            finally:
+                for (segment, future) in pending:
+                    future.cancel()
+                for sink in sinks:
+                    sink.close()
+
+        seconds = time.monotonic() - startTime
+        return {"frames": processedFrames, "segments": processedSegments, "seekFallbacks": seekFallbacks, "seconds": seconds,
+                "fps": processedFrames / seconds if seconds > 0 else 0}
+
+
+
+    @staticmethod
+    def HELPER_writeSegmentResults(sinks, results):
+        """
+        Send the frames of a segment to the sinks.
+            :param sinks: the list of sink objects
+            :param results: list of (frameNumber, faces, annotated frame or None) of the frames of the segment
+            :return the number of frames sent
+        """
+        for (frameNumber, faces, frame) in results:
+            for sink in sinks:
+                sink.write(frameNumber, faces, frame)
+        return len(results)
+
+
+
+    @staticmethod
+    def HELPER_readRestOfVideo(executor, path, start, settings):
+        """
+        Read the video from a frame until it ends on a single processFileSegments worker, without seeking. The worker sends the frames back
+        segmentLength frames at a time through a queue holding at most HARDCODED_fallbackQueueSize of them, so it waits for them to be stitched 
+        instead of keeping the rest of the video in memory.
+            :param executor: the ProcessPoolExecutor of processFileSegments
+            :param path: the path to the video file
+            :param start: the number of the first frame to read
+            :param settings: dictionary with the parameters of HELPER_processSegment
+            :return a generator of lists of (frameNumber, faces, annotated frame or None), in order
+        """
+        with multiprocessing.Manager() as manager:
+            chunks = manager.Queue(VideoManager.HARDCODED_fallbackQueueSize)
+            future = executor.submit(VideoManager.HELPER_processSegment, path, start, None, settings, False, chunks)
+            while True:
+                try:
+                    results = chunks.get(timeout = 1)
+                except queue.Empty:
+                    # the worker puts None once it's done, even when it fails, unless its process died
+                    if future.done():
+                        break
+                    continue
+                if results is None:
+                    break
+                yield results
+            # raise what made the worker stop early
+            future.result()
+
+
+
+    @staticmethod
+    def HELPER_initSegmentWorker():
+        """
+        Set up a processFileSegments worker process.
+        """
+        # the worker processes already run in parallel, OpenCV's own threads would only compete with the other workers
+        cv.setNumThreads(1)
+
+
+
+    @staticmethod
+    def HELPER_seekTo(video, frameNumber):
+        """
+        Move a video to a frame and check that it got there. Most backends seek to the keyframe before the frame and decode up to it, but the position
+        after the seek isn't always the frame asked for.
+            :param video: the cv.VideoCapture object
+            :param frameNumber: the number of the next frame to read
+            :return True if the seek landed on the frame, False if it missed
+        """
+        if frameNumber == 0:
+            return True
+
+        video.set(cv.CAP_PROP_POS_FRAMES, frameNumber)
+        return int(video.get(cv.CAP_PROP_POS_FRAMES)) == frameNumber
+
+
+
+    @staticmethod
+    def HELPER_processSegment(path, start, end, settings, seek = True, chunks = None):
+        """
+        Decode and track the faces of a segment of a video in a processFileSegments worker.
+            :param path: the path to the video file
+            :param start: the number of the first frame of the segment
+            :param end: the number of the frame after the segment, None to read until the video ends
+            :param settings: dictionary with the every, angles, scaleFactor, minNeighbors, mergeStrategy, visual and segmentLength parameters of 
+            processFileSegments
+            :param seek: True to seek to the first frame of the segment, False to read the video from its start up to it
+            :param chunks: a queue to put the frames in segmentLength frames at a time as they are tracked, followed by None once the segment is over 
+            (even if it fails), None to return all of them at once
+            :return a 2-tuple with the first element being a list of (frameNumber, faces, annotated frame or None) of the frames of the segment, the faces
+            being in the coordinates of the original frame, shorter than the segment if the video ended in it, and the second element False if the seek
+            to the segment missed its first frame or the video was found at another frame than expected in the segment (the list is then empty), True 
+            otherwise
+        """
+        try:
+            return VideoManager.HELPER_trackSegment(VideoManager(0, path), start, end, settings, seek, chunks)
+        finally:
+            if chunks is not None:
+                chunks.put(None)
+
+
+
+    @staticmethod
+    def HELPER_trackSegment(videoManager, start, end, settings, seek, chunks):
+        """
+        Decode and track the faces of a segment of a video, see HELPER_processSegment.
+            :param videoManager: the VideoManager object of the video
+            :param start: the number of the first frame of the segment
+            :param end: the number of the frame after the segment, None to read until the video ends
+            :param settings: dictionary with the parameters of processFileSegments
+            :param seek: True to seek to the first frame of the segment, False to read the video from its start up to it
+            :param chunks: a queue to put the frames in segmentLength frames at a time, None to return all of them at once
+            :return the 2-tuple of HELPER_processSegment
+        """
+        video = videoManager.video
+        if seek:
+            if not VideoManager.HELPER_seekTo(video, start):
+                # a seek past the end of the video misses too, the segment is then empty
+                pastEnd = not video.grab()
+                video.release()
+                return ([], pastEnd)
+        else:
+            # the skipped frames are only grabbed, not converted
+            for i in range(start):
+                if not video.grab():
+                    video.release()
+                    return ([], True)
+
+        results = []
+        frameNumber = start
+        while end is None or frameNumber < end:
+            # a segment read from the wrong frame would shift all its faces, the video can't be seeked reliably then (read from its start, the frames
+            # are counted as they are read)
+            if seek and int(video.get(cv.CAP_PROP_POS_FRAMES)) != frameNumber:
+                video.release()
+                return ([], False)
+            ret, frame = video.read()
+            if not ret:
+                break
+
+            # the faces are found and tracked in the same resized frames as the display methods
+            min500frame = resizeMinTo500(frame)
+            if (frameNumber - start) % settings["every"] == 0:
+                faces = ImageManager(min500frame).findFacesCounterClockwiseMultipleAngles(settings["angles"], settings["scaleFactor"],
+                    settings["minNeighbors"], settings["mergeStrategy"])
+                videoManager.faces = [[face, 0] for face in faces]
+            else:
+                videoManager.HELPER_updateFaceLocations(min500frame)
+
+            faces = VideoManager.HELPER_scaleFacesToFrame([face for (face, faceNotFoundCount) in videoManager.faces], min500frame, frame)
+
+            if settings["visual"]:
+                for face in faces:
+                    face.draw(frame, (255, 255, 255), 2)
+            results.append((frameNumber, faces, frame if settings["visual"] else None))
+            frameNumber = frameNumber + 1
+
+            if chunks is not None and len(results) == settings["segmentLength"]:
+                chunks.put(results)
+                results = []
+
+        video.release()
+        if chunks is not None:
+            if len(results) > 0:
+                chunks.put(results)
+            return ([], True)
+        return (results, True)
+
+
+
+    @staticmethod
+    def HELPER_scaleFacesToFrame(faces, resizedFrame, frame):
+        """
+        Scale the faces found in a resized frame back to the coordinates of the original frame.
+            :param faces: the list of DetectedFace objects found in resizedFrame, left unchanged
+            :param resizedFrame: the resized frame the faces were found in
+            :param frame: the original frame
+            :return the list of scaled copies of the faces
+        """
+        resizedToFrame = Transform.scaling(min(frame.shape[:2]) / min(resizedFrame.shape[:2]))
+        scaledFaces = []
+        for face in faces:
+            face = face.copy()
+            face.transformArea(resizedToFrame)
+            # a pair of eyes can be shared by more than one face
+            if face.leftEye is not None:
+                face.leftEye = face.leftEye.copy()
+                face.leftEye.transformArea(resizedToFrame)
+            if face.rightEye is not None:
+                face.rightEye = face.rightEye.copy()
+                face.rightEye.transformArea(resizedToFrame)
+            scaledFaces.append(face)
+        return scaledFaces
+
+
+
+    def HELPER_resetTracking(self):
+        """
+        Forget the faces tracked, for a new video or a new run of the tracking.
+        """
+        # faces is the list of [face, faceNotFoundCount] of the faces tracked, faceNotFoundCount being the number of frames in a row the face wasn't found in
+        self.faces = []
+        # shadowFaces store the faces detected by macro facial detection, which lags 2-6 frames behind
+        self.shadowFaces = []
+        # macroOutputQueue gets the faces found by the macro facial detection thread
+        self.macroOutputQueue = queue.Queue()
+        self.macroDetectionThread = threading.Thread()
+
+
+
+    def HELPER_trackFaces(self, frame, frameTimeInterval):
+        """
+        Track the faces in the next frame of the video. If the previous macro facial detection (ImageManager.findFaces, on a seperate thread) finished,
+        the new faces it found are added to the faces tracked and the next one is started on this frame. Otherwise every face tracked is searched
+        for around its last location (micro facial detection), and dropped once it wasn't found in faceNotFoundCountLimit frames in a row.
+            :param frame: the frame, resized the way the previous frames were
+            :param frameTimeInterval: the frame time of the video in seconds, the macro facial detection gets macroDetectionFrameBudget of them
+            :return the list of DetectedFace objects tracked
+        """
+        if not self.macroDetectionThread.is_alive():
+            # --- MACRO FACIAL DETECTION SECTION --- MACRO FACIAL DETECTION SECTION --- MACRO FACIAL DETECTION SECTION --- MACRO FACIAL DETECTION SECTION --- MACRO FACIAL DETECTION SECTION --- #
+
+            # delayDetectedFaces is the array that store detectedArea objs returned by previously called findFaces function. 
+            # These objs dont represent the current faces, but faces found in 2-6 frames previously when the function was called
+            delayDetectedFaces = []
+            # getting the most recent thoroughly detected faces' positions
+            if not self.macroOutputQueue.empty():
+                delayDetectedFaces = self.macroOutputQueue.get()
+
+            # Merging the macro facial detection into the micro facial detection list
+            if len(self.shadowFaces) == 0:
+                self.shadowFaces = delayDetectedFaces
+                for shadowFace in self.shadowFaces:
+                    self.faces.append([shadowFace.copy(), 0])
+            elif len(delayDetectedFaces) != 0:
+
+                # check if there's a new face detected by macro facial detection, if the face returned by macro facial detection has already exists then drop it
+                shadowIndex = SpatialIndex()
+                for shadowFace in self.shadowFaces:
+                    shadowIndex.insert(shadowFace)
+                delayDetectedFaces = [delayFace for delayFace in delayDetectedFaces if shadowIndex.findDuplicate(delayFace, self.HARDCODED_similarSizeScale) is None]
+
+                # if there are faces that haven't been detected then add them to the faces tracked
+                for newFace in delayDetectedFaces:
+                    self.faces.append([newFace, 0])
+
+            # Run the next macro facial detection (my implementation) in a seperate thread to avoid interfering with updating new frames
+            frameMgnr = ImageManager(frame)
+            args = [(45, 0, -45), 1.1, 10, self.HARDCODED_macroDetectionFrameBudget * frameTimeInterval * 1000]
+            self.macroDetectionThread = threading.Thread(target = self.HELPER_findFaces_to_outputQueue, args= [frameMgnr, args, self.macroOutputQueue])
+            self.macroDetectionThread.start()
+
+            # update the shadowFaces list for when the thread finished running
+            for (currentFace, faceNotFoundCount) in self.faces:
+                self.shadowFaces.append(currentFace.copy())
+
+        else:
+            # --- MICRO FACIAL DETECTION SECTION --- MICRO FACIAL DETECTION SECTION --- MICRO FACIAL DETECTION SECTION --- MICRO FACIAL DETECTION SECTION --- MICRO FACIAL DETECTION SECTION --- #
+
+            self.HELPER_updateFaceLocations(frame)
+
+        return [face for (face, faceNotFoundCount) in self.faces]
+
+
+
+    def HELPER_updateFaceLocations(self, frame):
+        """
+        Update the faces tracked (self.faces) by searching for them around their locations in the last frame (micro facial detection). A face stays
+        where it was last found until it's missing from faceNotFoundCountLimit frames in a row, then it's dropped.
+            :param frame: the frame, resized the way the previous frames were
+        """
+        # updating the detected faces in the last frame by searching around their area
+        index = 0
+        while index < len(self.faces):
+            updatedFace = self.HELPER_updateFaceLocation(frame, self.faces[index][0])
+            if updatedFace is None:
+                self.faces[index][1] = self.faces[index][1] + 1
+                if self.faces[index][1] >= self.HARDCODED_faceNotFoundCountLimit:
+                    self.faces.pop(index)
+                    continue
+            else:
+                # update the face's location and reset faceNotFoundCount value to 0
+                self.faces[index] = [updatedFace, 0]
+            index = index + 1
+
+
+
+    def HELPER_updateFaceLocation(self, frame, face):
+        """
+        Search for a face around its location in the last frame with the basic haarcascade facial detection, then look for its pair of eyes to update
+        its angle.
+            :param frame: the frame to search the face in
+            :param face: the DetectedFace object of the face in the last frame
+            :return the DetectedFace object of the face in this frame, None if it wasn't found
+        """
+        dimensions = face.dimensions
+        counterClockwiseAngle = face.counterClockwiseAngle
+        faceCenter = Point(face.center.x, face.center.y)
+
+        
+        # Cut the region of the potential face out of the frame, rotated clockwise because the face's angle is the counter clockwise angle 
+        # of the right eye to the left eye
+        searchingDimensions = (dimensions[0] * self.HARDCODED_updateFaceLocationSearchMultiplier, dimensions[1] * self.HARDCODED_updateFaceLocationSearchMultiplier)
+        (croppedPotentialFace, cropToFrame) = extractRotatedPatch(frame, faceCenter, counterClockwiseAngle, searchingDimensions)
+
+        # gray scale the image
+        grayCroppedPotentialFace = cv.cvtColor(croppedPotentialFace, cv.COLOR_BGR2GRAY)
+        # run basic haarcascade facial detection on it
+        # CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ? CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ? CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ?
+        detectedFaces = haarcascade_FacialDetection(grayCroppedPotentialFace, 1.2, 6)
+        
+
+        # if found nothing then the face wasn't found around its last location
+        if len(detectedFaces) == 0:
+            return None
+
+        # if found anything, then convert the rectangle coordinates received from detectMultiScale function to a detectedFace obj.
+        biggestFace = detectedFaces[0]
+        for i in range(1, len(detectedFaces)):
+            # comparing the dimensions (width only, cause if width is > then height is also >) among all the faces found. 
+            if biggestFace[2] < detectedFaces[i][2]:
+                biggestFace = detectedFaces[i]
+        
+        # Creating DetectedFace obj representing the biggest face found in the potential region above
+        biggestFace = DetectedFace((biggestFace[0], biggestFace[1]), (biggestFace[2], biggestFace[3]))
+
+        # Finding biggestFace's angle
+        # CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ? CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ? CAN IMPROVE PERFORMANCE BY ADDING APPROPRIATE MINSIZE AND MAXSIZE ?
+        
+        # find the eyes
+        tempEyesArray = haarcascade_EyeDetection(grayCroppedPotentialFace, 1.2, 10)
+        detectedEyes = []
+
+        if face.leftEye != None:
+            referenceEye = face.leftEye
+        elif face.rightEye != None:
+            referenceEye = face.rightEye 
+        else:
+            faceUpperLeftPoint = biggestFace.upperLeft
+            # if the face has no eyes found, then create a standard reference eye
+            # HARDCODED ___ Eye's width is usually at most 3/8 of face's width. Eye's height is usually at most 1/3 of face's height
+            referenceEye = DetectedArea((faceUpperLeftPoint.x + biggestFace.dimensions[0]/8, faceUpperLeftPoint.y + biggestFace.dimensions[1]/6), (biggestFace.dimensions[0]* 3/ 8, biggestFace.dimensions[1]/3) )
+
+        for (x, y, w, h)in tempEyesArray:
+            eye = DetectedArea((x, y), (w, h))
+            # If the shape and size of the eye found in the image is approximately the same as the reference eye
+            if eye.similarSize(referenceEye, self.HARDCODED_similarSizeScale):
+                detectedEyes.append(eye)
+        
+        # find the pairs of eyes
+        if len(detectedEyes) > 1:
+            # This might be slightlyyyyy overkill but usually there's like at most 2-3 eyes so it wont be too computationally heavy.
+            for i in range(len(detectedEyes)):
+                j = i + 1
+                for j in range(len(detectedEyes)):
+                    if detectedEyes[i].appropriateDistanceTo(detectedEyes[j], self.HARDCODED_pairOfEyesDistanceRange[0], self.HARDCODED_pairOfEyesDistanceRange[1]):
+                        leftEye = detectedEyes[i]
+                        rightEye = detectedEyes[j]
+                        if detectedEyes[i].center.x > detectedEyes[j].center.x:
+                            leftEye = detectedEyes[j]
+                            rightEye = detectedEyes[i]
+                        # if the distance of LeftEye's center to face's upperLeft Point ~ that of RightEye's center to face's upperRight Point
+                        # and distance of LeftEye's center to face's lowerLeft Point ~ that of RightEye's center to face's lowerRight Point
+                        # then this is probably the right pair of eyes
+                        upperLeftDist = leftEye.center.distTo(biggestFace.upperLeft)
+                        upperRightDist = rightEye.center.distTo(biggestFace.upperRight)
+                        lowerLeftDist = leftEye.center.distTo(biggestFace.lowerLeft)
+                        lowerRightDist = rightEye.center.distTo(biggestFace.lowerRight)
+                        criterias = 0
+                        if upperLeftDist < upperRightDist and upperLeftDist > upperRightDist * self.HARDCODED_distanceVariation_EyeToCorners_MinOfMax:
+                            criterias = criterias + 1
+                        if upperRightDist <= upperLeftDist and upperRightDist > upperLeftDist * self.HARDCODED_distanceVariation_EyeToCorners_MinOfMax:
+                            criterias = criterias + 1
+                        if lowerLeftDist < lowerRightDist and lowerLeftDist > lowerRightDist * self.HARDCODED_distanceVariation_EyeToCorners_MinOfMax:
+                            criterias = criterias + 1
+                        if lowerRightDist <= lowerLeftDist and lowerRightDist > lowerLeftDist * self.HARDCODED_distanceVariation_EyeToCorners_MinOfMax:
+                            criterias = criterias + 1
+                        if criterias == 2:
+                            biggestFace.leftEye = leftEye
+                            biggestFace.rightEye = rightEye
+                            break
+
+        # find the face's angle using the pair of eyes
+        if biggestFace.leftEye != None and biggestFace.rightEye != None:
+            # calculate teh relative angle created by the two eyes
+            relativeCounterClockwiseAngle = biggestFace.leftEye.center.relativeCounterClockwiseAngle(biggestFace.rightEye.center)
+            # the face's current angle is the already rotated angle pre-haarcascade detection + the relative angle
+            biggestFace.counterClockwiseAngle = counterClockwiseAngle + relativeCounterClockwiseAngle
+            # turn the face by the relative angle then return the face's coordinates to the original frame
+            biggestFace.transformArea(Transform.rotationCounterClockwise(biggestFace.center, relativeCounterClockwiseAngle).then(cropToFrame))
+        else:
+            # if there's not a pair of eyes then the face's angle = the previous face that was detected in the same area's angle
+            biggestFace.counterClockwiseAngle = counterClockwiseAngle
+            # Returning the face's coordinates to the original frame
+            biggestFace.transformArea(cropToFrame)
+
+        return biggestFace
+
+
+
+
+    def HELPER_startCapture(self):
+        """
+        Start reading the frames of the video on a capture thread, the display methods read the frames from self.capture.
+        """
+        self.capture = FrameCapture(self.video, self.captureBufferSize, self.dropPolicy, lateAfter = 1/self.videoFps).start()
+        self.scheduler = None
+
+
+
+    def HELPER_stopCapture(self):
+        """
+        Stop the capture thread.
+            :return a dict with the stats of the capture (see FrameCapture.stats) and of the scheduler (see FrameScheduler.stats, None if the frames
+            weren't paced)
+        """
+        self.capture.stop()
+        return {"capture": self.capture.stats(), "scheduler": None if self.scheduler is None else self.scheduler.stats()}
+
+
+
+    def HELPER_printCaptureStats(self, stats):
+        """
+        Print how many frames were dropped or displayed late, for the debug output of the display methods.
+            :param stats: the dict returned by HELPER_stopCapture
+        """
+        captureStats = stats["capture"]
+        print(f"DEBUG Frames captured {captureStats['captured']} read {captureStats['read']} dropped {captureStats['dropped']} late {captureStats['late']}")
+        schedulerStats = stats["scheduler"]
+        if schedulerStats is not None:
+            print(f"DEBUG Frames scheduled {schedulerStats['frames']} skipped {schedulerStats['skipped']} jitter mean {schedulerStats['meanJitterMs']:0.2f}ms "
+                  f"std {schedulerStats['stdJitterMs']:0.2f}ms max {schedulerStats['maxJitterMs']:0.2f}ms")
+
+
+
+    def HELPER_nextFrame(self):
+        """
+        Sleep until it's time for the next frame to be drawn, then read it from the capture. The frames whose display time the scheduler skipped are
+        read and dropped, unless the capture already keeps only the latest frame.
+            :return a 2-tuple (True, frame), or (False, None) when the video ended
+        """
+        skipped = self.scheduler.wait()
+        if self.capture.dropPolicy != "latest":
+            for i in range(skipped):
+                self.capture.read(timeout = None if self.capture.dropPolicy == "block" else 0)
+        return self.capture.read()
+
+
+
+    def HELPER_findFaces_to_outputQueue(self, frameManager, arguments, outputQueue):
         """
         Help multithreading a function by being a dummy function which only purpose is to call the threadedly-desired? function and save its output into the
         argument queue instead of returning it.
-            :param function: the function that needs to be multithreaded
-            :param arguments: a list of function's arguments []
-            :param outputQueue: the queue that stores the function output
+            :param frameManager: the ImageManager of the frame to find faces in
+            :param arguments: a list of findFaces' arguments [angles, scaleFactor, minNeighbors, deadlineMs]
+            :param outputQueue: the queue that stores the faces found, whether or not the detection ran out of time
         """
-        outputQueue.put(frameManager.findFacesCounterClockwiseMultipleAngles(arguments[0], arguments[1], arguments[2]))
+        (faces, complete) = frameManager.findFaces(arguments[1], arguments[2], arguments[0], arguments[3])
+        outputQueue.put(faces)
 
 
     
\ No newline at end of file
@@ -1,6 +1,8 @@
 import math
+from functools import lru_cache
 import cv2 as cv
 import numpy as np
+from Transform import Transform
 
 haar_cascasde_eye = cv.CascadeClassifier("classifier/haarcascade_eye.xml")
 haar_cascasde_nose = cv.CascadeClassifier("classifier/haarcascade_nose.xml")
@@ -40,28 +42,95 @@ def haarcascade_EyeDetection(image, scaleFactor, minNeighbors, minSize = None, m
 
 
 # Rotation
-def rotateClockwise(img, angle):
+def rotateClockwise(img, angle, allowView = False):
     """
     This functions return a clockwise rotated image without cropping any part of the original image and keeping the center of the original 
     image at the center of the new rotated image. The returned image may have larger dimensions than the original but as small as possible.
         :param img: the original image
         :param angle: the rotating angle clockwise
+        :param allowView: if True, right angle rotations may return a strided view sharing memory with img instead of a new image
         :return: the rotated-around-the-center image without cropping
     """
     angle = -angle
-    return rotateCounterClockwise(img, angle)
+    return rotateCounterClockwise(img, angle, allowView)
 
 
-def rotateCounterClockwise(img, angle):
+def rotateCounterClockwise(img, angle, allowView = False):
     """
     This functions return a counter-clockwise rotated image without cropping any part of the original image and keeping the center of the original 
     image at the center of the new rotated image. The returned image may have larger dimensions than the original but as small as possible.
         :param img: the original image
         :param angle: the rotating angle counter-clockwise
+        :param allowView: if True, right angle rotations may return a strided view sharing memory with img instead of a new image
         :return: the rotated-around-the-center image without cropping
     """
+    angle = angle % 360
+
+    # Right angles are just a reordering of the pixels, no need to interpolate anything
+    if angle % 90 == 0:
+        return rotateRightAngleCounterClockwise(img, angle, allowView)
+
     (height, width) = img.shape[:2]
+    (rotMat, fittingDimensions) = rotationMatrixCounterClockwise(height, width, angle)
+
+    # Warp straight from the source into the fitted output, the translation part of rotMat already moves the source center to the output center
+    return cv.warpAffine(img, rotMat, fittingDimensions)
+
+
+def rotateRightAngleCounterClockwise(img, angle, allowView = False):
+    """
+    Rotate the image counter-clockwise by a multiple of 90 degree. This is pixel-exact: the pixels are only moved around (transpose + flip), never interpolated.
+        :param img: the original image
+        :param angle: the rotating angle counter-clockwise, must be a multiple of 90
+        :param allowView: if True, return a strided numpy view sharing memory with img (no pixel is copied). Only use this when the consumer 
+        doesn't write into the returned image (detectMultiScale, cvtColor, ...). Otherwise, return a new contiguous image
+        :return: the rotated image
+    """
+    quarterTurns = (angle % 360) // 90
+
+    if allowView:
+        return np.rot90(img, quarterTurns)
+
+    if quarterTurns == 0:
+        return img.copy()
+    if quarterTurns == 1:
+        return cv.rotate(img, cv.ROTATE_90_COUNTERCLOCKWISE)
+    if quarterTurns == 2:
+        return cv.rotate(img, cv.ROTATE_180)
+    return cv.rotate(img, cv.ROTATE_90_CLOCKWISE)
+
+
+@lru_cache(maxsize = 256)
+def rotationMatrixCounterClockwise(height, width, angle):
+    """
+    Calculate (and cache) the affine matrix and the fitted output dimensions used to rotate a (height x width) image counter-clockwise around its center
+    without cropping. Videos keep calling this with the same frame shape and the same few angles, so everything here is only computed once per
+    (height, width, angle). The matrix does not depend on the number of channels so it is not part of the key.
+        :param height: the height of the original image
+        :param width: the width of the original image
+        :param angle: the rotating angle counter-clockwise (between 0 and 360)
+        :return a 2-tuple with the first element being the 2x3 affine matrix mapping the original image to the rotated image, and the second element
+        the (width, height) dimensions of the rotated image. The matrix is shared between callers and must not be modified.
+    """
+    (fittingWidth, fittingHeight) = fittingDimensionsCounterClockwise(height, width, angle)
+
+    # Rotate around the center of the original image then move that center to the center of the fitted output
+    rotMat = cv.getRotationMatrix2D((width/2, height/2), angle, 1.0)
+    rotMat[0, 2] += fittingWidth/2 - width/2
+    rotMat[1, 2] += fittingHeight/2 - height/2
+    rotMat.setflags(write = False)
+
+    return (rotMat, (fittingWidth, fittingHeight))
+
 
+def fittingDimensionsCounterClockwise(height, width, angle):
+    """
+    Calculate the dimensions of the smallest canvas that can store the entire (height x width) image rotated counter-clockwise by angle without cropping.
+        :param height: the height of the original image
+        :param width: the width of the original image
+        :param angle: the rotating angle counter-clockwise
+        :return the (width, height) of the fitting canvas
+    """
     # Calculating the dimension of the new canvas to store the entire rotated image without cropping, diagAngleA is used to calculate fittingWidth, diagAngleB is for fittingHeight
     diagLen = math.sqrt(width**2 + height**2)
     diagAngleA = math.atan(width/height)
@@ -87,29 +156,34 @@ def rotateCounterClockwise(img, angle):
         fittingWidth = math.floor(math.cos(diagAngleB + tempAngle*math.pi/180 - math.pi/2) * diagLen)
         fittingHeight = math.floor(math.cos(diagAngleA + tempAngle*math.pi/180 - math.pi/2) * diagLen)
 
-    # Drawing pre rotated image ontop of bigger canvas
-    # rotatedCanvas initially takes the largest horizontal/vertical value among newWidth, newHeight, img.shape[1], img.shape[2] to prevent the image from cropping and index out of bound
-    # Once the image is rotated on rotatedCanvas, we will crop out the excess part
-    try:
-        rotatedCanvas = np.zeros((max(fittingHeight, img.shape[0]), max(fittingWidth, img.shape[1]), 3), dtype='uint8')
-        rotatedCanvas[math.floor(rotatedCanvas.shape[0]/2 - img.shape[0]/2): math.floor(rotatedCanvas.shape[0]/2 + img.shape[0]/2), math.floor(rotatedCanvas.shape[1]/2 - img.shape[1]/2): math.floor(rotatedCanvas.shape[1]/2 + img.shape[1]/2)] = img
-    except:
-        rotatedCanvas = np.zeros((max(fittingHeight, img.shape[0]), max(fittingWidth, img.shape[1])), dtype='uint8')
-        rotatedCanvas[math.floor(rotatedCanvas.shape[0]/2 - img.shape[0]/2): math.floor(rotatedCanvas.shape[0]/2 + img.shape[0]/2), math.floor(rotatedCanvas.shape[1]/2 - img.shape[1]/2): math.floor(rotatedCanvas.shape[1]/2 + img.shape[1]/2)] = img
-    # rotatedCanvas[100:200,400:500] = 0,255,0
-    # [upper height bound: lower height bound, left width bound: right width bound]
-    # cv.imshow("Test draw on cavnas before rotate", rescaleFrame(rotatedCanvas, 500))
-
-    #rotPoint (width, height)
-    rotPoint = (rotatedCanvas.shape[1]//2, rotatedCanvas.shape[0]//2)
-    
-    rotMat = cv.getRotationMatrix2D(rotPoint, angle, 1.0)
-    excessDimensions = (rotatedCanvas.shape[1], rotatedCanvas.shape[0])
-    rotatedCanvas = cv.warpAffine(rotatedCanvas, rotMat, excessDimensions)
-    # rotatedCanvas = rotatedCanvas[100:1200, 100:600]
-    # Cropping excess borders
-    rotatedCanvas = rotatedCanvas[math.floor((rotatedCanvas.shape[0] - fittingHeight)/2) : math.floor((rotatedCanvas.shape[0] + fittingHeight)/2), math.floor((rotatedCanvas.shape[1] - fittingWidth)/2) : math.floor((rotatedCanvas.shape[1] + fittingWidth)/2)]
-    return rotatedCanvas
+    return (fittingWidth, fittingHeight)
+
+
+
+
+
+# Rotated crop
+def extractRotatedPatch(img, center, angle, size):
+    """
+    Cut a (width x height) window out of the image such that the returned patch is the same as cropping the window around center out of 
+    rotateClockwise(img, angle). Only the pixels of the window are warped (with a single affine warp), so the cost scales with the window size 
+    instead of the image size. Parts of the window outside of the image are filled with black.
+        :param img: the original image
+        :param center: the Point in the original image that ends up at the center of the patch
+        :param angle: the counter clockwise angle of the window in the original image, the patch is rotated clockwise by it to straighten it up
+        :param size: (width, height) of the patch
+        :return a 2-tuple with the first element being the patch, and the second element the Transform mapping patch coordinates back to 
+        the original image coordinates
+    """
+    (width, height) = (int(size[0]), int(size[1]))
+
+    # Rotate clockwise around the window center then move the window center to the center of the patch
+    patchMat = cv.getRotationMatrix2D((center.x, center.y), -angle, 1.0)
+    patchMat[0, 2] += width/2 - center.x
+    patchMat[1, 2] += height/2 - center.y
+
+    patch = cv.warpAffine(img, patchMat, (width, height))
+    return (patch, Transform(cv.invertAffineTransform(patchMat)))
 
 
 
@@ -125,8 +199,6 @@ def resizeMinTo500(img):
     
     (height, width) = img.shape[:2]
 
-    resizedImage = img.copy()
-
     if height < width:
         width = int(width * 500/ height)
         height = 500
@@ -136,7 +208,7 @@ def resizeMinTo500(img):
         width = 500
         
     dimensions = (width, height)
-    return cv.resize(resizedImage, dimensions, interpolation= cv.INTER_LINEAR)
+    return cv.resize(img, dimensions, interpolation= cv.INTER_LINEAR)
 
 # Resize
 def resizeMinTo(img, size):
@@ -148,8 +220,6 @@ def resizeMinTo(img, size):
     size = int(size)
     (height, width) = img.shape[:2]
 
-    resizedImage = img.copy()
-
     if height < width:
         width = int(width * size/ height)
         height = size
@@ -159,7 +229,7 @@ def resizeMinTo(img, size):
         width = size
         
     dimensions = (width, height)
-    return cv.resize(resizedImage, dimensions, interpolation=cv.INTER_LINEAR)
+    return cv.resize(img, dimensions, interpolation=cv.INTER_LINEAR)
 
 
 # Resize TEST INTERPOLATION SPEED
@@ -178,8 +248,6 @@ def TEST_INTERPOLATION_TYPE_resizeMinTo(img, size, interpolationType):
     size = int(size)
     (height, width) = img.shape[:2]
 
-    resizedImage = img.copy()
-
     if height < width:
         width = int(width * size/ height)
         height = size
@@ -190,13 +258,13 @@ def TEST_INTERPOLATION_TYPE_resizeMinTo(img, size, interpolationType):
         
     dimensions = (width, height)
     if interpolationType == 0:
-        return cv.resize(resizedImage, dimensions, interpolation=cv.INTER_AREA)
+        return cv.resize(img, dimensions, interpolation=cv.INTER_AREA)
     elif interpolationType == 1:
-        return cv.resize(resizedImage, dimensions, interpolation=cv.INTER_CUBIC)
+        return cv.resize(img, dimensions, interpolation=cv.INTER_CUBIC)
     elif interpolationType == 2:
-        return cv.resize(resizedImage, dimensions, interpolation=cv.INTER_LANCZOS4)
+        return cv.resize(img, dimensions, interpolation=cv.INTER_LANCZOS4)
     elif interpolationType == 3:
-        return cv.resize(resizedImage, dimensions, interpolation=cv.INTER_NEAREST)
+        return cv.resize(img, dimensions, interpolation=cv.INTER_NEAREST)
     elif interpolationType == 4:
-        return cv.resize(resizedImage, dimensions, interpolation=cv.INTER_LINEAR)
+        return cv.resize(img, dimensions, interpolation=cv.INTER_LINEAR)
 
@@ -24,7 +24,7 @@ imgMngr = ImageManager(image)
 #     pair[1].draw(image, (0,255,0), thickness= 2)
 
 # faces_rect = imgMngr.findFacesUsingPairOfEyes(eyes_rect, 1.1, 10)
-faces_rect = imgMngr.findFaces(1.1, 10)
+(faces_rect, complete) = imgMngr.findFaces(1.1, 10)
 
 for face in faces_rect:
     face.draw(image, (0,0,255), thickness= 2)
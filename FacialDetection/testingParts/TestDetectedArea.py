@@ -0,0 +1,171 @@
+import unittest
+import numpy as np
+
+import sys
+sys.path.append('FacialDetection')
+from Point import Point
+from DetectedArea import DetectedArea, DetectedFace, DetectedAreaArray
+
+class TestDetectedAreaMethods(unittest.TestCase):
+
+
+
+    def test_lazyCorners(self):
+        area = DetectedArea((10, 20), (30, 40))
+        self.assertIsNone(area._upperLeft, "corners were built before being used")
+        self.assertEqual(25, area.radius, "radius is wrong")
+        self.assertIsNone(area._center, "computing the radius built the center")
+
+        self.assertEqual((10, 20), area.upperLeft.exportCoordinates(), "upperLeft is wrong")
+        self.assertEqual((40, 20), area.upperRight.exportCoordinates(), "upperRight is wrong")
+        self.assertEqual((40, 60), area.lowerRight.exportCoordinates(), "lowerRight is wrong")
+        self.assertEqual((10, 60), area.lowerLeft.exportCoordinates(), "lowerLeft is wrong")
+        self.assertEqual((25, 40), area.center.exportCoordinates(), "center is wrong")
+        self.assertIs(area.center, area.center, "center is rebuilt on every access")
+
+
+    def test_slots(self):
+        area = DetectedFace((10, 20), (30, 40))
+        with self.assertRaises(AttributeError):
+            area.notAnAttribute = 0
+        with self.assertRaises(AttributeError):
+            Point(0, 0).notAnAttribute = 0
+
+
+    def test_copy(self):
+        face = DetectedFace((10, 20), (30, 40), 15)
+        face.rotateAreaCounterClockwise(Point(0, 0), 30)
+        copyFace = face.copy()
+
+        self.assertEqual(face.radius, copyFace.radius, "copy lost the radius")
+        self.assertEqual(15, copyFace.counterClockwiseAngle, "copy lost the angle")
+        for name in ["upperLeft", "upperRight", "lowerLeft", "lowerRight", "center"]:
+            self.assertIsNot(getattr(face, name), getattr(copyFace, name), "copy shares " + name)
+            self.assertEqual(getattr(face, name).exportCoordinates(), getattr(copyFace, name).exportCoordinates(), "copy moved " + name)
+
+
+
+    def test_merge(self):
+        bigArea = DetectedArea((10, 20), (30, 40))
+        smallArea = DetectedArea((14, 24), (24, 32))
+        bigArea.merge(smallArea)
+        self.assertEqual(smallArea.radius, bigArea.radius, "merge did not keep the smaller area")
+        self.assertEqual(smallArea.upperLeft.exportCoordinates(), bigArea.upperLeft.exportCoordinates(), "merge did not keep the smaller area")
+
+        smallArea.merge(DetectedArea((0, 0), (100, 100)))
+        self.assertEqual(20, smallArea.radius, "merge replaced the smaller area by the bigger one")
+
+
+    def test_confidence(self):
+        face = DetectedFace((10, 20), (30, 40), 15, confidence = 2.5)
+        self.assertEqual(2.5, face.copy().confidence, "copy lost the confidence")
+
+        smallFace = DetectedFace((14, 24), (24, 32), 0, confidence = 1.0)
+        face.merge(smallFace)
+        self.assertEqual(2.5, face.confidence, "merge did not keep the best confidence")
+        smallFace.merge(DetectedFace((0, 0), (100, 100), 0, confidence = 4.0))
+        self.assertEqual(4.0, smallFace.confidence, "merge did not keep the best confidence")
+
+
+
+class TestDetectedAreaArrayMethods(unittest.TestCase):
+
+    rects = np.array([[10, 20, 30, 40], [12, 22, 28, 38], [100, 50, 10, 10], [200, 200, 60, 60]], dtype = np.int32)
+
+
+    def assertSameArea(self, expected, area, msg):
+        for name in ["upperLeft", "upperRight", "lowerLeft", "lowerRight", "center"]:
+            self.assertAlmostEqual(getattr(expected, name).x, getattr(area, name).x, 3, msg + ": " + name + " x coordinate is wrong")
+            self.assertAlmostEqual(getattr(expected, name).y, getattr(area, name).y, 3, msg + ": " + name + " y coordinate is wrong")
+
+
+    def test_fromRects(self):
+        areas = DetectedAreaArray.fromRects(self.rects)
+        self.assertEqual(4, len(areas), "number of areas is wrong")
+        self.assertIs(self.rects, areas.toRects(), "unmoved areas did not return the detectMultiScale output as is")
+
+        for (rect, area) in zip(self.rects, areas.toDetectedAreas()):
+            expected = DetectedArea((rect[0], rect[1]), (rect[2], rect[3]))
+            self.assertSameArea(expected, area, "fromRects")
+            self.assertAlmostEqual(expected.radius, area.radius, 3, "fromRects: radius is wrong")
+
+
+    def test_fromRects_empty(self):
+        # detectMultiScale returns an empty tuple when it finds nothing
+        areas = DetectedAreaArray.fromRects(())
+        self.assertEqual(0, len(areas), "number of areas is wrong")
+        self.assertEqual([], areas.toDetectedAreas(), "empty array did not convert to an empty list")
+
+
+    def test_rotateAndProject_sameAsDetectedArea(self):
+        origin = Point(50, 60)
+        newOrigin = Point(-20, 15)
+        areas = DetectedAreaArray.fromRects(self.rects)
+        areas.rotateAreaClockwise(origin, 35)
+        areas.projectArea(origin, newOrigin)
+        self.assertIsNot(self.rects, areas.toRects(), "moved areas still return the detectMultiScale output")
+        self.assertTrue(np.allclose(-35, areas.angles), "angles are wrong")
+
+        for (rect, area) in zip(self.rects, areas.toDetectedAreas()):
+            expected = DetectedArea((rect[0], rect[1]), (rect[2], rect[3]))
+            expected.rotateAreaClockwise(origin, 35)
+            expected.projectArea(origin, newOrigin)
+            self.assertSameArea(expected, area, "rotated and projected")
+
+
+    def test_comparisons_sameAsDetectedArea(self):
+        areas = DetectedAreaArray.fromRects(self.rects)
+        areaList = [DetectedArea((rect[0], rect[1]), (rect[2], rect[3])) for rect in self.rects]
+
+        overlap = areas.overlap(areas)
+        similarSize = areas.similarSize(areas, 0.5)
+        appropriateDistance = areas.appropriateDistanceTo(areas, 1.5, 3.5)
+        for i in range(len(areaList)):
+            for j in range(len(areaList)):
+                self.assertEqual(areaList[i].overlap(areaList[j]), overlap[i, j], "overlap is wrong")
+                self.assertEqual(areaList[i].similarSize(areaList[j], 0.5), similarSize[i, j], "similarSize is wrong")
+                self.assertEqual(areaList[i].appropriateDistanceTo(areaList[j], 1.5, 3.5), appropriateDistance[i, j], "appropriateDistanceTo is wrong")
+
+
+    def test_fromDetectedAreas(self):
+        areaList = [DetectedArea((rect[0], rect[1]), (rect[2], rect[3])) for rect in self.rects]
+        areas = DetectedAreaArray.fromDetectedAreas(areaList)
+
+        for (expected, area) in zip(areaList, areas):
+            self.assertSameArea(expected, area, "fromDetectedAreas")
+
+
+    def test_nonMaxSuppression(self):
+        areas = DetectedAreaArray.fromRects(self.rects)
+
+        # the first two areas are duplicates, with even scores the one found first is kept
+        kept = areas.nonMaxSuppression(0.5)
+        self.assertEqual([0, 2, 3], sorted(kept.tolist()), "kept the wrong areas")
+
+        kept = areas.nonMaxSuppression(0.5, scores = [1, 5, 0, 2])
+        self.assertEqual([1, 3, 2], kept.tolist(), "did not keep the best scored areas first")
+
+
+    def test_confidences(self):
+        areas = DetectedAreaArray.fromRects(self.rects, [1, 5, 0, 2])
+        self.assertEqual([1, 3, 2], areas.nonMaxSuppression(0.5).tolist(), "did not score the areas by confidence")
+
+        selected = DetectedAreaArray.concatenate([areas.select([3, 1]), DetectedAreaArray.fromDetectedAreas(areas.select([0]).toDetectedAreas())])
+        self.assertEqual([2, 5, 1], [area.confidence for area in selected.toDetectedAreas()], "confidences were lost")
+        self.assertIsNone(DetectedAreaArray.concatenate([areas, DetectedAreaArray.fromRects(self.rects)]).confidences, "made up confidences")
+
+
+    def test_concatenate(self):
+        areas = DetectedAreaArray.concatenate([DetectedAreaArray.fromRects(self.rects[:2]), DetectedAreaArray.fromRects(self.rects[2:])])
+        self.assertTrue(np.array_equal(self.rects, areas.toRects()), "concatenated areas are wrong")
+
+
+    def test_select(self):
+        areas = DetectedAreaArray.fromRects(self.rects).select([0, 2])
+        self.assertEqual(2, len(areas), "number of selected areas is wrong")
+        self.assertTrue(np.array_equal(self.rects[[0, 2]], areas.toRects()), "selected the wrong areas")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
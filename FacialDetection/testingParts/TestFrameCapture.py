@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import time
+
+import sys
+sys.path.append('FacialDetection')
+from FrameCapture import FrameCapture
+
+class FrameSource:
+    """
+    Stands in for a cv.VideoCapture: gives frameCount frames whose pixels are their frame number, then ends.
+    """
+    def __init__(self, frameCount):
+        self.frameCount = frameCount
+        self.frameNumber = 0
+
+    def read(self):
+        if self.frameNumber >= self.frameCount:
+            return (False, None)
+        frame = np.full((4, 4), self.frameNumber, dtype = np.uint8)
+        self.frameNumber = self.frameNumber + 1
+        return (True, frame)
+
+
+class TestFrameCaptureMethods(unittest.TestCase):
+
+    def readAll(self, capture):
+        frameNumbers = []
+        while True:
+            (ret, frame) = capture.read(timeout = 5)
+            if not ret:
+                return frameNumbers
+            frameNumbers.append(int(frame[0, 0]))
+
+
+    def waitForEnd(self, capture):
+        capture.thread.join(5)
+        self.assertTrue(capture.ended, "capture didn't reach the end of the video")
+
+
+    def test_block_readsEveryFrame(self):
+        capture = FrameCapture(FrameSource(50), 2, "block").start()
+        self.assertEqual(list(range(50)), self.readAll(capture), "frames are missing or out of order")
+        self.assertEqual({"captured": 50, "read": 50, "dropped": 0, "late": 0}, capture.stats(), "stats are wrong")
+        capture.stop()
+
+
+    def test_latest_keepsNewestFrame(self):
+        capture = FrameCapture(FrameSource(20), 4, "latest").start()
+        self.waitForEnd(capture)
+        self.assertEqual([19], self.readAll(capture), "didn't keep only the newest frame")
+        self.assertEqual({"captured": 20, "read": 1, "dropped": 19, "late": 0}, capture.stats(), "stats are wrong")
+        self.assertEqual(19, capture.lastFrameNumber, "lastFrameNumber is wrong")
+
+
+    def test_dropOldest_keepsNewestFrames(self):
+        capture = FrameCapture(FrameSource(20), 3, "dropOldest", lateAfter = 0.01).start()
+        self.waitForEnd(capture)
+        time.sleep(0.02)
+        self.assertEqual([17, 18, 19], self.readAll(capture), "didn't keep the newest frames in order")
+        self.assertEqual({"captured": 20, "read": 3, "dropped": 17, "late": 3}, capture.stats(), "stats are wrong")
+
+
+    def test_stop_unblocksCapture(self):
+        capture = FrameCapture(FrameSource(1000), 2, "block").start()
+        self.assertTrue(capture.read(timeout = 5)[0], "no frame was captured")
+        capture.stop()
+        self.assertFalse(capture.thread.is_alive(), "capture thread is still running")
+        self.assertEqual((False, None), capture.read(timeout = 0), "read a frame after stop")
+        self.assertRaises(ValueError, FrameCapture, FrameSource(1), 2, "newest")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
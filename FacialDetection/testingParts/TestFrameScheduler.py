@@ -0,0 +1,71 @@
+import unittest
+
+import sys
+sys.path.append('FacialDetection')
+from FrameScheduler import FrameScheduler
+
+class FakeClock:
+    """
+    A clock that only moves when slept on or when a frame takes time to process.
+    """
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now = self.now + seconds
+
+
+class TestFrameSchedulerMethods(unittest.TestCase):
+
+    def scheduler(self, policy, fakeClock):
+        return FrameScheduler(0.1, policy, fakeClock.clock, fakeClock.sleep).start()
+
+
+    def test_wait_sleepsUntilDisplayTime(self):
+        fakeClock = FakeClock()
+        scheduler = self.scheduler("catchUp", fakeClock)
+        for i in range(3):
+            fakeClock.now = fakeClock.now + 0.03
+            self.assertEqual(0, scheduler.wait(), "skipped a frame on time")
+        self.assertAlmostEqual(100.3, fakeClock.now, msg = "frames weren't drawn at their display times")
+        self.assertEqual(3, len(fakeClock.sleeps), "didn't sleep before every frame")
+        self.assertEqual(0, scheduler.stats()["maxJitterMs"], "frames on time have jitter")
+
+
+    def test_catchUp_drawsLateFramesRightAway(self):
+        fakeClock = FakeClock()
+        scheduler = self.scheduler("catchUp", fakeClock)
+        fakeClock.now = fakeClock.now + 0.35
+        self.assertEqual(0, scheduler.wait(), "catchUp skipped a frame")
+        # the 2 next frames are already late, they don't sleep
+        for i in range(2):
+            scheduler.wait()
+        self.assertEqual(0, len(fakeClock.sleeps), "slept while behind")
+        scheduler.wait()
+        self.assertEqual(1, len(fakeClock.sleeps), "didn't sleep once back on time")
+
+        stats = scheduler.stats()
+        self.assertEqual((4, 0), (stats["frames"], stats["skipped"]), "counters are wrong")
+        self.assertAlmostEqual(250, stats["maxJitterMs"], msg = "max jitter is wrong")
+        self.assertAlmostEqual((250 + 150 + 50) / 4, stats["meanJitterMs"], msg = "mean jitter is wrong")
+
+
+    def test_skip_skipsMissedDisplayTimes(self):
+        fakeClock = FakeClock()
+        scheduler = self.scheduler("skip", fakeClock)
+        fakeClock.now = fakeClock.now + 0.35
+        self.assertEqual(2, scheduler.wait(), "didn't skip the missed display times")
+        scheduler.wait()
+        self.assertAlmostEqual(100.4, fakeClock.now, msg = "didn't go back to the display times grid")
+        self.assertEqual(2, scheduler.stats()["skipped"], "skipped counter is wrong")
+        self.assertRaises(ValueError, FrameScheduler, 0.1, "drop")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import numpy as np
+
+import sys
+sys.path.append('FacialDetection')
+from helperFunctions import *
+from Point import Point
+
+class TestRotationMethods(unittest.TestCase):
+
+
+
+    def test_rotateCounterClockwise_dimensions(self):
+        image = np.zeros((40, 60), dtype='uint8')
+
+        for (angle, expected) in [(0, (40, 60)), (90, (60, 40)), (180, (40, 60)), (270, (60, 40)), (-90, (60, 40))]:
+            rotated = rotateCounterClockwise(image, angle)
+            self.assertEqual(expected, rotated.shape, "rotated by " + str(angle) + " degree: dimensions are wrong")
+
+        # rotating by 45 degree fits the whole image inside a (w + h)/sqrt(2) square
+        rotated = rotateCounterClockwise(image, 45)
+        self.assertEqual((70, 70), rotated.shape, "rotated by 45 degree: dimensions are wrong")
+
+
+    def test_rotateCounterClockwise_keepsChannels(self):
+        image = np.zeros((40, 60, 3), dtype='uint8')
+
+        rotated = rotateCounterClockwise(image, 30)
+        self.assertEqual(3, rotated.shape[2], "color image lost its channels")
+
+
+    def test_rotateCounterClockwise_keepsCenter(self):
+        # a bright square in the middle of the image stays in the middle of the rotated image
+        image = np.zeros((41, 61), dtype='uint8')
+        image[18:23, 28:33] = 255
+
+        for angle in [30, 45, -45, 120]:
+            rotated = rotateCounterClockwise(image, angle)
+            centerY = rotated.shape[0]//2
+            centerX = rotated.shape[1]//2
+            self.assertEqual(255, rotated[centerY, centerX], "rotated by " + str(angle) + " degree: center moved")
+
+
+    def test_rotateCounterClockwise_rightAnglesPixelExact(self):
+        image = np.arange(12, dtype='uint8').reshape((3, 4))
+
+        for (angle, quarterTurns) in [(0, 0), (90, 1), (180, 2), (270, 3), (-90, 3), (450, 1)]:
+            expected = np.rot90(image, quarterTurns)
+            rotated = rotateCounterClockwise(image, angle)
+            self.assertTrue(np.array_equal(expected, rotated), "rotated by " + str(angle) + " degree: pixels are wrong")
+            self.assertTrue(rotated.flags['C_CONTIGUOUS'], "rotated by " + str(angle) + " degree: image is not contiguous")
+
+            rotatedView = rotateCounterClockwise(image, angle, allowView = True)
+            self.assertTrue(np.array_equal(expected, rotatedView), "rotated view by " + str(angle) + " degree: pixels are wrong")
+            self.assertTrue(np.shares_memory(image, rotatedView), "rotated view by " + str(angle) + " degree: is not a view")
+
+
+    def test_rotateClockwise_rightAngleCopy(self):
+        # without allowView the caller can draw on the returned image without touching the original
+        image = np.zeros((3, 4), dtype='uint8')
+        rotated = rotateClockwise(image, 0)
+        rotated[0, 0] = 255
+        self.assertEqual(0, image[0, 0], "rotating by 0 degree did not copy the image")
+
+
+    def test_rotationMatrixCounterClockwise_cached(self):
+        first = rotationMatrixCounterClockwise(40, 60, 45)
+        second = rotationMatrixCounterClockwise(40, 60, 45)
+        self.assertIs(first[0], second[0], "rotation matrix is not cached")
+        self.assertFalse(first[0].flags.writeable, "cached rotation matrix can be modified")
+
+
+class TestExtractRotatedPatchMethods(unittest.TestCase):
+
+
+
+    def test_extractRotatedPatch_noRotation(self):
+        image = np.arange(100, dtype='uint8').reshape((10, 10))
+
+        (patch, patchToImage) = extractRotatedPatch(image, Point(5, 4), 0, (4, 6))
+        self.assertEqual((6, 4), patch.shape, "patch dimensions are wrong")
+        self.assertTrue(np.array_equal(image[1:7, 3:7], patch), "patch is not the same as the cropped window")
+
+
+    def test_extractRotatedPatch_mapsBack(self):
+        image = np.zeros((100, 120), dtype='uint8')
+        center = Point(70, 40)
+
+        for angle in [0, 30, -45, 90, 180]:
+            (patch, patchToImage) = extractRotatedPatch(image, center, angle, (20, 30))
+            
+            # the patch center is the window center in the original image
+            mappedCenter = patchToImage.applyToPoint(Point(patch.shape[1]/2, patch.shape[0]/2))
+            self.assertAlmostEqual(center.x, mappedCenter.x, 8, "rotated by " + str(angle) + " degree: x coordinate is wrong")
+            self.assertAlmostEqual(center.y, mappedCenter.y, 8, "rotated by " + str(angle) + " degree: y coordinate is wrong")
+
+            # the patch is straightened up, so going up in the patch is going up in the counter-clockwise rotated window
+            mappedTop = patchToImage.applyToPoint(Point(patch.shape[1]/2, patch.shape[0]/2 - 10))
+            expectedTop = Point(center.x, center.y - 10).rotatePointCounterClockwise(center, angle)
+            self.assertAlmostEqual(expectedTop.x, mappedTop.x, 8, "rotated by " + str(angle) + " degree: x coordinate is wrong")
+            self.assertAlmostEqual(expectedTop.y, mappedTop.y, 8, "rotated by " + str(angle) + " degree: y coordinate is wrong")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
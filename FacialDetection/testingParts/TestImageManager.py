@@ -0,0 +1,404 @@
+import unittest
+import random
+import numpy as np
+import cv2 as cv
+import threading
+
+import sys
+sys.path.append('FacialDetection')
+from DetectedArea import DetectedArea, DetectedAreaArray
+from ImageManager import ImageManager
+from Point import Point
+from Transform import Transform
+from helperFunctions import resizeMinTo, extractRotatedPatch
+
+class TestImageManagerMethods(unittest.TestCase):
+
+
+
+    def randomEyes(self, seed, number):
+        generator = random.Random(seed)
+        eyes = []
+        for i in range(number):
+            size = generator.uniform(8, 30)
+            eyes.append(DetectedArea((generator.uniform(0, 400), generator.uniform(0, 400)), (size, size)))
+        return eyes
+
+
+    def test_pairEyes_sameAsBruteForce(self):
+        imgMngr = ImageManager(np.zeros((400, 400, 3), dtype='uint8'))
+        eyes = self.randomEyes(0, 200)
+
+        expected = set()
+        for i in range(len(eyes)):
+            for j in range(i + 1, len(eyes)):
+                if eyes[i].similarSize(eyes[j], imgMngr.HARDCODED_similarSizeScale) and \
+                        eyes[i].appropriateDistanceTo(eyes[j], imgMngr.HARDCODED_pairOfEyesDistanceRange[0], imgMngr.HARDCODED_pairOfEyesDistanceRange[1]):
+                    expected.add(frozenset((i, j)))
+
+        pairOfEyes = imgMngr.HELPER_pairEyes(eyes)
+        found = set(frozenset((eyes.index(leftEye), eyes.index(rightEye))) for (leftEye, rightEye) in pairOfEyes)
+
+        self.assertEqual(len(found), len(pairOfEyes), "the same pair of eyes was found twice")
+        self.assertEqual(expected, found, "pairs of eyes are different from checking every pair")
+        for (leftEye, rightEye) in pairOfEyes:
+            self.assertIsNot(leftEye, rightEye, "an eye was paired with itself")
+            self.assertLessEqual(leftEye.center.x, rightEye.center.x, "the left eye is not the left-most eye")
+
+        # the same pairs, in the same order, from the matrices of a DetectedAreaArray
+        eyesArray = DetectedAreaArray.fromDetectedAreas(eyes)
+        pairOfEyes = imgMngr.HELPER_pairEyes(eyesArray.toDetectedAreas())
+        arrayPairOfEyes = imgMngr.HELPER_pairEyes(eyesArray)
+        self.assertEqual([(leftEye.exportPoints(), rightEye.exportPoints()) for (leftEye, rightEye) in pairOfEyes],
+                         [(leftEye.exportPoints(), rightEye.exportPoints()) for (leftEye, rightEye) in arrayPairOfEyes], "pairs of eyes are different for an array")
+
+
+    def test_mergeDetectedObjs_arraySameAsObjects(self):
+        imgMngr = ImageManager(np.zeros((400, 400, 3), dtype='uint8'))
+        # crowded eyes so a lot of them are merged, some more than once
+        eyes = self.randomEyes(1, 300)
+        arrays = [DetectedAreaArray.fromDetectedAreas(eyes[:150]), DetectedAreaArray.fromDetectedAreas(eyes[150:])]
+        for array in arrays:
+            array.confidences = np.arange(len(array), dtype = np.float32) % 7
+
+        expected = imgMngr.HELPER_mergeDetectedObjs([array.toDetectedAreas() for array in arrays])
+        merged = imgMngr.HELPER_mergeDetectedObjs(arrays)
+
+        self.assertIsInstance(merged, DetectedAreaArray, "arrays weren't merged as an array")
+        self.assertLess(len(merged), 300, "no eyes were merged")
+        self.assertEqual([(area.exportPoints(), area.confidence) for area in expected], [(area.exportPoints(), area.confidence) for area in merged],
+                         "merged arrays are different from the merged objects")
+
+
+    def test_workers_sameAsSequential(self):
+        image = resizeMinTo(cv.imread('FacialDetection/testingParts/testImages/people_angle.jpg'), 500)
+        sequentialFaces = ImageManager(image).findFacesCounterClockwiseMultipleAngles((45, 0, -45), 1.1, 10)
+        parallelFaces = ImageManager(image, workers = 4).findFacesCounterClockwiseMultipleAngles((45, 0, -45), 1.1, 10)
+
+        self.assertGreater(len(sequentialFaces), 0, "found no faces to compare")
+        self.assertEqual(len(sequentialFaces), len(parallelFaces), "number of faces is different with workers")
+        for (sequentialFace, parallelFace) in zip(sequentialFaces, parallelFaces):
+            self.assertEqual(sequentialFace.upperLeft.exportCoordinates(), parallelFace.upperLeft.exportCoordinates(), "face is different with workers")
+            self.assertEqual(sequentialFace.counterClockwiseAngle, parallelFace.counterClockwiseAngle, "face angle is different with workers")
+
+
+    def test_threadCascade_onePerThread(self):
+        cascades = []
+        def loadCascades():
+            cascades.append((ImageManager.HELPER_threadCascade(ImageManager.HARDCODED_eyeCascadePath), ImageManager.HELPER_threadCascade(ImageManager.HARDCODED_eyeCascadePath)))
+        thread = threading.Thread(target = loadCascades)
+        thread.start()
+        thread.join()
+        loadCascades()
+
+        self.assertIs(cascades[0][0], cascades[0][1], "the same thread loaded the classifier twice")
+        self.assertIsNot(cascades[0][0], cascades[1][0], "two threads share a classifier")
+        self.assertIsNot(ImageManager.haarcascade_eye, cascades[0][0], "a worker thread uses the shared classifier")
+
+
+    def test_shutdownExecutors(self):
+        executor = ImageManager.HELPER_executor(3)
+        self.assertIs(executor, ImageManager(np.zeros((50, 50, 3), dtype='uint8'), workers = 3).executor, "pool is not shared")
+
+        ImageManager.shutdownExecutors()
+        self.assertRaises(RuntimeError, executor.submit, len, [])
+        # the ImageManagers constructed after the shutdown get a new pool
+        newExecutor = ImageManager(np.zeros((50, 50, 3), dtype='uint8'), workers = 3).executor
+        self.assertIsNot(executor, newExecutor, "pool was not released")
+        self.assertEqual(0, newExecutor.submit(len, []).result(), "new pool does not run tasks")
+
+
+    def test_detectBatch_sameAsImageManager(self):
+        paths = ['FacialDetection/testingParts/testImages/people.jpg', 'not_an_image.jpg', 'FacialDetection/testingParts/testImages/people_angle.jpg']
+        results = list(ImageManager.detectBatch(paths, workers = 2, chunkSize = 1, maxPendingChunks = 1))
+        self.assertEqual([0, 1, 2], [index for (index, faces) in results], "results are not in order")
+        self.assertIsNone(results[1][1], "an unreadable image did not give None")
+
+        for (index, faces) in [results[0], results[2]]:
+            image = cv.imread(paths[index])
+            scale = min(image.shape[:2]) / 500
+            expectedFaces = ImageManager(resizeMinTo(image, 500)).findFacesCounterClockwiseMultipleAngles((45, 0, -45), 1.1, 10)
+            self.assertEqual(len(expectedFaces), len(faces), "number of faces is different from ImageManager")
+            for (expected, face) in zip(expectedFaces, faces):
+                self.assertAlmostEqual(expected.center.x * scale, face.center.x, 3, "face was not scaled back to the original image")
+                self.assertAlmostEqual(expected.radius * scale, face.radius, 3, "face was not scaled back to the original image")
+                self.assertAlmostEqual(expected.leftEye.radius * scale, face.leftEye.radius, 3, "eye was not scaled back to the original image")
+
+        unorderedResults = ImageManager.detectBatch(paths, workers = 2, chunkSize = 1, ordered = False)
+        self.assertEqual([0, 1, 2], sorted(index for (index, faces) in unorderedResults), "unordered results are missing images")
+
+
+    def test_rotationCache_hitsAndMisses(self):
+        imgMngr = ImageManager(np.zeros((100, 200, 3), dtype='uint8'))
+        (rotated, rotatedCenter) = imgMngr.HELPER_rotatedGrayImage(45)
+        (sameRotated, sameCenter) = imgMngr.HELPER_rotatedGrayImage(405)
+        self.assertIs(rotated, sameRotated, "the same angle was rotated twice")
+        self.assertEqual((1, 1), (imgMngr.rotationCacheHits, imgMngr.rotationCacheMisses), "hits and misses are wrong")
+
+        self.assertIsNone(imgMngr.HELPER_lookUpRotatedGrayImage(30), "found an angle that was never rotated")
+        self.assertEqual((1, 2), (imgMngr.rotationCacheHits, imgMngr.rotationCacheMisses), "hits and misses are wrong")
+
+
+    def test_rotationCache_maxBytes(self):
+        imgMngr = ImageManager(np.zeros((100, 200, 3), dtype='uint8'), rotationCacheMaxBytes = 90000)
+        imgMngr.HELPER_rotatedGrayImage(30)
+        imgMngr.HELPER_rotatedGrayImage(45)
+        imgMngr.HELPER_rotatedGrayImage(30)
+        imgMngr.HELPER_rotatedGrayImage(60)
+        self.assertEqual([30, 60], list(imgMngr.rotationCache), "did not drop the least recently used rotated image")
+        self.assertLessEqual(imgMngr.rotationCacheBytes, 90000, "cache holds more than rotationCacheMaxBytes")
+
+        # right angles are views of the image and don't count
+        imgMngr.HELPER_rotatedGrayImage(90)
+        self.assertEqual([30, 60, 90], list(imgMngr.rotationCache), "a right angle view took memory in the cache")
+
+
+    def test_cropRotatedGrayImage_sameAsExtractRotatedPatch(self):
+        image = cv.imread('FacialDetection/testingParts/testImages/people_angle.jpg')
+        imgMngr = ImageManager(resizeMinTo(image, 300))
+        (rotated, rotatedCenter) = imgMngr.HELPER_rotatedGrayImage(-30)
+
+        for center in [Point(150, 200), Point(5, 5)]:
+            (expectedPatch, expectedToImage) = extractRotatedPatch(imgMngr.grayImage, center, 30, (60, 80))
+            (patch, patchToImage) = imgMngr.HELPER_cropRotatedGrayImage(rotated, rotatedCenter, -30, center, (60, 80))
+            self.assertEqual(expectedPatch.shape, patch.shape, "patch dimensions are wrong")
+
+            # the cropped window is aligned to the pixels of the rotated image, so it is off by half a pixel at most
+            mappedCenter = patchToImage.applyToPoint(Point(30, 40))
+            self.assertLessEqual(mappedCenter.distTo(center), 1, "patch center does not map back to the window center")
+            self.assertLess(np.mean(np.abs(expectedPatch.astype(int) - patch.astype(int))), 20, "patch is different from extractRotatedPatch")
+
+
+    def pairOfEyes(self, x, y, tilt):
+        # the right eye 25 pixels away from the left eye, counter clockwise by tilt
+        rightEyeCenter = Point(x + 25, y).rotatePointCounterClockwise(Point(x, y), tilt)
+        return (DetectedArea((x - 5, y - 5), (10, 10)), DetectedArea((rightEyeCenter.x - 5, rightEyeCenter.y - 5), (10, 10)))
+
+
+    def test_verifyPairOfEyes_rotationCache(self):
+        imgMngr = ImageManager(np.zeros((500, 800, 3), dtype='uint8'))
+
+        # a pair whose rounded angle isn't cached only warps its own face window, it doesn't rotate the whole image for the cache
+        imgMngr.HELPER_verifyPairOfEyes(self.pairOfEyes(100, 100, 12), 1.1, 10, imgMngr.haarcascade_face)
+        self.assertEqual((0, 1, 0), (imgMngr.rotationCacheHits, imgMngr.rotationCacheMisses, len(imgMngr.rotationCache)), "a pair of eyes filled the cache")
+
+        # once the eye sweep rotated the image by about the same angle, the face is cropped out of it
+        imgMngr.HELPER_rotatedGrayImage(-10)
+        imgMngr.HELPER_verifyPairOfEyes(self.pairOfEyes(400, 300, 11), 1.1, 10, imgMngr.haarcascade_face)
+        self.assertEqual((1, 2, 1), (imgMngr.rotationCacheHits, imgMngr.rotationCacheMisses, len(imgMngr.rotationCache)), "cached rotation was not reused")
+
+
+    def test_rotationCache_rotationBiggerThanMaxBytes(self):
+        # a 4000 x 3000 image rotated by 25 degrees is bigger than the default rotationCacheMaxBytes on its own
+        imgMngr = ImageManager(np.zeros((3000, 4000, 3), dtype='uint8'))
+        imgMngr.HELPER_rotatedGrayImage(30)
+        self.assertEqual([], list(imgMngr.rotationCache), "kept a rotated image bigger than rotationCacheMaxBytes")
+
+        imgMngr.HELPER_rotatedGrayImage(90)
+        (rotated, rotatedCenter) = imgMngr.HELPER_rotatedGrayImage(-25)
+        self.assertGreater(rotated.nbytes, imgMngr.rotationCacheMaxBytes, "rotated image fits in the cache")
+        self.assertEqual([90], list(imgMngr.rotationCache), "a rotated image bigger than rotationCacheMaxBytes flushed the cache")
+        self.assertEqual(0, imgMngr.rotationCacheBytes, "cache bytes are wrong")
+
+        imgMngr.HELPER_verifyPairOfEyes(self.pairOfEyes(2000, 1500, 25), 1.1, 10, imgMngr.haarcascade_face)
+        self.assertEqual([90], list(imgMngr.rotationCache), "a pair of eyes changed the cache")
+
+
+    def test_proposeFaces(self):
+        imgMngr = ImageManager(np.zeros((500, 800, 3), dtype='uint8'))
+
+        # the eyes, the eyebrows above them and a pair a bit lower describe the same face, then the same place leaning the other way and another face
+        pairOfEyes = [self.pairOfEyes(100, 100, 10), self.pairOfEyes(100, 92, 12), self.pairOfEyes(101, 106, 9), self.pairOfEyes(100, 100, -60), 
+                      self.pairOfEyes(400, 300, 10)]
+        distinctPairs = imgMngr.HELPER_proposeFaces(pairOfEyes)
+        self.assertEqual([0, 3, 4], [pairOfEyes.index(pair) for pair in distinctPairs], "proposals were merged wrong")
+
+
+    def test_clusterPairsOfEyes(self):
+        imgMngr = ImageManager(np.zeros((500, 800, 3), dtype='uint8'))
+        pair = self.pairOfEyes
+
+        # two neighbours leaning the same way, the same tilt far away, and a different tilt next to them
+        pairOfEyes = [pair(100, 100, 20), pair(140, 110, 22), pair(600, 400, 21), pair(120, 180, -30)]
+        clusters = imgMngr.HELPER_clusterPairsOfEyes(pairOfEyes)
+        clusteredPairs = sorted(sorted(pairOfEyes.index(p) for p in pairs) for (window, pairs) in clusters)
+        self.assertEqual([[0, 1], [2], [3]], clusteredPairs, "pairs were clustered wrong")
+
+
+    def test_fineSweepAngles(self):
+        imgMngr = ImageManager(np.zeros((500, 800, 3), dtype='uint8'))
+        pair = self.pairOfEyes
+
+        # three faces leaning about 20 degrees, two about -32 degrees and one 60 degrees, straightened up by the opposite angles
+        pairOfEyes = [pair(100, 100, 20), pair(300, 100, -30), pair(500, 100, 22), pair(100, 300, 60), pair(300, 300, 18), pair(500, 300, -34)]
+        self.assertEqual([-20, 30, -60], imgMngr.HELPER_fineSweepAngles(pairOfEyes), "fine angles are wrong")
+        self.assertEqual([], imgMngr.HELPER_fineSweepAngles([]), "made up fine angles")
+
+
+    def test_coarseToFine_sweepStats(self):
+        image = resizeMinTo(cv.imread('FacialDetection/testingParts/testImages/people_angle.jpg'), 1000)
+        imgMngr = ImageManager(image)
+        faces = imgMngr.findFacesCoarseToFine(1.1, 10)
+        stats = imgMngr.angleSweepStats
+
+        self.assertTrue(any(abs(face.counterClockwiseAngle - -68) < 10 for face in faces), "did not find the leaning face")
+        self.assertEqual(stats["coarseCascadeWork"] + stats["fineCascadeWork"], stats["cascadeWork"], "cascade work is wrong")
+        self.assertEqual(stats["cascadeWork"], imgMngr.sweepCascadeWork, "coarse cascade work is not counted")
+        self.assertLess(len(stats["angles"]), len(ImageManager.HARDCODED_findFacesAngles), "refined too many angles")
+
+        fixedMngr = ImageManager(image)
+        fixedMngr.findPairsOfEyesCounterClockwiseMultipleAngles(ImageManager.HARDCODED_findFacesAngles, 1.1, 10)
+        self.assertLess(stats["cascadeWork"], fixedMngr.angleSweepStats["cascadeWork"], "costs more than the fixed angles")
+
+        # the eyes of a 500 pixels image are too small for the coarse image, the fixed angles are swept instead
+        imgMngr = ImageManager(resizeMinTo(image, 500))
+        imgMngr.findPairsOfEyesCoarseToFine(1.1, 10)
+        self.assertEqual(list(ImageManager.HARDCODED_findFacesAngles), imgMngr.angleSweepStats["angles"], "did not fall back to the fixed angles")
+
+
+    def test_sweepStats(self):
+        image = resizeMinTo(cv.imread('FacialDetection/testingParts/testImages/people_angle.jpg'), 500)
+        imgMngr = ImageManager(image)
+        works = []
+        for angle in (45, 0, -45):
+            imgMngr.findPairsOfEyesCounterClockwiseMultipleAngles((angle,), 1.1, 10)
+            works.append(imgMngr.angleSweepStats["cascadeWork"])
+
+        imgMngr.findPairsOfEyesCounterClockwiseMultipleAngles((45, 0, -45), 1.1, 10)
+        self.assertEqual([45, 0, -45], imgMngr.angleSweepStats["angles"], "angles are wrong")
+        self.assertEqual(sum(works), imgMngr.angleSweepStats["cascadeWork"], "cascade work is not the work of every angle")
+        self.assertEqual(2 * sum(works), imgMngr.sweepCascadeWork, "cascade work is not counted across sweeps")
+
+
+    def test_twoStage_sameFacesAsDownscaled(self):
+        image = resizeMinTo(cv.imread('FacialDetection/testingParts/testImages/people_angle.jpg'), 500)
+        expectedFaces = ImageManager(image).findFacesCounterClockwiseMultipleAngles((45, 0, -45), 1.1, 10)
+
+        bigImage = cv.resize(image, None, fx = 2, fy = 2, interpolation = cv.INTER_CUBIC)
+        imgMngr = ImageManager(bigImage, minFaceDimension = 160)
+        self.assertEqual((160, 160), imgMngr.faceMinDimensions, "face min dimensions did not scale")
+        self.assertEqual((20, 20), imgMngr.eyeMinDimensions, "eye min dimensions did not scale")
+        faces = imgMngr.findFacesTwoStage(1.1, 10, (45, 0, -45))
+
+        self.assertEqual(len(expectedFaces), len(faces), "number of faces is different from the downscaled image")
+        for (expected, face) in zip(sorted(expectedFaces, key = lambda f: f.center.x), sorted(faces, key = lambda f: f.center.x)):
+            self.assertLess(expected.center.distTo(Point(face.center.x / 2, face.center.y / 2)), expected.radius / 4, "face is different from the downscaled image")
+            self.assertAlmostEqual(2, face.radius / expected.radius, delta = 0.25, msg = "face was not found at full resolution")
+
+
+    def test_clusterPairs_sameFacesAsOneByOne(self):
+        image = resizeMinTo(cv.imread('FacialDetection/testingParts/testImages/people.jpg'), 500)
+        imgMngr = ImageManager(image)
+        pairOfEyes = imgMngr.findPairsOfEyesCounterClockwiseMultipleAngles((45, 0, -45), 1.1, 10)
+
+        facesOneByOne = imgMngr.findFacesUsingPairOfEyes(pairOfEyes, 1.1, 10)
+        invocationsOneByOne = imgMngr.pairVerificationStats["cascadeInvocations"]
+        faces = imgMngr.findFacesUsingPairOfEyes(pairOfEyes, 1.1, 10, clusterPairs = True)
+        stats = imgMngr.pairVerificationStats
+
+        self.assertEqual(len(facesOneByOne), len(faces), "number of faces is different with clustering")
+        for (expected, face) in zip(sorted(facesOneByOne, key = lambda f: f.center.x), sorted(faces, key = lambda f: f.center.x)):
+            self.assertLess(expected.center.distTo(face.center), expected.radius / 4, "face is different with clustering")
+            # the faces lean by the angle of their own pair of eyes, not the average angle of the cluster
+            self.assertAlmostEqual(expected.counterClockwiseAngle, face.counterClockwiseAngle, msg = "face angle is the cluster's angle")
+            self.assertLess(expected.upperLeft.distTo(face.upperLeft), expected.radius / 8, "face isn't leaning by its own angle")
+        self.assertGreater(stats["cascadeInvocationsSaved"], 0, "clustering saved nothing")
+        self.assertEqual(invocationsOneByOne - stats["cascadeInvocationsSaved"], stats["cascadeInvocations"], "saved invocations are wrong")
+
+
+    def test_confidence_rankingAndEarlyStop(self):
+        image = resizeMinTo(cv.imread('FacialDetection/testingParts/testImages/people.jpg'), 500)
+        imgMngr = ImageManager(image, useConfidence = True)
+        pairOfEyes = imgMngr.findPairsOfEyesCounterClockwiseMultipleAngles((45, 0, -45), 1.1, 10)
+        self.assertTrue(all(eye.confidence is not None for pair in pairOfEyes for eye in pair), "eyes have no confidence")
+
+        faces = imgMngr.findFacesUsingPairOfEyes(pairOfEyes, 1.1, 10, clusterPairs = False)
+        self.assertGreater(len(faces), 1, "found too few faces to compare")
+        self.assertTrue(all(face.confidence is not None for face in faces), "faces have no confidence")
+        pairConfidences = [imgMngr.HELPER_pairConfidence((face.leftEye, face.rightEye)) for face in faces]
+        self.assertEqual(sorted(pairConfidences, reverse = True), pairConfidences, "pairs were not verified best first")
+
+        firstFace = imgMngr.findFacesUsingPairOfEyes(pairOfEyes, 1.1, 10, clusterPairs = False, maxFaces = 1)
+        self.assertEqual(1, len(firstFace), "maxFaces was ignored")
+        self.assertEqual(faces[0].center.exportCoordinates(), firstFace[0].center.exportCoordinates(), "did not keep the most confident pair's face")
+        self.assertEqual(1, imgMngr.pairVerificationStats["cascadeInvocations"], "kept verifying after maxFaces faces")
+
+        self.assertEqual([], imgMngr.findFacesUsingPairOfEyes(pairOfEyes, 1.1, 10, minConfidence = max(pairConfidences) + 1), "verified pairs under minConfidence")
+        self.assertEqual(0, imgMngr.pairVerificationStats["cascadeInvocations"], "verified pairs under minConfidence")
+
+        with self.assertRaises(ValueError):
+            ImageManager(image).findFacesUsingPairOfEyes(pairOfEyes, 1.1, 10, minConfidence = 1)
+
+
+    def test_findFaces_deadline(self):
+        image = resizeMinTo(cv.imread('FacialDetection/testingParts/testImages/people.jpg'), 500)
+        expectedFaces = ImageManager(image).findFacesCounterClockwiseMultipleAngles((45, 0, -45), 1.1, 10, mergeStrategy = "nms")
+
+        (faces, complete) = ImageManager(image).findFaces(1.1, 10, (45, 0, -45))
+        self.assertTrue(complete, "detection without a deadline is not complete")
+        self.assertEqual(len(expectedFaces), len(faces), "number of faces is different from findFacesCounterClockwiseMultipleAngles")
+        for (expected, face) in zip(sorted(expectedFaces, key = lambda f: f.center.x), sorted(faces, key = lambda f: f.center.x)):
+            self.assertLess(expected.center.distTo(face.center), expected.radius / 4, "face is different from findFacesCounterClockwiseMultipleAngles")
+
+        (faces, complete) = ImageManager(image).findFaces(1.1, 10, (45, 0, -45), deadlineMs = 0)
+        self.assertFalse(complete, "detection out of time is complete")
+        self.assertEqual([], faces, "found faces without time to look for them")
+
+
+    def test_findFaces_batchOfAnglesPerWorker(self):
+        image = resizeMinTo(cv.imread('FacialDetection/testingParts/testImages/people.jpg'), 500)
+        (expectedFaces, complete) = ImageManager(image).findFaces(1.1, 10, (45, 0, -45))
+
+        # with 3 workers the 3 angles are scanned together before any pair of eyes is verified
+        imgMngr = ImageManager(image, workers = 3)
+        steps = []
+        findEyes = imgMngr.HELPER_findEyesCounterClockwiseAngle
+        findFacesUsingPairOfEyes = imgMngr.findFacesUsingPairOfEyes
+        imgMngr.HELPER_findEyesCounterClockwiseAngle = lambda *args: steps.append("scan") or findEyes(*args)
+        imgMngr.findFacesUsingPairOfEyes = lambda *args, **kwargs: steps.append("verify") or findFacesUsingPairOfEyes(*args, **kwargs)
+        (faces, complete) = imgMngr.findFaces(1.1, 10, (45, 0, -45))
+
+        self.assertTrue(complete, "detection without a deadline is not complete")
+        self.assertEqual(["scan"] * 3 + ["verify"], steps, "angles weren't scanned in a single batch")
+        self.assertEqual(len(expectedFaces), len(faces), "number of faces is different from a single worker")
+        for (expected, face) in zip(sorted(expectedFaces, key = lambda f: f.center.x), sorted(faces, key = lambda f: f.center.x)):
+            self.assertLess(expected.center.distTo(face.center), expected.radius / 4, "face is different from a single worker")
+
+
+    def test_resolveOrientation_upsideDownFace(self):
+        image = resizeMinTo(cv.imread('FacialDetection/testingParts/testImages/people_angle.jpg'), 500)
+        pairOfEyes = ImageManager(image).findPairsOfEyesCounterClockwiseMultipleAngles((45, 0, -45), 1.1, 10)
+
+        # the same eyes in the image turned upside down
+        upsideDown = Transform.rotationClockwise(Point(image.shape[1]/2, image.shape[0]/2), 180)
+        upsideDownPairOfEyes = []
+        for pair in pairOfEyes:
+            upsideDownPair = (pair[0].copy(), pair[1].copy())
+            for eye in upsideDownPair:
+                eye.transformArea(upsideDown)
+            upsideDownPairOfEyes.append(upsideDownPair)
+        image = cv.rotate(image, cv.ROTATE_180)
+
+        blindMngr = ImageManager(image, resolveOrientation = False)
+        expectedFaces = blindMngr.findFacesUsingPairOfEyes(upsideDownPairOfEyes, 1.1, 10)
+        imgMngr = ImageManager(image)
+        faces = imgMngr.findFacesUsingPairOfEyes(upsideDownPairOfEyes, 1.1, 10)
+
+        self.assertEqual(1, len(faces), "number of faces is wrong")
+        self.assertEqual(expectedFaces[0].center.exportCoordinates(), faces[0].center.exportCoordinates(), "face is different with the nose classifier")
+        self.assertAlmostEqual(expectedFaces[0].counterClockwiseAngle, faces[0].counterClockwiseAngle, 3, "face angle is different with the nose classifier")
+        self.assertEqual(1, imgMngr.pairVerificationStats["orientationsResolved"], "the nose classifier did not tell the orientation")
+        self.assertLess(imgMngr.pairVerificationStats["cascadeInvocations"], blindMngr.pairVerificationStats["cascadeInvocations"], "did not save the upside down rescan")
+
+        # a nose found on the wrong side only changes which way the face window is scanned first
+        wrongMngr = ImageManager(image)
+        wrongMngr.HELPER_orientationOfFaceWindow = lambda rotatedCrop, eyeLineCenter, eyeAverageRadius: True
+        faces = wrongMngr.findFacesUsingPairOfEyes(upsideDownPairOfEyes, 1.1, 10)
+        self.assertEqual(1, len(faces), "lost the face the nose classifier got the orientation of wrong")
+        self.assertEqual(expectedFaces[0].center.exportCoordinates(), faces[0].center.exportCoordinates(), "face is different after the rescan")
+        self.assertAlmostEqual(expectedFaces[0].counterClockwiseAngle, faces[0].counterClockwiseAngle, 3, "face angle is different after the rescan")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
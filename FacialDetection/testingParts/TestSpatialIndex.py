@@ -0,0 +1,80 @@
+import unittest
+import random
+
+import sys
+sys.path.append('FacialDetection')
+from Point import Point
+from DetectedArea import DetectedArea
+from SpatialIndex import SpatialIndex
+
+class TestSpatialIndexMethods(unittest.TestCase):
+
+
+
+    def randomAreas(self, seed, number):
+        generator = random.Random(seed)
+        areas = []
+        for i in range(number):
+            size = generator.uniform(2, 60)
+            areas.append(DetectedArea((generator.uniform(0, 300), generator.uniform(0, 300)), (size, size * generator.uniform(0.8, 1.2))))
+        return areas
+
+
+    def test_query_sameAsBruteForce(self):
+        areas = self.randomAreas(0, 300)
+        index = SpatialIndex()
+        for area in areas:
+            index.insert(area)
+
+        center = Point(150, 150)
+        for (minRadius, maxRadius, minDistance, maxDistance) in [(0, 100, 0, 50), (10, 20, 0, 200), (5, 40, 30, 90), (0.5, 3, 0, 1000)]:
+            expected = [area for area in areas if minRadius <= area.radius <= maxRadius and minDistance <= area.center.distTo(center) <= maxDistance]
+            found = index.query(center, minRadius, maxRadius, maxDistance, minDistance)
+            self.assertEqual(expected, found, "query did not return the same areas as checking every area")
+
+
+    def test_findDuplicate_sameAsBruteForce(self):
+        areas = self.randomAreas(1, 400)
+        index = SpatialIndex()
+        kept = []
+        expectedKept = []
+
+        for area in areas:
+            expected = None
+            for other in expectedKept:
+                if other.similarSize(area, 0.5) and other.overlap(area):
+                    expected = other
+                    break
+            if expected is None:
+                expectedKept.append(area)
+
+            duplicate = index.findDuplicate(area, 0.5)
+            self.assertIs(expected, duplicate, "findDuplicate did not find the same duplicate as checking every area")
+            if duplicate is None:
+                kept.append(area)
+                index.insert(area)
+
+        self.assertEqual(expectedKept, kept, "kept areas are different")
+
+
+    def test_findDuplicate_condition(self):
+        first = DetectedArea((10, 10), (20, 20))
+        second = DetectedArea((11, 11), (20, 20))
+        index = SpatialIndex()
+        index.insert(first)
+        index.insert(second)
+        self.assertIs(first, index.findDuplicate(DetectedArea((10, 10), (20, 20)), 0.5), "did not find the first duplicate")
+        self.assertIs(second, index.findDuplicate(DetectedArea((10, 10), (20, 20)), 0.5, lambda other: other is not first), "condition was ignored")
+
+
+    def test_remove(self):
+        area = DetectedArea((10, 10), (20, 20))
+        index = SpatialIndex()
+        index.insert(area)
+        index.remove(area)
+        self.assertEqual([], index.query(area.center, 0, 100, 100), "removed area is still in the index")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
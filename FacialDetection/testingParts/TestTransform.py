@@ -0,0 +1,89 @@
+import unittest
+
+import sys
+sys.path.append('FacialDetection')
+from Point import Point
+from Transform import Transform
+
+class TestTransformMethods(unittest.TestCase):
+
+
+
+    def test_rotation_sameAsPoint(self):
+        origins = [Point(0, 0), Point(3, 3), Point(-2, 5)]
+        points = [Point(1, 1), Point(4, 4), Point(-7, 2), Point(0, -3)]
+
+        for angle in [0, 30, 45, 90, 135, 180, 270, -45, -225, 405]:
+            for origin in origins:
+                counterClockwise = Transform.rotationCounterClockwise(origin, angle)
+                clockwise = Transform.rotationClockwise(origin, angle)
+                for point in points:
+                    expected = point.rotatePointCounterClockwise(origin, angle)
+                    rotated = counterClockwise.applyToPoint(point)
+                    self.assertAlmostEqual(expected.x, rotated.x, 8, "Rotated by " + str(angle) + " degree counter-clockwise: x coordinate is wrong")
+                    self.assertAlmostEqual(expected.y, rotated.y, 8, "Rotated by " + str(angle) + " degree counter-clockwise: y coordinate is wrong")
+
+                    expected = point.rotatePointClockwise(origin, angle)
+                    rotated = clockwise.applyToPoint(point)
+                    self.assertAlmostEqual(expected.x, rotated.x, 8, "Rotated by " + str(angle) + " degree clockwise: x coordinate is wrong")
+                    self.assertAlmostEqual(expected.y, rotated.y, 8, "Rotated by " + str(angle) + " degree clockwise: y coordinate is wrong")
+
+
+    def test_rotation_rightAnglesExact(self):
+        rotated = Transform.rotationCounterClockwise(Point(0, 0), 90).applyToPoint(Point(1, 1))
+        self.assertEqual(1, rotated.x, "Rotated by 90 degree counter-clockwise: x coordinate is not exact")
+        self.assertEqual(-1, rotated.y, "Rotated by 90 degree counter-clockwise: y coordinate is not exact")
+
+
+    def test_projection(self):
+        projected = Transform.projection(Point(1, 2), Point(16, 2)).applyToPoint(Point(5, 5))
+        self.assertEqual(20, projected.x, "projection x is wrong")
+        self.assertEqual(5, projected.y, "projection y is wrong")
+
+
+    def test_scaling(self):
+        scaling = Transform.scaling(2.5)
+        scaled = scaling.applyToPoint(Point(4, -2))
+        self.assertEqual((10, -5), scaled.exportCoordinates(), "scaled point is wrong")
+        self.assertAlmostEqual(2.5, scaling.scale(), 8, "scale is wrong")
+        self.assertAlmostEqual(2.5, Transform.rotationCounterClockwise(Point(3, 3), 30).then(scaling).scale(), 8, "rotating changed the scale")
+
+
+    def test_then_sameAsChainedPoint(self):
+        oldOrigin = Point(10, 20)
+        newOrigin = Point(-3, 7)
+        rotatingOrigin = Point(4, 4)
+        point = Point(12, -5)
+
+        expected = point.projectPoint(oldOrigin, newOrigin).rotatePointCounterClockwise(rotatingOrigin, 37).projectPoint(newOrigin, oldOrigin)
+
+        transform = Transform.projection(oldOrigin, newOrigin).then(Transform.rotationCounterClockwise(rotatingOrigin, 37)).then(Transform.projection(newOrigin, oldOrigin))
+        transformed = transform.applyToPoint(point)
+        self.assertAlmostEqual(expected.x, transformed.x, 8, "composed transform x is wrong")
+        self.assertAlmostEqual(expected.y, transformed.y, 8, "composed transform y is wrong")
+
+
+    def test_inverse(self):
+        transform = Transform.rotationCounterClockwise(Point(3, -1), 25).then(Transform.translation(7, 2))
+        point = Point(5, 9)
+
+        restored = transform.inverse().applyToPoint(transform.applyToPoint(point))
+        self.assertAlmostEqual(point.x, restored.x, 8, "inverse x is wrong")
+        self.assertAlmostEqual(point.y, restored.y, 8, "inverse y is wrong")
+
+
+    def test_applyToPoints(self):
+        transform = Transform.rotationCounterClockwise(Point(1, 2), 60)
+        points = [Point(0, 0), Point(3, 4), Point(-5, 1)]
+
+        transformed = transform.applyToPoints([(point.x, point.y) for point in points])
+        self.assertEqual((3, 2), transformed.shape, "applyToPoints shape is wrong")
+        for (point, (x, y)) in zip(points, transformed):
+            expected = transform.applyToPoint(point)
+            self.assertAlmostEqual(expected.x, x, 8, "applyToPoints x is wrong")
+            self.assertAlmostEqual(expected.y, y, 8, "applyToPoints y is wrong")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
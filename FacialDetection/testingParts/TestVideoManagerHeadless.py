@@ -0,0 +1,259 @@
+import unittest
+import numpy as np
+import cv2 as cv
+import json
+import os
+import tempfile
+import threading
+import queue
+
+import sys
+sys.path.append('FacialDetection')
+from VideoManager import VideoManager
+from DetectedArea import DetectedFace
+from FrameSinks import CallbackSink, JsonLinesSink, VideoWriterSink, QueueSink
+from ImageManager import ImageManager
+from helperFunctions import resizeMinTo500
+
+class TestVideoManagerHeadlessMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.videoPath = os.path.join(self.directory.name, "video.avi")
+        writer = cv.VideoWriter(self.videoPath, cv.VideoWriter_fourcc(*"MJPG"), 30, (320, 240))
+        for i in range(12):
+            writer.write(np.full((240, 320, 3), i * 10, dtype = np.uint8))
+        writer.release()
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def test_runHeadless_sinks(self):
+        jsonPath = os.path.join(self.directory.name, "faces.jsonl")
+        outputPath = os.path.join(self.directory.name, "output.avi")
+        callbackFrames = []
+        queueSink = QueueSink()
+        sinks = [CallbackSink(lambda frameNumber, faces, frame: callbackFrames.append(frameNumber)), JsonLinesSink(jsonPath),
+                 VideoWriterSink(outputPath, 30, "MJPG"), queueSink]
+
+        self.assertEqual(12, VideoManager(30, self.videoPath).runHeadless(sinks), "didn't track every frame of the video")
+        self.assertEqual(list(range(12)), callbackFrames, "callback didn't get every frame in order")
+
+        with open(jsonPath) as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual(list(range(12)), [record["frame"] for record in records], "json lines are missing frames")
+        self.assertTrue(all(record["faces"] == [] for record in records), "found faces in blank frames")
+        self.assertEqual(12, queueSink.queue.qsize(), "queue is missing frames")
+
+        output = cv.VideoCapture(outputPath)
+        self.assertEqual(12, int(output.get(cv.CAP_PROP_FRAME_COUNT)), "video written is missing frames")
+        self.assertEqual((320, 240), (int(output.get(cv.CAP_PROP_FRAME_WIDTH)), int(output.get(cv.CAP_PROP_FRAME_HEIGHT))), "video written has the wrong dimensions")
+        output.release()
+
+
+    def test_runHeadless_drawsOnlyForVisualSinks(self):
+        drawn = []
+        videoManager = VideoManager(30, self.videoPath)
+        # a face that stays tracked in every frame, drawn in white on frames darker than that
+        face = DetectedFace((100, 100), (80, 80), 0)
+        videoManager.HELPER_trackFaces = lambda frame, frameTimeInterval: [face]
+
+        videoManager.runHeadless([CallbackSink(lambda frameNumber, faces, frame: drawn.append(frame.max() == 255))], 3)
+        self.assertEqual([False] * 3, drawn, "drew the faces without a visual sink")
+        drawn.clear()
+        videoManager.runHeadless([CallbackSink(lambda frameNumber, faces, frame: drawn.append(frame.max() == 255), visual = True)], 3)
+        self.assertEqual([True] * 3, drawn, "didn't draw the faces for a visual sink")
+
+
+    def test_runHeadless_facesInOriginalFrameCoordinates(self):
+        sent = []
+        videoManager = VideoManager(30, self.videoPath)
+        face = DetectedFace((100, 100), (80, 80), 0)
+        videoManager.HELPER_trackFaces = lambda frame, frameTimeInterval: [face]
+
+        # the faces are tracked in the frames resized to 500 pixels, the sinks get them in the coordinates of the original 240 pixels frames
+        videoManager.runHeadless([CallbackSink(lambda frameNumber, faces, frame: sent.append((faces[0], frame.shape)))], 1)
+        [(sentFace, shape)] = sent
+        self.assertEqual((240, 320, 3), shape, "frame isn't the original frame")
+        self.assertAlmostEqual(140 * 240 / 500, sentFace.center.x, msg = "face isn't in the coordinates of the original frame")
+        self.assertAlmostEqual(80 * 240 / 500, sentFace.dimensions[0], msg = "face isn't in the coordinates of the original frame")
+        self.assertEqual((140, 140), (face.center.x, face.center.y), "scaled the tracked face itself")
+
+
+    def test_trackFaces(self):
+        frame = resizeMinTo500(cv.imread('FacialDetection/testingParts/testImages/people.jpg'))
+        videoManager = VideoManager(30, self.videoPath)
+
+        # the first frame starts the macro facial detection, the faces it finds are tracked from the frame after it finishes
+        self.assertEqual([], videoManager.HELPER_trackFaces(frame, 10), "tracked faces before any detection")
+        videoManager.macroDetectionThread.join()
+        faces = videoManager.HELPER_trackFaces(frame, 10)
+        self.assertEqual(3, len(faces), "didn't track the faces found by the macro facial detection")
+
+        # in between macro facial detections the faces are searched for around their last locations, a macro facial detection that never ends
+        # keeps the tracking there
+        videoManager.macroDetectionThread.join()
+        macroDetectionDone = threading.Event()
+        self.addCleanup(macroDetectionDone.set)
+        videoManager.macroDetectionThread = threading.Thread(target = macroDetectionDone.wait)
+        videoManager.macroDetectionThread.start()
+
+        self.assertEqual(3, len(videoManager.HELPER_trackFaces(frame, 10)), "dropped a face missing from a single frame")
+        foundAgain = [(face, previousFace) for ((face, faceNotFoundCount), previousFace) in zip(videoManager.faces, faces) if faceNotFoundCount == 0]
+        self.assertGreaterEqual(len(foundAgain), 2, "lost faces that didn't move")
+        for (face, previousFace) in foundAgain:
+            self.assertLess(face.center.distTo(previousFace.center), previousFace.radius / 2, "face moved in the same frame")
+
+        # the faces are dropped once they are missing from faceNotFoundCountLimit frames in a row
+        blankFrame = np.zeros_like(frame)
+        for i in range(VideoManager.HARDCODED_faceNotFoundCountLimit - 1):
+            trackedFaces = videoManager.HELPER_trackFaces(blankFrame, 10)
+            self.assertTrue(all(face in trackedFaces for (face, previousFace) in foundAgain), "dropped a face before faceNotFoundCountLimit")
+        self.assertEqual([], videoManager.HELPER_trackFaces(blankFrame, 10), "kept faces missing from too many frames")
+
+
+    def peopleVideo(self, frameCount):
+        # a lossless video of the same image, so every frame has the faces the image has
+        image = resizeMinTo500(cv.imread('FacialDetection/testingParts/testImages/people.jpg'))[:, :748].copy()
+        videoPath = os.path.join(self.directory.name, "people.avi")
+        writer = cv.VideoWriter(videoPath, cv.VideoWriter_fourcc(*"MPNG"), 30, (748, 500))
+        for i in range(frameCount):
+            writer.write(image)
+        writer.release()
+        [(index, expected)] = list(ImageManager.detectBatch([image], workers = 1))
+        return (videoPath, sorted((round(face.center.x), round(face.center.y)) for face in expected))
+
+
+    def test_processFile(self):
+        (videoPath, expected) = self.peopleVideo(5)
+
+        queueSink = QueueSink()
+        stats = VideoManager.processFile(videoPath, [queueSink], every = 2, workers = 1)
+        self.assertEqual((5, 3), (stats["frames"], stats["processedFrames"]), "stats are wrong")
+        self.assertGreater(stats["fps"], 0, "fps is wrong")
+
+        results = [queueSink.queue.get() for i in range(queueSink.queue.qsize())]
+        self.assertEqual([0, 2, 4], [frameNumber for (frameNumber, faces) in results], "didn't process every other frame in order")
+        for (frameNumber, faces) in results:
+            self.assertEqual(expected, sorted((round(face.center.x), round(face.center.y)) for face in faces), "faces are different from detectBatch")
+        self.assertRaises(ValueError, VideoManager.processFile, videoPath, [], 0)
+
+
+    def test_processFileSegments(self):
+        (videoPath, expected) = self.peopleVideo(7)
+
+        # segments of 3 frames are rounded up to 4 so the detections stay every other frame: [0, 4) and [4, end)
+        queueSink = QueueSink()
+        stats = VideoManager.processFileSegments(videoPath, [queueSink], segmentLength = 3, every = 2, workers = 1)
+        self.assertEqual((7, 2, 0), (stats["frames"], stats["segments"], stats["seekFallbacks"]), "stats are wrong")
+
+        results = [queueSink.queue.get() for i in range(queueSink.queue.qsize())]
+        self.assertEqual(list(range(7)), [frameNumber for (frameNumber, faces) in results], "segments weren't stitched back in order")
+        for (frameNumber, faces) in results[::2]:
+            self.assertEqual(expected, sorted((round(face.center.x), round(face.center.y)) for face in faces), "faces are different from detectBatch")
+        for (frameNumber, faces) in results[1::2]:
+            self.assertEqual(len(expected), len(faces), "tracking lost faces in between detections")
+
+
+    def test_processFileSegments_frameCountTooHigh(self):
+        videoCapture = cv.VideoCapture
+        class FrameCountTooHigh:
+            # a video whose frame count is an overestimate, segments after the real end of the video come back short or empty
+            def __init__(self, path):
+                self.video = videoCapture(path)
+            def get(self, prop):
+                return 20 if prop == cv.CAP_PROP_FRAME_COUNT else self.video.get(prop)
+            def __getattr__(self, name):
+                return getattr(self.video, name)
+        cv.VideoCapture = FrameCountTooHigh
+        self.addCleanup(setattr, cv, "VideoCapture", videoCapture)
+
+        # the video ends in the middle of the segment [4, 8), then right at the start of the segment [8, 12)
+        for frameCount in (7, 8):
+            (videoPath, expected) = self.peopleVideo(frameCount)
+            queueSink = QueueSink()
+            stats = VideoManager.processFileSegments(videoPath, [queueSink], segmentLength = 4, every = 4, workers = 1)
+            self.assertEqual((frameCount, 2, 0), (stats["frames"], stats["segments"], stats["seekFallbacks"]), "stats are wrong")
+            results = [queueSink.queue.get() for i in range(queueSink.queue.qsize())]
+            self.assertEqual(list(range(frameCount)), [frameNumber for (frameNumber, faces) in results], "frames are wrong past the real end of the video")
+
+
+    def test_processFileSegments_readsRestOfVideoWhenPositionIsWrong(self):
+        videoCapture = cv.VideoCapture
+        class PositionWrongAt2:
+            # a video that says it is at frame 3 when it is at frame 2, the first segment finds itself on the wrong frame in the middle of it
+            def __init__(self, path):
+                self.video = videoCapture(path)
+            def get(self, prop):
+                position = self.video.get(prop)
+                return 3 if prop == cv.CAP_PROP_POS_FRAMES and position == 2 else position
+            def __getattr__(self, name):
+                return getattr(self.video, name)
+        cv.VideoCapture = PositionWrongAt2
+        self.addCleanup(setattr, cv, "VideoCapture", videoCapture)
+
+        (videoPath, expected) = self.peopleVideo(7)
+        self.assertEqual(([], False), VideoManager.HELPER_processSegment(videoPath, 0, 4, {"every": 4, "angles": (0,), "scaleFactor": 1.1,
+            "minNeighbors": 10, "mergeStrategy": "greedy", "visual": False}), "segment read from the wrong frame wasn't reported")
+
+        queueSink = QueueSink()
+        stats = VideoManager.processFileSegments(videoPath, [queueSink], segmentLength = 4, every = 4, workers = 1)
+        self.assertEqual((7, 1), (stats["frames"], stats["seekFallbacks"]), "stats are wrong")
+        results = [queueSink.queue.get() for i in range(queueSink.queue.qsize())]
+        self.assertEqual(list(range(7)), [frameNumber for (frameNumber, faces) in results], "frames are missing after the wrong frame")
+
+
+    def test_processSegment_chunks(self):
+        # the rest of the video read after a missed seek comes back segmentLength frames at a time, then None
+        chunks = queue.Queue()
+        settings = {"every": 3, "angles": (0,), "scaleFactor": 1.1, "minNeighbors": 10, "mergeStrategy": "greedy", "visual": True, "segmentLength": 3}
+        self.assertEqual(([], True), VideoManager.HELPER_processSegment(self.videoPath, 2, None, settings, False, chunks), "frames weren't sent in chunks")
+
+        frameNumbers = []
+        while True:
+            results = chunks.get_nowait()
+            if results is None:
+                break
+            self.assertLessEqual(len(results), 3, "chunk is longer than segmentLength")
+            frameNumbers.append([frameNumber for (frameNumber, faces, frame) in results])
+        self.assertEqual([[2, 3, 4], [5, 6, 7], [8, 9, 10], [11]], frameNumbers, "chunks are wrong")
+        self.assertTrue(chunks.empty(), "frames after the end of the chunks")
+
+
+    def test_seekTo(self):
+        video = cv.VideoCapture(self.videoPath)
+        self.assertTrue(VideoManager.HELPER_seekTo(video, 5), "seek didn't land on the frame")
+        self.assertEqual(5, round(video.read()[1].mean() / 10), "read the wrong frame after the seek")
+
+        class SeekMisses:
+            # a video whose seeks always land on the keyframe at frame 0
+            def set(self, prop, value):
+                pass
+            def get(self, prop):
+                return 0
+        self.assertFalse(VideoManager.HELPER_seekTo(SeekMisses(), 5), "seek that missed counted as landed")
+
+
+    def test_processFileSegments_readsRestOfVideoWhenSeekMisses(self):
+        (videoPath, expected) = self.peopleVideo(7)
+
+        # every seek misses, the first segment is read as usual and a single worker reads the rest of the video from frame 2
+        seekTo = VideoManager.HELPER_seekTo
+        VideoManager.HELPER_seekTo = staticmethod(lambda video, frameNumber: frameNumber == 0)
+        self.addCleanup(setattr, VideoManager, "HELPER_seekTo", staticmethod(seekTo))
+        queueSink = QueueSink()
+        stats = VideoManager.processFileSegments(videoPath, [queueSink], segmentLength = 2, every = 2, workers = 1)
+        self.assertEqual((7, 1), (stats["frames"], stats["seekFallbacks"]), "stats are wrong")
+
+        results = [queueSink.queue.get() for i in range(queueSink.queue.qsize())]
+        self.assertEqual(list(range(7)), [frameNumber for (frameNumber, faces) in results], "frames are missing after the seek missed")
+        for frameNumber in (0, 2, 4, 6):
+            self.assertEqual(expected, sorted((round(face.center.x), round(face.center.y)) for face in results[frameNumber][1]),
+                             "the segments don't start from a detection")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+import math
+import time
+import tracemalloc
+import cv2 as cv
+sys.path.append('FacialDetection')
+from ImageManager import ImageManager
+from DetectedArea import DetectedArea
+from Point import Point
+from helperFunctions import *
+
+"""
+Memory/throughput benchmark of the slot-based, lazily built DetectedArea on the multi-angle eye sweep.
+EagerPoint and EagerDetectedArea below are the previous dict-backed classes (every Point and the radius built in __init__), kept here only to compare against.
+Run from the root of the repo: python FacialDetection/testingParts/benchmarkDetectedArea.py
+"""
+
+
+class EagerPoint:
+    def __init__(self, xCoord, yCoord):
+        self.x = xCoord
+        self.y = yCoord
+
+    def distTo(self, otherPoint):
+        return math.sqrt((self.x - otherPoint.x)**2 + (self.y - otherPoint.y)**2)
+
+
+class EagerDetectedArea:
+    def __init__(self, upperLeftPoint = (0,0), dimensions = (0,0)):
+        self.dimensions = dimensions
+        self.upperLeft = EagerPoint(upperLeftPoint[0], upperLeftPoint[1])
+        self.upperRight = EagerPoint(upperLeftPoint[0] + dimensions[0], upperLeftPoint[1])
+        self.lowerRight = EagerPoint(upperLeftPoint[0] + dimensions[0], upperLeftPoint[1] + dimensions[1])
+        self.lowerLeft = EagerPoint(upperLeftPoint[0], upperLeftPoint[1] + dimensions[1])
+        self.center = EagerPoint(upperLeftPoint[0] + dimensions[0]/2, upperLeftPoint[1] + dimensions[1]/2)
+        self.radius = self.center.distTo(self.upperLeft)
+
+    def overlap(self, otherArea):
+        distance = self.center.distTo(otherArea.center)
+        return distance < (self.center.distTo(self.upperLeft) + otherArea.center.distTo(otherArea.upperLeft))/4
+
+    def similarSize(self, otherArea, scale):
+        thisSize = self.center.distTo(self.upperLeft)
+        otherSize = otherArea.center.distTo(otherArea.upperLeft)
+        return min(thisSize, otherSize) > max(thisSize, otherSize) * scale
+
+
+def buildAndDeduplicate(areaClass, rects, repeat):
+    """
+    Build the areas from the raw detectMultiScale rectangles and drop the duplicates the same way HELPER_mergeDetectedObjs does.
+        :return the number of kept areas
+    """
+    kept = 0
+    for _ in range(repeat):
+        areas = [areaClass((x, y), (w, h)) for (x, y, w, h) in rects]
+        unique = []
+        for area in areas:
+            if not any(other.similarSize(area, 0.5) and other.overlap(area) for other in unique):
+                unique.append(area)
+        kept = len(unique)
+    return kept
+
+
+def measure(label, function, *args):
+    # time without tracing first since tracemalloc slows down every allocation
+    startTime = time.perf_counter()
+    output = function(*args)
+    runtime = time.perf_counter() - startTime
+
+    tracemalloc.start()
+    function(*args)
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} runtime {runtime * 1000:8.2f}ms   peak traced memory {peak / 1024:8.1f}KB")
+    return output
+
+
+image = cv.imread('FacialDetection/testingParts/testImages/people_half_flipped.jpg')
+image = resizeMinTo(image, 1000)
+imgMngr = ImageManager(image)
+
+# Collect the raw eye hits of the multi-angle sweep (low minNeighbors to get a crowded, duplicate heavy set)
+angles = (0, 90, 180, 270)
+rects = []
+for angle in angles:
+    rotatedGrayImage = rotateCounterClockwise(imgMngr.grayImage, angle)
+    rects.extend(imgMngr.haarcascade_eye.detectMultiScale(rotatedGrayImage, 1.1, 1, minSize = imgMngr.HARDCODED_eyeMinDimensions).tolist())
+print(f"DEBUG raw eye hits over {angles}: {len(rects)}")
+
+print(f"DEBUG bytes per Point: eager {sys.getsizeof(EagerPoint(0, 0)) + sys.getsizeof(EagerPoint(0, 0).__dict__)}, slots {sys.getsizeof(Point(0, 0))}")
+
+repeat = 20
+keptEager = measure("eager dict-backed areas", buildAndDeduplicate, EagerDetectedArea, rects, repeat)
+keptLazy = measure("lazy slot-based areas", buildAndDeduplicate, DetectedArea, rects, repeat)
+print(f"DEBUG kept areas: eager {keptEager}, lazy {keptLazy}")
+
+measure("full multi-angle eye sweep", imgMngr.findPairsOfEyesCounterClockwiseMultipleAngles, angles, 1.1, 10)